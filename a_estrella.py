@@ -1,38 +1,12 @@
 # a_estrella.py
 
 import heapq
+import time
+from itertools import count
 from nodo import Nodo
-
-def existe_en_lista_interior(lista_interior, casilla):
-    """
-    Verifica si una casilla ya existe en lista_interior basada en sus coordenadas.
-
-    :param lista_interior: Lista de objetos Casilla explorados.
-    :param casilla: Objeto Casilla a verificar.
-    :return: True si existe, False en caso contrario.
-    """
-    fila = casilla.getFila()
-    columna = casilla.getCol()
-    for c in lista_interior:
-        if c.getFila() == fila and c.getCol() == columna:
-            return True
-    return False
-
-def existe_en_lista_frontera(lista_frontera, casilla):
-    """
-    Verifica si una casilla ya existe en lista_frontera basada en sus coordenadas.
-
-    :param lista_frontera: Lista de objetos Nodo en la frontera.
-    :param casilla: Objeto Casilla a verificar.
-    :return: True si existe, False en caso contrario.
-    """
-    fila = casilla.getFila()
-    columna = casilla.getCol()
-    for nodo in lista_frontera:
-        estado = nodo.getEstado()
-        if estado.getFila() == fila and estado.getCol() == columna:
-            return True
-    return False
+from mapa import GRADO_MAXIMO
+from traza import TRAZA_ITERACION, traza_por_defecto, evento_iteracion
+from perfilado import perfilable
 
 # Heurísticas
 def manhattan_heuristica(nodo_actual, nodo_meta):
@@ -49,117 +23,348 @@ def euclidea_heuristica(nodo_actual, nodo_meta):
 def chebyshev_heuristica(nodo_actual, nodo_meta):
     return max(abs(nodo_actual.getFila() - nodo_meta.getFila()), abs(nodo_actual.getCol() - nodo_meta.getCol()))
 
-def a_estrella(camino, inicio, meta, obtener_vecinos, costo_movimiento, tipo_heuristica, mapi):
-    """Algoritmo A* que encuentra el camino óptimo entre 'inicio' y 'meta'."""
-    lista_frontera = []
+def octil_heuristica(nodo_actual, nodo_meta):
+    """Distancia exacta sin muros con pasos rectos de coste 1 y diagonales de 1.5 (consistente)."""
+    df = abs(nodo_actual.getFila() - nodo_meta.getFila())
+    dc = abs(nodo_actual.getCol() - nodo_meta.getCol())
+    return 1.5 * min(df, dc) + abs(df - dc)
+
+def a_estrella(camino, inicio, meta, obtener_vecinos, costo_movimiento, tipo_heuristica, mapi, traza=None, cache=None, estadisticas=None,
+               cola=None):
+    """
+    Algoritmo A* que encuentra el camino óptimo entre 'inicio' y 'meta'
+    y lo marca con '*' en la matriz 'camino'.
+
+    :param traza: Destino de la traza (ver traza.py). Por defecto solo se
+                  muestra el resultado por consola.
+    :param cache: CacheCaminos opcional. Solo se usa con las funciones de
+                  vecinos y coste del propio mapa.
+    :param estadisticas: EstadisticasBusqueda opcional que se rellena con los
+                         contadores de la búsqueda (no se toca si el camino sale de la caché).
+    :param cola: Clase de la frontera (ver buscar_a_estrella).
+    :return: Tupla (coste, calorías); coste -1 si no hay camino.
+    """
+    clave = None
+    if cache is not None and obtener_vecinos == mapi.getVecinos and costo_movimiento == mapi.costo_movimiento:
+        clave = cache.clave(mapi, "a_estrella" if cola is None else ("a_estrella", cola), inicio, meta, tipo_heuristica)
+        guardado = cache.obtener(clave)
+    if clave is not None and guardado is not None:
+        f_final, cal, camino_reconstruido = guardado
+        traza_por_defecto(traza).mensaje("Camino recuperado de la caché")
+    else:
+        f_final, cal, camino_reconstruido = buscar_a_estrella(inicio, meta, obtener_vecinos, costo_movimiento,
+                                                              tipo_heuristica, mapi, traza, estadisticas, cola)
+        if clave is not None:
+            cache.guardar(clave, f_final, cal, camino_reconstruido)
+
+    # Marcar el camino en el mapa cambiando '.' por '*'
+    for casilla in camino_reconstruido:
+        fila = casilla.getFila()
+        columna = casilla.getCol()
+        camino[fila][columna] = '*'  # Marcar el camino en el mapa
+
+    return f_final, cal  # Devolver el coste final y las calorías
+
+@perfilable("a_estrella")
+def buscar_a_estrella(inicio, meta, obtener_vecinos, costo_movimiento, tipo_heuristica, mapi, traza=None,
+                      estadisticas=None, cola=None):
+    """
+    Núcleo de a_estrella: busca el camino sin tocar ninguna matriz.
+
+    Internamente los nodos guardan como estado el id entero de su celda
+    (fila*ancho+col); las casillas solo se crean para la heurística y para
+    devolver el camino.
+
+    :param estadisticas: EstadisticasBusqueda opcional que se rellena al terminar.
+    :param cola: Clase (o función sin argumentos) que crea la frontera, con
+                 métodos insertar(nodo) y extraer(), p. ej. ColaCubetas. Por
+                 defecto un montículo de heapq con tuplas (f, seq, nodo): el
+                 número de inserción desempata y evita llamar a Nodo.__lt__.
+    :return: Tupla (coste, calorías, lista de casillas del camino).
+    """
+    t0 = time.perf_counter()
+    if cola is None:
+        lista_frontera = []
+        orden = count()
+
+        def insertar(nodo, heappush=heapq.heappush):
+            heappush(lista_frontera, (nodo.f, next(orden), nodo))
+
+        def extraer(heappop=heapq.heappop):
+            return heappop(lista_frontera)[2]
+    else:
+        lista_frontera = cola()
+        insertar = lista_frontera.insertar
+        extraer = lista_frontera.extraer
     lista_interior = []  # Mantener como lista según restricción del usuario
+    cerrados = {}        # Ids ya expandidos -> g con el que se expandieron
+    abiertos = {}        # Ids en la frontera -> mejor g conocido
+    h_de = {}            # Heurística ya calculada para cada id
+    reabiertos = set()   # Ids expandidos que han vuelto a la frontera con menor g
+    cota = _cota_admisible(mapi, meta, obtener_vecinos, costo_movimiento, tipo_heuristica)
+    sobreestima = False  # Alguna h ha superado la cota: la primera meta puede no ser óptima
+    ancho = mapi.getAncho()
+    adyacencia = mapi.adyacencia_para(obtener_vecinos, costo_movimiento)
+    grado, vecinos_ady, costes_ady = adyacencia.grado, adyacencia.vecinos, adyacencia.costes
+    traza = traza_por_defecto(traza)
+    por_iteracion = traza.activa(TRAZA_ITERACION)  # Con la traza apagada no se formatea nada
+
+    id_inicio = mapi.id_casilla(inicio)
+    id_meta = mapi.id_casilla(meta)
 
-    # Verificar si el inicio o el meta están bloqueados
-    if mapi.obtener_tipo_terreno(inicio) == 'obstaculo' or mapi.obtener_tipo_terreno(meta) == 'obstaculo':
-        print("EL CONEJO NO PUEDE ALCANZAR LA ZANAHORIA")
-        return -1, 0
+    # Verificar si el inicio o el meta están bloqueados o en regiones distintas
+    if inalcanzable(id_inicio, id_meta, obtener_vecinos, mapi):
+        traza.mensaje("EL CONEJO NO PUEDE ALCANZAR LA ZANAHORIA")
+        traza.emitir_resumen("a_estrella", -1, -1, 0, [])
+        if estadisticas is not None:
+            estadisticas.fijar("a_estrella", 0, 0, 0, 0, 0, 0)
+        return -1, -1, []
 
     # Nodo inicial con la heurística seleccionada y calorías iniciales
-    cal_inicial = calcular_caloria(None, inicio, mapi)
-    nodo_inicial = Nodo(inicio, None, 0, tipo_heuristica(inicio, meta), cal=cal_inicial)
-    heapq.heappush(lista_frontera, nodo_inicial)
+    cal_inicial = calcular_caloria_id(None, id_inicio, mapi)
+    nodo_inicial = Nodo(id_inicio, None, 0, tipo_heuristica(inicio, meta), cal=cal_inicial)
+    if cota is not None and nodo_inicial.h > cota(id_inicio):
+        sobreestima = True
+    insertar(nodo_inicial)
+    abiertos[id_inicio] = 0
     
     f_final = -1  # Coste final, inicialmente -1
     iteracion = 1
 
+    # Contadores para las estadísticas (variables locales, se vuelcan al terminar)
+    generados = extracciones = duplicados = 0
+    inserciones = 1  # El nodo inicial
+    frontera_max = 1
+    if estadisticas is not None:
+        t0 = estadisticas.marcar("preparacion", t0)
+
     while lista_frontera:
-        nodo_actual = heapq.heappop(lista_frontera)
+        nodo_actual = extraer()
+        actual = nodo_actual.getEstado()
+        extracciones += 1
 
-        # Si el nodo actual ya ha sido expandido, lo ignoramos
-        if existe_en_lista_interior(lista_interior, nodo_actual.getEstado()):
+        # Si el nodo actual ya ha sido expandido o ha quedado obsoleto
+        # (existe una entrada con menor g para la misma casilla), lo ignoramos
+        if actual in cerrados or nodo_actual.g > abiertos[actual]:
+            duplicados += 1
             continue
 
-        # Añadir el nodo actual a la lista interior (nodos ya explorados)
-        lista_interior.append(nodo_actual.getEstado())
-
-        # Mostrar Iteración
-        print(f"\nIteración : {iteracion}")
-        print(f"Posición actual: ({nodo_actual.getEstado().getFila()},{nodo_actual.getEstado().getCol()})")
+        # Pasar el nodo actual de la frontera a la lista interior (nodos ya explorados).
+        # Una casilla reabierta ya figura en lista_interior y no se repite
+        del abiertos[actual]
+        if actual in reabiertos:
+            reabiertos.discard(actual)
+        else:
+            lista_interior.append(actual)
+        cerrados[actual] = nodo_actual.g
 
-        # Mostrar lista_interior
-        lista_interior_str = ', '.join([f"({casilla.getFila()},{casilla.getCol()})" for casilla in lista_interior])
-        print(f"Lista_interior: {lista_interior_str}")
+        # Si hemos llegado al nodo destino, reconstruir el camino
+        if actual == id_meta:
+            if sobreestima:
+                nodo_actual, revisados = _revisar_hasta_optimo(nodo_actual, lista_frontera, abiertos, cerrados,
+                                                               cota, grado, vecinos_ady, costes_ady, mapi)
+                traza.mensaje(f"La heurística sobreestima: {revisados} expansiones más para asegurar el óptimo")
+                iteracion += revisados
+            if por_iteracion:
+                evento_iteracion(traza, ancho, iteracion, actual, [], lista_interior,
+                                 _frontera_vigente(lista_frontera, abiertos), len(abiertos))
 
-        # Mostrar lista_frontera
-        lista_frontera_str = ' '.join([f"({nodo.getEstado().getFila()},{nodo.getEstado().getCol()})" for nodo in lista_frontera])
-        print(f"Lista_frontera: {lista_frontera_str}")
+            if estadisticas is not None:
+                t0 = estadisticas.marcar("busqueda", t0)
 
-        # Si hemos llegado al nodo destino, reconstruir el camino
-        if nodo_actual.getEstado().getFila() == meta.getFila() and nodo_actual.getEstado().getCol() == meta.getCol():
             # Reconstruir el camino desde el nodo final al inicial
-            camino_reconstruido, cal = reconstruir_camino(nodo_actual, mapi)
-            print("LAS CALORIAS SON", cal)
-            
-            # Marcar el camino en el mapa cambiando '.' por '*'
-            for casilla in camino_reconstruido:
-                fila = casilla.getFila()
-                columna = casilla.getCol()
-                camino[fila][columna] = '*'  # Marcar el camino en el mapa
+            camino_reconstruido, cal = reconstruir_camino(nodo_actual, mapi, traza)
+            traza.mensaje(f"LAS CALORIAS SON {cal}")
             
             f_final = nodo_actual.f  # El coste final es el valor de 'f' del nodo meta
-            return f_final, cal  # Devolver el coste final y las calorías
+            traza.emitir_resumen("a_estrella", f_final, cal, iteracion, camino_reconstruido)
+            if estadisticas is not None:
+                estadisticas.marcar("reconstruccion", t0)
+                estadisticas.fijar("a_estrella", iteracion, generados, inserciones, extracciones,
+                                   duplicados, frontera_max)
+            return f_final, cal, camino_reconstruido
 
         # Inicializar lista_vecinos para esta iteración
         nodos_vecinos = []
 
         # Expandir los vecinos del nodo actual
-        for vecino in obtener_vecinos(nodo_actual.getEstado()):
-            if existe_en_lista_interior(lista_interior, vecino):
-                continue  # Saltar los nodos que ya fueron expandidos
+        base = actual * GRADO_MAXIMO
+        generados += grado[actual]
+        for k in range(base, base + grado[actual]):
+            vecino = vecinos_ady[k]
 
             # Calcular nuevo g (coste desde el inicio)
-            g_nuevo = nodo_actual.g + costo_movimiento(nodo_actual.getEstado(), vecino)
+            g_nuevo = nodo_actual.g + costes_ady[k]
+
+            # Un nodo ya expandido solo se reabre si se llega a él con menor g. Con
+            # heurísticas consistentes (octil, euclidea, chebyshev, trivial) no
+            # ocurre nunca; con manhattan, que no lo es con diagonales de 1.5,
+            # evita quedarse con el primer g con el que se cerró la casilla
+            g_cerrado = cerrados.get(vecino)
+            if g_cerrado is not None:
+                if g_cerrado <= g_nuevo:
+                    duplicados += 1
+                    continue
+                del cerrados[vecino]
+                reabiertos.add(vecino)
+
+            # Si el vecino ya está en la frontera con un g igual o mejor, no aporta nada
+            g_frontera = abiertos.get(vecino)
+            if g_frontera is not None and g_frontera <= g_nuevo:
+                duplicados += 1
+                continue
             
             # Calcular las nuevas calorías acumuladas utilizando la función calcular_caloria
-            cal_nueva = calcular_caloria(nodo_actual, vecino, mapi)
+            cal_nueva = calcular_caloria_id(nodo_actual, vecino, mapi)
+
+            # Heurística del vecino (se calcula una sola vez por casilla)
+            h = h_de.get(vecino)
+            if h is None:
+                h = h_de[vecino] = tipo_heuristica(mapi.casilla_de_id(vecino), meta)
+                if cota is not None and not sobreestima and h > cota(vecino):
+                    sobreestima = True
             
-            # Crear un nodo vecino con la heurística seleccionada
-            nodo_vecino = Nodo(vecino, nodo_actual, g_nuevo, tipo_heuristica(vecino, meta), cal=cal_nueva)
+            # Crear un nodo vecino con la heurística seleccionada. Si ya estaba en la
+            # frontera, la entrada antigua queda obsoleta y se descarta al extraerla
+            nodo_vecino = Nodo(vecino, nodo_actual, g_nuevo, h, cal=cal_nueva)
+            insertar(nodo_vecino)
+            abiertos[vecino] = g_nuevo
+            inserciones += 1
+            if por_iteracion:
+                nodos_vecinos.append(vecino)
 
-            # Solo consideramos vecinos que no están en lista_interior ni en lista_frontera
-            if not existe_en_lista_frontera(lista_frontera, vecino):
-                heapq.heappush(lista_frontera, nodo_vecino)
-                nodos_vecinos.append(f"({vecino.getFila()},{vecino.getCol()})")
+        if len(abiertos) > frontera_max:
+            frontera_max = len(abiertos)
 
-        # Mostrar vecinos accesibles en esta iteración
-        print(f"Nodos_vecinos: {' '.join(nodos_vecinos)}")
+        # Mostrar la iteración con los vecinos añadidos a la frontera
+        if por_iteracion:
+            evento_iteracion(traza, ancho, iteracion, actual, nodos_vecinos, lista_interior,
+                             _frontera_vigente(lista_frontera, abiertos), len(abiertos))
 
         iteracion +=1
 
     # Si no se encuentra un camino válido
-    print("EL CONEJO NO PUEDE ALCANZAR LA ZANAHORIA")
-    return -1, -1  # Devuelve -1 para el coste y las calorías si no se encuentra un camino válido
+    traza.mensaje("EL CONEJO NO PUEDE ALCANZAR LA ZANAHORIA")
+    traza.emitir_resumen("a_estrella", -1, -1, iteracion - 1, [])
+    if estadisticas is not None:
+        estadisticas.marcar("busqueda", t0)
+        estadisticas.fijar("a_estrella", iteracion - 1, generados, inserciones, extracciones,
+                           duplicados, frontera_max)
+    return -1, -1, []  # Devuelve -1 para el coste y las calorías si no se encuentra un camino válido
 
-def reconstruir_camino(nodo, mapi):
-    """Reconstruir el camino desde el nodo final hasta el inicial."""
+def inalcanzable(id_inicio, id_meta, obtener_vecinos, mapi):
+    """
+    Indica sin buscar que no hay camino: el inicio o la meta no son
+    transitables o, con los vecinos del propio mapa, están en componentes
+    conexas distintas (ver Mapa.conectadas).
+    """
+    if not mapi.transitable_id(id_inicio) or not mapi.transitable_id(id_meta):
+        return True
+    return obtener_vecinos == mapi.getVecinos and not mapi.conectadas(id_inicio, id_meta)
+
+def _nodos_vigentes(lista_frontera, abiertos):
+    """Nodos de la frontera que no han quedado obsoletos."""
+    nodos = (entrada[2] if isinstance(entrada, tuple) else entrada for entrada in lista_frontera)
+    return (nodo for nodo in nodos if abiertos.get(nodo.getEstado()) == nodo.g)
+
+def _frontera_vigente(lista_frontera, abiertos):
+    """Ids de las entradas de la frontera que no han quedado obsoletas."""
+    return (nodo.getEstado() for nodo in _nodos_vigentes(lista_frontera, abiertos))
+
+def _cota_admisible(mapi, meta, obtener_vecinos, costo_movimiento, tipo_heuristica):
+    """
+    Cota inferior del coste real hasta la meta: la distancia octil por el
+    menor multiplicador de terreno. Devuelve una función id -> cota, o None
+    si no hace falta (la heurística se declara admisible con el atributo
+    'admisible', como HeuristicaALT) o no se puede garantizar (vecinos o
+    costes que no son los del propio mapa).
+    """
+    if getattr(tipo_heuristica, "admisible", False):
+        return None
+    if obtener_vecinos != mapi.getVecinos or costo_movimiento != mapi.costo_movimiento:
+        return None
+    minimo = min((tipo.coste for tipo in mapi.terrenos if tipo.transitable), default=1)
+    ancho = mapi.getAncho()
+    fila_meta, col_meta = meta.getFila(), meta.getCol()
+
+    def cota(id_celda):
+        fila, col = divmod(id_celda, ancho)
+        df = abs(fila - fila_meta)
+        dc = abs(col - col_meta)
+        # Holgura para que el redondeo no tome por sobreestimación una h igual a la cota
+        return (1.5 * min(df, dc) + abs(df - dc)) * minimo + 1e-9
+
+    return cota
+
+def _revisar_hasta_optimo(nodo_meta, lista_frontera, abiertos, cerrados, cota, grado, vecinos_ady, costes_ady, mapi):
+    """
+    Con una heurística que sobreestima (manhattan con diagonales de 1.5) la
+    primera vez que se extrae la meta su g puede no ser el óptimo. Se sigue
+    expandiendo la frontera en orden de g + cota, reabriendo las casillas
+    que mejoran, hasta que ninguna entrada puede mejorar la meta.
+
+    :return: Tupla (mejor nodo meta, número de expansiones añadidas).
+    """
+    id_meta = nodo_meta.getEstado()
+    orden = count()
+    pendientes = [(nodo.g + cota(nodo.getEstado()), next(orden), nodo)
+                  for nodo in _nodos_vigentes(lista_frontera, abiertos)]
+    heapq.heapify(pendientes)
+    mejor = nodo_meta
+    revisados = 0
+    while pendientes and pendientes[0][0] < mejor.g:
+        nodo = heapq.heappop(pendientes)[2]
+        actual = nodo.getEstado()
+        if abiertos.get(actual) != nodo.g:
+            continue  # Obsoleto
+        del abiertos[actual]
+        cerrados[actual] = nodo.g
+        revisados += 1
+        base = actual * GRADO_MAXIMO
+        for k in range(base, base + grado[actual]):
+            vecino = vecinos_ady[k]
+            g_nuevo = nodo.g + costes_ady[k]
+            if g_nuevo >= min(cerrados.get(vecino, float("inf")), abiertos.get(vecino, float("inf")), mejor.g):
+                continue
+            nodo_vecino = Nodo(vecino, nodo, g_nuevo, 0, cal=calcular_caloria_id(nodo, vecino, mapi))
+            if vecino == id_meta:
+                mejor = nodo_vecino
+                continue
+            cerrados.pop(vecino, None)
+            abiertos[vecino] = g_nuevo
+            heapq.heappush(pendientes, (g_nuevo + cota(vecino), next(orden), nodo_vecino))
+    return mejor, revisados
+
+def reconstruir_camino(nodo, mapi, traza=None):
+    """Reconstruir el camino desde el nodo final hasta el inicial (nodos con ids de celda)."""
+    traza = traza_por_defecto(traza)
     camino = []
     cal = 0
     es_origen = True
     while nodo is not None:
-        camino.append(nodo.getEstado())  # Agregar el estado del nodo actual
+        camino.append(mapi.casilla_de_id(nodo.getEstado()))  # Agregar el estado del nodo actual
         # Ignora el nodo de origen en el cálculo de calorías
         if not es_origen:
-            # Obtener el tipo de terreno y calcular calorías solo para el camino final
-            tipo_terreno = mapi.obtener_tipo_terreno(nodo.getEstado())
-            if tipo_terreno == "hierba":
-                cal += 2
-            elif tipo_terreno == "agua":
-                cal += 4
-            elif tipo_terreno == "roca":
-                cal += 6
-            # Imprimir las calorías acumuladas después de cada movimiento
-            print(f"Calorías acumuladas tras mover a {tipo_terreno}: {cal}")
+            # Calorías de la celda, precalculadas en el mapa a partir de la tabla de terrenos
+            cal += mapi.calorias_celda[nodo.getEstado()]
+            # Mostrar las calorías acumuladas después de cada movimiento
+            if traza.activa(TRAZA_ITERACION):
+                traza.mensaje(f"Calorías acumuladas tras mover a {mapi.obtener_tipo_terreno_id(nodo.getEstado())}: {cal}")
         else:
             es_origen = False
         
         nodo = nodo.padre
     return camino[::-1], cal  # Invertir el camino para que vaya desde inicio hasta destino
 
+def calorias_camino(camino, mapi):
+    """
+    Calorías de una lista de casillas, contadas igual que en reconstruir_camino
+    (que recorre el camino desde el destino y omite el primer nodo que visita,
+    es decir, la casilla de destino).
+    """
+    calorias_celda = mapi.calorias_celda
+    return sum(calorias_celda[mapi.id_casilla(casilla)] for casilla in camino[:-1])
+
 def calcular_caloria(nodo_padre, estado, mapi):
     """
     Calcula las calorías acumuladas para un nodo.
@@ -168,18 +373,12 @@ def calcular_caloria(nodo_padre, estado, mapi):
     :param mapi: El mapa que contiene la información de terrenos.
     :return: Calorías acumuladas para el nodo actual.
     """
-    tipo_terreno = mapi.obtener_tipo_terreno(estado)
-    if tipo_terreno == "hierba":
-        cal_terreno = 2
-    elif tipo_terreno == "agua":
-        cal_terreno = 6
-    elif tipo_terreno == "roca":
-        cal_terreno = 6
-    else:
-        cal_terreno = 0  # Por si acaso
+    return calcular_caloria_id(nodo_padre, mapi.id_casilla(estado), mapi)
 
+def calcular_caloria_id(nodo_padre, id_celda, mapi):
+    """Versión de calcular_caloria que recibe el id entero de la celda."""
+    cal_terreno = mapi.calorias_celda[id_celda]
     if nodo_padre is not None:
         return nodo_padre.cal + cal_terreno
     else:
         return cal_terreno
-
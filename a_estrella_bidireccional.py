@@ -0,0 +1,170 @@
+# a_estrella_bidireccional.py
+
+import heapq
+import time
+
+from mapa import GRADO_MAXIMO
+from a_estrella import calorias_camino, inalcanzable
+from traza import TRAZA_ITERACION, traza_por_defecto, evento_iteracion
+from perfilado import perfilable
+
+INFINITO = float("inf")
+
+def a_estrella_bidireccional(camino, inicio, meta, obtener_vecinos, costo_movimiento, tipo_heuristica, mapi, traza=None,
+                             estadisticas=None):
+    """
+    A* bidireccional con la misma firma que a_estrella: marca el camino con
+    '*' en la matriz 'camino' y devuelve (coste, calorías).
+    """
+    coste, cal, camino_reconstruido = buscar_a_estrella_bidireccional(inicio, meta, obtener_vecinos, costo_movimiento,
+                                                                      tipo_heuristica, mapi, traza, estadisticas)
+    for casilla in camino_reconstruido:
+        camino[casilla.getFila()][casilla.getCol()] = '*'
+    return coste, cal
+
+@perfilable("a_estrella_bidireccional")
+def buscar_a_estrella_bidireccional(inicio, meta, obtener_vecinos, costo_movimiento, tipo_heuristica, mapi, traza=None,
+                                    estadisticas=None):
+    """
+    Búsqueda A* simultánea desde 'inicio' hacia 'meta' y desde 'meta' hacia 'inicio'.
+
+    Cada paso expande la dirección con menos entradas en su frontera. Cada vez
+    que una dirección alcanza una casilla ya alcanzada por la otra se actualiza
+    el mejor camino conocido (mu). La búsqueda para cuando mu no supera la cota
+    inferior max(f_min hacia delante, f_min hacia atrás, g_min hacia delante +
+    g_min hacia atrás): con una heurística consistente las tres son cotas
+    inferiores del coste óptimo mientras no se haya encontrado. La última es
+    la que corta pronto cuando la heurística informa poco (con la trivial la
+    búsqueda es un Dijkstra bidireccional). Con octil_heuristica, euclidea o
+    chebyshev el resultado es óptimo para el modelo de costes 1 / 1.5; con
+    heurísticas no consistentes en ese modelo, como Manhattan, no hay garantía.
+
+    Los costes de paso son simétricos, así que la dirección inversa usa la
+    misma tabla de vecinos. Las casillas no transitables no pueden ser inicio
+    ni meta.
+
+    :param estadisticas: EstadisticasBusqueda opcional que se rellena al terminar
+                         (la frontera cuenta las entradas de ambos montículos).
+    :return: Tupla (coste, calorías, lista de casillas del camino).
+    """
+    t0 = time.perf_counter()
+    traza = traza_por_defecto(traza)
+    por_iteracion = traza.activa(TRAZA_ITERACION)
+    adyacencia = mapi.adyacencia_para(obtener_vecinos, costo_movimiento)
+    grado, vecinos_ady, costes_ady = adyacencia.grado, adyacencia.vecinos, adyacencia.costes
+    ancho = mapi.getAncho()
+
+    if inalcanzable(mapi.id_casilla(inicio), mapi.id_casilla(meta), obtener_vecinos, mapi):
+        traza.mensaje("EL CONEJO NO PUEDE ALCANZAR LA ZANAHORIA")
+        traza.emitir_resumen("a_estrella_bidireccional", -1, -1, 0, [])
+        if estadisticas is not None:
+            estadisticas.fijar("a_estrella_bidireccional", 0, 0, 0, 0, 0, 0)
+        return -1, -1, []
+
+    id_inicio = mapi.id_casilla(inicio)
+    id_meta = mapi.id_casilla(meta)
+    # Índice 0: hacia delante (objetivo meta); índice 1: hacia atrás (objetivo inicio)
+    objetivos = (meta, inicio)
+    g = ({id_inicio: 0}, {id_meta: 0})
+    padres = ({id_inicio: None}, {id_meta: None})
+    fronteras = ([(tipo_heuristica(inicio, meta), 0, id_inicio)], [(tipo_heuristica(meta, inicio), 0, id_meta)])
+    fronteras_g = ([(0, id_inicio)], [(0, id_meta)])  # Las mismas entradas ordenadas por g
+    cerrados = (set(), set())
+    h_de = ({}, {})
+    expandidos = [[], []]
+
+    mejor = 0 if id_inicio == id_meta else INFINITO
+    encuentro = id_inicio if id_inicio == id_meta else None
+
+    # Contadores para las estadísticas
+    generados = extracciones = duplicados = 0
+    inserciones = frontera_max = 2
+    if estadisticas is not None:
+        t0 = estadisticas.marcar("preparacion", t0)
+
+    while fronteras[0] and fronteras[1]:
+        # Descartar entradas obsoletas (g mejorado después) o ya expandidas de la cima de cada montículo
+        for d in (0, 1):
+            frontera = fronteras[d]
+            while frontera and (frontera[0][1] > g[d][frontera[0][2]] or frontera[0][2] in cerrados[d]):
+                heapq.heappop(frontera)
+                extracciones += 1
+                duplicados += 1
+            frontera_g = fronteras_g[d]
+            while frontera_g and (frontera_g[0][0] > g[d][frontera_g[0][1]] or frontera_g[0][1] in cerrados[d]):
+                heapq.heappop(frontera_g)
+        if not fronteras[0] or not fronteras[1]:
+            break
+        if max(fronteras[0][0][0], fronteras[1][0][0], fronteras_g[0][0][0] + fronteras_g[1][0][0]) >= mejor:
+            break
+
+        d = 0 if len(fronteras[0]) <= len(fronteras[1]) else 1
+        otra = 1 - d
+        _, g_actual, actual = heapq.heappop(fronteras[d])
+        extracciones += 1
+        cerrados[d].add(actual)
+        expandidos[d].append(actual)
+
+        nodos_vecinos = []
+        base = actual * GRADO_MAXIMO
+        generados += grado[actual]
+        for k in range(base, base + grado[actual]):
+            vecino = vecinos_ady[k]
+            g_nuevo = g_actual + costes_ady[k]
+            if g_nuevo >= g[d].get(vecino, INFINITO):
+                duplicados += 1
+                continue
+            g[d][vecino] = g_nuevo
+            padres[d][vecino] = actual
+            cerrados[d].discard(vecino)  # Solo ocurre con heurísticas no consistentes
+            h = h_de[d].get(vecino)
+            if h is None:
+                h = h_de[d][vecino] = tipo_heuristica(mapi.casilla_de_id(vecino), objetivos[d])
+            heapq.heappush(fronteras[d], (g_nuevo + h, g_nuevo, vecino))
+            heapq.heappush(fronteras_g[d], (g_nuevo, vecino))
+            inserciones += 1
+            if por_iteracion:
+                nodos_vecinos.append(vecino)
+
+            # ¿La otra dirección ya ha llegado a este vecino?
+            g_otra = g[otra].get(vecino)
+            if g_otra is not None and g_nuevo + g_otra < mejor:
+                mejor = g_nuevo + g_otra
+                encuentro = vecino
+
+        if len(fronteras[0]) + len(fronteras[1]) > frontera_max:
+            frontera_max = len(fronteras[0]) + len(fronteras[1])
+
+        if por_iteracion:
+            evento_iteracion(traza, ancho, len(expandidos[0]) + len(expandidos[1]), actual, nodos_vecinos,
+                             expandidos[d], (e[2] for e in fronteras[d]), len(fronteras[d]))
+
+    num_expandidos = len(expandidos[0]) + len(expandidos[1])
+    if estadisticas is not None:
+        t0 = estadisticas.marcar("busqueda", t0)
+        estadisticas.fijar("a_estrella_bidireccional", num_expandidos, generados, inserciones, extracciones,
+                           duplicados, frontera_max)
+    if encuentro is None:
+        traza.mensaje("EL CONEJO NO PUEDE ALCANZAR LA ZANAHORIA")
+        traza.emitir_resumen("a_estrella_bidireccional", -1, -1, num_expandidos, [])
+        return -1, -1, []
+
+    # Unir la mitad hacia delante (encuentro -> inicio) con la mitad hacia atrás (encuentro -> meta)
+    ids = []
+    nodo = encuentro
+    while nodo is not None:
+        ids.append(nodo)
+        nodo = padres[0][nodo]
+    ids.reverse()
+    nodo = padres[1][encuentro]
+    while nodo is not None:
+        ids.append(nodo)
+        nodo = padres[1][nodo]
+
+    camino_reconstruido = [mapi.casilla_de_id(i) for i in ids]
+    cal = calorias_camino(camino_reconstruido, mapi)
+    traza.mensaje(f"LAS CALORIAS SON {cal}")
+    traza.emitir_resumen("a_estrella_bidireccional", mejor, cal, num_expandidos, camino_reconstruido)
+    if estadisticas is not None:
+        estadisticas.marcar("reconstruccion", t0)
+    return mejor, cal, camino_reconstruido
@@ -1,68 +1,49 @@
 # a_estrella_subepsilon.py
 
-import heapq
+import time
 from nodo import Nodo
-
-def calcular_caloria(nodo_padre, estado, mapi):
-    """
-    Calcula las calorías acumuladas para un nodo.
-    :param nodo_padre: El nodo padre.
-    :param estado: El estado (Casilla) del nodo actual.
-    :param mapi: El mapa que contiene la información de terrenos.
-    :return: Calorías acumuladas para el nodo actual.
-    """
-    tipo_terreno = mapi.obtener_tipo_terreno(estado)
-    if tipo_terreno == "hierba":
-        cal_terreno = 2
-    elif tipo_terreno == "agua":
-        cal_terreno = 6
-    elif tipo_terreno == "roca":
-        cal_terreno = 6
-    else:
-        cal_terreno = 0  # Por si acaso
-
-    if nodo_padre is not None:
-        return nodo_padre.getCalorias() + cal_terreno
-    else:
-        return cal_terreno
-
-def existe_en_lista_interior(lista_interior, casilla):
+from lista_focal import ListaFocal
+from mapa import GRADO_MAXIMO
+from traza import TRAZA_ITERACION, traza_por_defecto, evento_iteracion
+from a_estrella import calcular_caloria_id  # Las calorías salen de la tabla de terrenos del mapa
+from a_estrella import inalcanzable
+from perfilado import perfilable
+
+def a_estrella_subepsilon(camino, inicio, meta, obtener_vecinos, costo_movimiento_func, tipo_heuristica, epsilon, mapi, traza=None, cache=None, estadisticas=None):
     """
-    Verifica si una casilla ya existe en lista_interior basada en sus coordenadas.
-
-    :param lista_interior: Lista de objetos Casilla explorados.
-    :param casilla: Objeto Casilla a verificar.
-    :return: True si existe, False en caso contrario.
-    """
-    fila = casilla.getFila()
-    columna = casilla.getCol()
-    for c in lista_interior:
-        if c.getFila() == fila and c.getCol() == columna:
-            return True
-    return False
-
-def existe_en_lista_frontera(lista_frontera, casilla):
-    """
-    Verifica si una casilla ya existe en lista_frontera basada en sus coordenadas.
+    Algoritmo A* Subε que relaja la restricción de optimalidad.
+    Marca con '*' en la matriz 'camino' el camino encontrado.
+    Los parámetros son los de buscar_a_estrella_subepsilon.
 
-    :param lista_frontera: Lista de objetos Nodo en la frontera.
-    :param casilla: Objeto Casilla a verificar.
-    :return: True si existe, False en caso contrario.
+    :param cache: CacheCaminos opcional. Solo se usa con las funciones de
+                  vecinos y coste del propio mapa.
+    :param estadisticas: EstadisticasBusqueda opcional (no se toca si el camino sale de la caché).
+    :return: Tupla (coste, calorías) del camino encontrado.
     """
-    fila = casilla.getFila()
-    columna = casilla.getCol()
-    for nodo in lista_frontera:
-        estado = nodo.getEstado()
-        if estado.getFila() == fila and estado.getCol() == columna:
-            return True
-    return False
-
-def a_estrella_subepsilon(camino, inicio, meta, obtener_vecinos, costo_movimiento_func, tipo_heuristica, epsilon, mapi):
+    clave = None
+    if cache is not None and obtener_vecinos == mapi.getVecinos and costo_movimiento_func == mapi.costo_movimiento:
+        clave = cache.clave(mapi, "a_estrella_subepsilon", inicio, meta, tipo_heuristica, epsilon)
+        guardado = cache.obtener(clave)
+    if clave is not None and guardado is not None:
+        coste, cal, camino_reconstruido = guardado
+        traza_por_defecto(traza).mensaje("Camino recuperado de la caché")
+    else:
+        coste, cal, camino_reconstruido = buscar_a_estrella_subepsilon(inicio, meta, obtener_vecinos, costo_movimiento_func,
+                                                                       tipo_heuristica, epsilon, mapi, traza,
+                                                                       estadisticas)
+        if clave is not None:
+            cache.guardar(clave, coste, cal, camino_reconstruido)
+    for casilla in camino_reconstruido:
+        camino[casilla.getFila()][casilla.getCol()] = '*'
+    return coste, cal
+
+@perfilable("a_estrella_subepsilon")
+def buscar_a_estrella_subepsilon(inicio, meta, obtener_vecinos, costo_movimiento_func, tipo_heuristica, epsilon, mapi, traza=None,
+                                 estadisticas=None):
     """
-    Algoritmo A* Subε que relaja la restricción de optimalidad.
-    Imprime una traza detallada de cada iteración.
+    Núcleo de A* Subε: busca el camino sin tocar ninguna matriz.
+    Con una traza de nivel TRAZA_ITERACION muestra el detalle de cada iteración.
 
-    :param camino: Matriz para marcar el camino encontrado.
     :param inicio: Casilla de inicio.
     :param meta: Casilla de destino.
     :param obtener_vecinos: Función para obtener vecinos de una casilla.
@@ -70,125 +51,177 @@ def a_estrella_subepsilon(camino, inicio, meta, obtener_vecinos, costo_movimient
     :param tipo_heuristica: Función heurística a utilizar.
     :param epsilon: Factor de relajación.
     :param mapi: Objeto Mapa.
-    :return: Tupla (coste, calorías) del camino encontrado.
+    :param traza: Destino de la traza (ver traza.py). Por defecto solo se
+                  muestra el resultado por consola.
+    :param estadisticas: EstadisticasBusqueda opcional que se rellena al terminar,
+                         incluidos los tamaños de la lista focal.
+    :return: Tupla (coste, calorías, lista de casillas del camino).
+
+    Los nodos guardan como estado el id entero de su celda (fila*ancho+col).
     """
-    lista_frontera = []
+    t0 = time.perf_counter()
+    lista_frontera = ListaFocal(epsilon)  # Frontera ordenada por f con su lista focal
     lista_interior = []  # Lista de objetos Casilla explorados
+    cerrados = set()     # Ids de lista_interior, para consultas en O(1)
+    ancho = mapi.getAncho()
+    adyacencia = mapi.adyacencia_para(obtener_vecinos, costo_movimiento_func)
+    grado, vecinos_ady, costes_ady = adyacencia.grado, adyacencia.vecinos, adyacencia.costes
+    traza = traza_por_defecto(traza)
+    por_iteracion = traza.activa(TRAZA_ITERACION)  # Con la traza apagada no se formatea nada
+
+    id_inicio = mapi.id_casilla(inicio)
+    id_meta = mapi.id_casilla(meta)
+
+    # Verificar si el inicio o el meta están bloqueados o en regiones distintas
+    if inalcanzable(id_inicio, id_meta, obtener_vecinos, mapi):
+        traza.mensaje("EL CONEJO NO PUEDE ALCANZAR LA ZANAHORIA")
+        traza.emitir_resumen("a_estrella_subepsilon", -1, -1, 0, [])
+        if estadisticas is not None:
+            estadisticas.fijar("a_estrella_subepsilon", 0, 0, 0, 0, 0, 0)
+        return -1, -1, []
 
     # Nodo inicial con la heurística seleccionada y calorías iniciales
-    cal_inicial = calcular_caloria(None, inicio, mapi)
-    nodo_inicial = Nodo(inicio, None, 0, tipo_heuristica(inicio, meta), cal=cal_inicial)
-    heapq.heappush(lista_frontera, nodo_inicial)
+    cal_inicial = calcular_caloria_id(None, id_inicio, mapi)
+    nodo_inicial = Nodo(id_inicio, None, 0, tipo_heuristica(inicio, meta), cal=cal_inicial)
+    lista_frontera.insertar(id_inicio, nodo_inicial)
 
     iteracion = 1
 
-    while lista_frontera:
-        # Obtener el nodo con el menor f(n) de lista_frontera para definir la lista focal
-        nodo_minimo = lista_frontera[0]  # El nodo con el menor f(n) en lista_frontera
-        min_f = nodo_minimo.f
-        lista_focal = [nodo for nodo in lista_frontera if nodo.f <= (1 + epsilon) * min_f]
+    # Contadores para las estadísticas (variables locales, se vuelcan al terminar)
+    generados = duplicados = focal_max = focal_total = 0
+    inserciones = frontera_max = 1
+    if estadisticas is not None:
+        t0 = estadisticas.marcar("preparacion", t0)
 
-        # Seleccionar el nodo de lista_focal con menor valor de calorías, y si hay empate, menor f(n)
-        nodo_actual = min(lista_focal, key=lambda nodo: (nodo.cal, nodo.f))
-        lista_frontera.remove(nodo_actual)
-        heapq.heapify(lista_frontera)  # Reordenar la lista_frontera después de la eliminación
+    while lista_frontera:
+        # Seleccionar de la lista focal (f <= (1 + epsilon) * f_min) el nodo con
+        # menor valor de calorías, y si hay empate, menor f(n)
+        actual, nodo_actual = lista_frontera.extraer()
+        tam_focal = lista_frontera.tam_focal() + 1  # Con el nodo recién extraído
+        focal_total += tam_focal
+        if tam_focal > focal_max:
+            focal_max = tam_focal
 
         # Añadir el nodo actual a la lista interior (nodos ya explorados) si no está ya presente
-        if not existe_en_lista_interior(lista_interior, nodo_actual.getEstado()):
-            lista_interior.append(nodo_actual.getEstado())
-
-        # Mostrar Iteración
-        print(f"\nIteración : {iteracion}")
-        print(f"Posición actual: ({nodo_actual.getEstado().getFila()},{nodo_actual.getEstado().getCol()})")
+        if actual not in cerrados:
+            cerrados.add(actual)
+            lista_interior.append(actual)
 
         # Obtener vecinos
-        vecinos = obtener_vecinos(nodo_actual.getEstado())
-        nodos_vecinos = []
-        for vecino in vecinos:
-            # Solo consideramos vecinos que no están en lista_interior ni en lista_frontera
-            if not existe_en_lista_interior(lista_interior, vecino) and not existe_en_lista_frontera(lista_frontera, vecino):
-                nodos_vecinos.append(f"({vecino.getFila()},{vecino.getCol()})")
-        print(f"Nodos_vecinos: {' '.join(nodos_vecinos)}")
-
-        # Mostrar lista_interior
-        lista_interior_str = ', '.join([f"({casilla.getFila()},{casilla.getCol()})" for casilla in lista_interior])
-        print(f"Lista_interior: {lista_interior_str}")
-
-        # Mostrar lista_frontera
-        lista_frontera_str = ' '.join([f"({nodo.getEstado().getFila()},{nodo.getEstado().getCol()})" for nodo in lista_frontera])
-        print(f"Lista_frontera: {lista_frontera_str}")
+        base = actual * GRADO_MAXIMO
+        fin = base + grado[actual]
+
+        # Mostrar Iteración
+        if por_iteracion:
+            nodos_vecinos = []
+            for k in range(base, fin):
+                vecino = vecinos_ady[k]
+                # Solo consideramos vecinos que no están en lista_interior ni en lista_frontera
+                if vecino not in cerrados and vecino not in lista_frontera:
+                    nodos_vecinos.append(vecino)
+            evento_iteracion(traza, ancho, iteracion, actual, nodos_vecinos, lista_interior,
+                             (nodo.getEstado() for nodo in lista_frontera), len(lista_frontera))
 
         # Verificar si hemos llegado al destino
-        if (nodo_actual.getEstado().getFila() == meta.getFila() and
-            nodo_actual.getEstado().getCol() == meta.getCol()):
-            print("\nCamino encontrado:")
-            camino_reconstruido, cal = reconstruir_camino(nodo_actual, mapi, camino)
-            mostrar_camino(camino_reconstruido, mapi)
-            return nodo_actual.f, cal  # Devolver el coste final y las calorías
+        if actual == id_meta:
+            if estadisticas is not None:
+                t0 = estadisticas.marcar("busqueda", t0)
+            camino_reconstruido, cal = reconstruir_camino(nodo_actual, mapi)
+            if por_iteracion:
+                traza.mensaje("\nCamino encontrado:")
+                mostrar_camino(camino_reconstruido, mapi, traza)
+            traza.emitir_resumen("a_estrella_subepsilon", nodo_actual.f, cal, iteracion, camino_reconstruido)
+            if estadisticas is not None:
+                estadisticas.marcar("reconstruccion", t0)
+                estadisticas.fijar("a_estrella_subepsilon", iteracion, generados, inserciones,
+                                   iteracion, duplicados, frontera_max)
+                estadisticas.focal_max = focal_max
+                estadisticas.focal_media = focal_total / iteracion
+            return nodo_actual.f, cal, camino_reconstruido  # Devolver el coste final, las calorías y el camino
 
         # Expandir los vecinos del nodo actual
-        for vecino in vecinos:
+        generados += fin - base
+        for k in range(base, fin):
+            vecino = vecinos_ady[k]
             # Verificar si el vecino ya está en lista_interior
-            if existe_en_lista_interior(lista_interior, vecino):
+            if vecino in cerrados:
+                duplicados += 1
+                continue
+
+            # Verificar si el vecino ya está en lista_frontera
+            if vecino in lista_frontera:
+                duplicados += 1
                 continue
 
             # Calcular el nuevo coste g
-            g_nuevo = nodo_actual.g + costo_movimiento_func(nodo_actual.getEstado(), vecino)
+            g_nuevo = nodo_actual.g + costes_ady[k]
 
             # Calcular las nuevas calorías acumuladas utilizando la función calcular_caloria
-            cal_nueva = calcular_caloria(nodo_actual, vecino, mapi)
+            cal_nueva = calcular_caloria_id(nodo_actual, vecino, mapi)
 
             # Crear el nodo vecino con las calorías actualizadas
             nodo_vecino = Nodo(
                 estado=vecino,
                 padre=nodo_actual,
                 g=g_nuevo,
-                h=tipo_heuristica(vecino, meta),
+                h=tipo_heuristica(mapi.casilla_de_id(vecino), meta),
                 cal=cal_nueva
             )
+            lista_frontera.insertar(vecino, nodo_vecino)
+            inserciones += 1
 
-            # Verificar si el vecino ya está en lista_frontera
-            if not existe_en_lista_frontera(lista_frontera, vecino):
-                heapq.heappush(lista_frontera, nodo_vecino)
+        if len(lista_frontera) > frontera_max:
+            frontera_max = len(lista_frontera)
 
         iteracion +=1
 
-    return -1, -1  # Devuelve -1 para el coste y calorías si no se encuentra un camino válido
+    traza.emitir_resumen("a_estrella_subepsilon", -1, -1, iteracion - 1, [])
+    if estadisticas is not None:
+        estadisticas.marcar("busqueda", t0)
+        estadisticas.fijar("a_estrella_subepsilon", iteracion - 1, generados, inserciones,
+                           iteracion - 1, duplicados, frontera_max)
+        estadisticas.focal_max = focal_max
+        estadisticas.focal_media = focal_total / max(iteracion - 1, 1)
+    return -1, -1, []  # Devuelve -1 para el coste y calorías si no se encuentra un camino válido
 
-def reconstruir_camino(nodo, mapi, camino):
+def reconstruir_camino(nodo, mapi, camino=None):
     """
-    Reconstruye el camino desde el nodo final hasta el inicial y lo marca en 'camino'.
+    Reconstruye el camino desde el nodo final hasta el inicial y, si se
+    indica, lo marca en 'camino'.
 
-    :param nodo: Nodo final (destino).
+    :param nodo: Nodo final (destino), con el id de su celda como estado.
     :param mapi: Objeto Mapa.
-    :param camino: Matriz para marcar el camino.
+    :param camino: Matriz para marcar el camino, o None.
     :return: Lista de casillas que forman el camino y las calorías totales.
     """
     camino_reconstruido = []
     calorias_totales = nodo.getCalorias()
     while nodo is not None:
-        camino_reconstruido.append(nodo.getEstado())
+        casilla = mapi.casilla_de_id(nodo.getEstado())
+        camino_reconstruido.append(casilla)
         # Marcar el camino en 'camino' con un asterisco '*'
-        fila = nodo.getEstado().getFila()
-        columna = nodo.getEstado().getCol()
-        camino[fila][columna] = '*'  # Puedes cambiar el símbolo si lo prefieres
+        if camino is not None:
+            camino[casilla.getFila()][casilla.getCol()] = '*'  # Puedes cambiar el símbolo si lo prefieres
         nodo = nodo.padre
     camino_reconstruido = camino_reconstruido[::-1]  # Invertir para que vaya desde inicio hasta destino
     return camino_reconstruido, calorias_totales
 
-def mostrar_camino(camino, mapi):
+def mostrar_camino(camino, mapi, traza=None):
     """
     Imprime el camino encontrado y visualiza el mapa con el camino marcado.
 
     :param camino: Lista de objetos Casilla que forman el camino.
     :param mapi: Objeto Mapa.
+    :param traza: Destino de los mensajes; por defecto la consola.
     """
+    traza = traza_por_defecto(traza)
+
     # Imprimir el camino en formato (fila,columna),(fila,columna),...
     camino_str = ','.join([f"({casilla.getFila()},{casilla.getCol()})" for casilla in camino])
-    print(camino_str)
+    traza.mensaje(camino_str)
 
     # Visualización del mapa con el camino marcado ('*')
-    print("\nVisualización del Camino en el Mapa:")
+    traza.mensaje("\nVisualización del Camino en el Mapa:")
     mapa_visual = [
         [mapi.getCelda(fila, columna) for columna in range(mapi.getAncho())]
         for fila in range(mapi.getAlto())
@@ -203,5 +236,5 @@ def mostrar_camino(camino, mapi):
             '*' if celda == '*' else '.' if celda == 0 else '#' if celda ==1 else '~' if celda==4 else '*' if celda==5 else '.' 
             for celda in fila
         ])
-        print(fila_mostrar)
+        traza.mensaje(fila_mostrar)
 
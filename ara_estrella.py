@@ -0,0 +1,203 @@
+# ara_estrella.py
+
+import heapq
+import time
+
+from mapa import GRADO_MAXIMO
+from a_estrella import calorias_camino, inalcanzable
+from traza import TRAZA_ITERACION, traza_por_defecto, evento_iteracion
+from perfilado import perfilable
+
+PESO_INICIAL = 3.0
+DECREMENTO_PESO = 0.5
+COMPROBAR_TIEMPO = 256  # Expansiones entre comprobaciones del tiempo límite
+
+def ara_estrella(camino, inicio, meta, obtener_vecinos, costo_movimiento, tipo_heuristica, mapi, traza=None,
+                 peso_inicial=PESO_INICIAL, decremento=DECREMENTO_PESO, tiempo_max=None, al_mejorar=None,
+                 estadisticas=None):
+    """
+    ARA* con la misma firma que a_estrella (más sus parámetros propios, ver
+    buscar_ara_estrella): marca con '*' en la matriz 'camino' el mejor camino
+    encontrado y devuelve (coste, calorías).
+    """
+    coste, cal, camino_reconstruido, _ = buscar_ara_estrella(inicio, meta, obtener_vecinos, costo_movimiento,
+                                                             tipo_heuristica, mapi, traza, peso_inicial, decremento,
+                                                             tiempo_max, al_mejorar, estadisticas)
+    for casilla in camino_reconstruido:
+        camino[casilla.getFila()][casilla.getCol()] = '*'
+    return coste, cal
+
+@perfilable("ara_estrella")
+def buscar_ara_estrella(inicio, meta, obtener_vecinos, costo_movimiento, tipo_heuristica, mapi, traza=None,
+                        peso_inicial=PESO_INICIAL, decremento=DECREMENTO_PESO, tiempo_max=None, al_mejorar=None,
+                        estadisticas=None):
+    """
+    Anytime Repairing A* (Likhachev, Gordon y Thrun, 2003).
+
+    Empieza con una búsqueda A* ponderada (f = g + peso*h) que encuentra
+    rápido un primer camino con coste como mucho peso veces el óptimo. Luego
+    reduce el peso en 'decremento' y repite la búsqueda hasta llegar a peso 1,
+    pero sin empezar de cero: conserva los g y los padres, y cada nueva
+    búsqueda parte de la frontera anterior más las casillas inconsistentes
+    (las que mejoraron después de haberse expandido), reordenadas con el
+    nuevo peso. Dentro de cada búsqueda una casilla se expande como mucho
+    una vez.
+
+    La cota de cada solución es min(peso, g(meta) / min(g + h)) sobre la
+    frontera y las inconsistentes, y solo es válida con una heurística
+    admisible (octil_heuristica con las diagonales de coste 1.5).
+
+    :param peso_inicial: Peso de la heurística en la primera búsqueda (>= 1).
+    :param decremento: Cuánto se reduce el peso entre búsquedas (> 0, si no
+                       el peso nunca llegaría a 1).
+    :param tiempo_max: Segundos disponibles; al agotarse se devuelve el mejor
+                       camino encontrado. La primera búsqueda siempre se
+                       completa. None para seguir hasta el óptimo.
+    :param al_mejorar: Función opcional al_mejorar(coste, calorías, cota) que
+                       se llama con cada solución nueva.
+    :param estadisticas: EstadisticasBusqueda opcional con los totales de todas las búsquedas.
+    :return: Tupla (coste, calorías, lista de casillas del camino, cota), o
+             (-1, -1, [], None) si no hay camino.
+    :raises ValueError: Si peso_inicial < 1 o decremento <= 0.
+    """
+    if peso_inicial < 1:
+        raise ValueError(f"El peso inicial debe ser al menos 1: {peso_inicial}")
+    if decremento <= 0:
+        raise ValueError(f"El decremento del peso debe ser positivo: {decremento}")
+    t0 = inicio_reloj = time.perf_counter()
+    limite = inicio_reloj + tiempo_max if tiempo_max is not None else None
+    traza = traza_por_defecto(traza)
+    por_iteracion = traza.activa(TRAZA_ITERACION)
+    ancho = mapi.getAncho()
+    adyacencia = mapi.adyacencia_para(obtener_vecinos, costo_movimiento)
+    grado, vecinos_ady, costes_ady = adyacencia.grado, adyacencia.vecinos, adyacencia.costes
+
+    id_inicio = mapi.id_casilla(inicio)
+    id_meta = mapi.id_casilla(meta)
+    if inalcanzable(id_inicio, id_meta, obtener_vecinos, mapi):
+        traza.mensaje("EL CONEJO NO PUEDE ALCANZAR LA ZANAHORIA")
+        traza.emitir_resumen("ara_estrella", -1, -1, 0, [])
+        if estadisticas is not None:
+            estadisticas.fijar("ara_estrella", 0, 0, 0, 0, 0, 0)
+        return -1, -1, [], None
+
+    h_de = {}
+
+    def h(i):
+        valor = h_de.get(i)
+        if valor is None:
+            valor = h_de[i] = tipo_heuristica(mapi.casilla_de_id(i), meta)
+        return valor
+
+    g = {id_inicio: 0}
+    padres = {id_inicio: None}
+    peso = max(1.0, peso_inicial)
+    abiertos = {id_inicio}       # Frontera de la búsqueda actual
+    inconsistentes = set()       # Mejoradas tras expandirse en la búsqueda actual
+    frontera = [(peso * h(id_inicio), 0, id_inicio)]
+    expandidos = []              # Expansiones de todas las búsquedas
+
+    mejor = None                 # (coste, calorías, casillas, cota)
+    generados = extracciones = duplicados = 0
+    inserciones = frontera_max = 1
+    if estadisticas is not None:
+        t0 = estadisticas.marcar("preparacion", t0)
+
+    while True:
+        # Mejorar el camino con el peso actual
+        cerrados = set()
+        agotado = False
+        while frontera:
+            clave, g_entrada, actual = frontera[0]
+            if actual not in abiertos or g_entrada != g[actual]:
+                heapq.heappop(frontera)  # Entrada obsoleta
+                extracciones += 1
+                duplicados += 1
+                continue
+            if clave >= g.get(id_meta, float("inf")) + peso * h(id_meta):
+                break
+            if limite is not None and mejor is not None and len(expandidos) % COMPROBAR_TIEMPO == 0 \
+                    and time.perf_counter() > limite:
+                agotado = True
+                break
+            heapq.heappop(frontera)
+            extracciones += 1
+            abiertos.discard(actual)
+            cerrados.add(actual)
+            expandidos.append(actual)
+
+            nodos_vecinos = []
+            base = actual * GRADO_MAXIMO
+            generados += grado[actual]
+            for k in range(base, base + grado[actual]):
+                vecino = vecinos_ady[k]
+                g_nuevo = g_entrada + costes_ady[k]
+                if g_nuevo >= g.get(vecino, float("inf")):
+                    duplicados += 1
+                    continue
+                g[vecino] = g_nuevo
+                padres[vecino] = actual
+                if vecino in cerrados:
+                    inconsistentes.add(vecino)
+                else:
+                    abiertos.add(vecino)
+                    heapq.heappush(frontera, (g_nuevo + peso * h(vecino), g_nuevo, vecino))
+                    inserciones += 1
+                    if por_iteracion:
+                        nodos_vecinos.append(vecino)
+            if len(frontera) > frontera_max:
+                frontera_max = len(frontera)
+
+            if por_iteracion:
+                evento_iteracion(traza, ancho, len(expandidos), actual, nodos_vecinos, expandidos,
+                                 abiertos, len(abiertos))
+
+        if agotado:
+            traza.mensaje(f"Tiempo agotado con peso {peso}")
+            break
+        if id_meta not in g:
+            break  # Ninguna búsqueda encontrará camino: la primera ya ha recorrido todo lo alcanzable
+
+        # Publicar la solución si mejora la anterior
+        coste = g[id_meta]
+        pendientes = abiertos | inconsistentes
+        minimo = min((g[i] + h(i) for i in pendientes), default=coste)
+        cota = min(peso, coste / minimo) if minimo > 0 else 1.0
+        if mejor is None or coste < mejor[0]:
+            ids = []
+            i = id_meta
+            while i is not None:
+                ids.append(i)
+                i = padres[i]
+            casillas = [mapi.casilla_de_id(i) for i in reversed(ids)]
+            mejor = (coste, calorias_camino(casillas, mapi), casillas, cota)
+            traza.mensaje(f"ARA*: peso={peso} coste={coste} cota={cota:.3f}")
+            if al_mejorar is not None:
+                al_mejorar(coste, mejor[1], cota)
+        else:
+            mejor = mejor[:3] + (min(mejor[3], cota),)
+
+        if peso <= 1 or (limite is not None and time.perf_counter() > limite):
+            break
+
+        # Siguiente búsqueda: menos peso, partiendo de la frontera y las inconsistentes
+        peso = max(1.0, peso - decremento)
+        abiertos = pendientes
+        inconsistentes = set()
+        frontera = [(g[i] + peso * h(i), g[i], i) for i in abiertos]
+        heapq.heapify(frontera)
+        inserciones += len(frontera)
+
+    if estadisticas is not None:
+        t0 = estadisticas.marcar("busqueda", t0)
+        estadisticas.fijar("ara_estrella", len(expandidos), generados, inserciones, extracciones, duplicados,
+                           frontera_max)
+    if mejor is None:
+        traza.mensaje("EL CONEJO NO PUEDE ALCANZAR LA ZANAHORIA")
+        traza.emitir_resumen("ara_estrella", -1, -1, len(expandidos), [])
+        return -1, -1, [], None
+
+    coste, cal, casillas, cota = mejor
+    traza.mensaje(f"LAS CALORIAS SON {cal}")
+    traza.emitir_resumen("ara_estrella", coste, cal, len(expandidos), casillas)
+    return coste, cal, casillas, cota
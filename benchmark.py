@@ -0,0 +1,465 @@
+# benchmark.py
+
+import argparse
+import heapq
+import random
+import time
+import tracemalloc
+
+from casilla import Casilla
+from mapa import Mapa
+from nodo import Nodo
+from lista_focal import ListaFocal
+from heuristicas import manhattan_heuristica
+from a_estrella import (buscar_a_estrella, octil_heuristica, trivial_heuristica, euclidea_heuristica,
+                        chebyshev_heuristica)
+from cola_cubetas import ColaCubetas
+from heuristica_alt import HeuristicaALT
+from campo_distancias import CampoDistancias
+from frente_onda import distancias_frente_onda, hay_numpy
+from a_estrella_subepsilon import calcular_caloria_id
+from a_estrella_bidireccional import buscar_a_estrella_bidireccional
+from jps import buscar_jps
+from busqueda_jerarquica import GrafoJerarquico
+from d_estrella_lite import PlanificadorDLite
+from generador_mapas import generar_mapa_abierto, generar_laberinto, generar_terreno_mixto, casilla_libre_cercana
+from traza import TrazaBuffer, TRAZA_RESUMEN, SIN_TRAZA
+
+class FocalLineal:
+    """
+    Lista focal tal y como se construía antes de ListaFocal: se recorre toda la
+    frontera en cada extracción, se elimina con list.remove y se reordena con
+    heapify. Solo se usa como referencia para medir.
+    """
+    def __init__(self, epsilon):
+        self.epsilon = epsilon
+        self.frontera = []  # (f, seq, clave, nodo)
+        self.claves = set()
+        self.contador = 0
+
+    def __len__(self):
+        return len(self.frontera)
+
+    def __contains__(self, clave):
+        return clave in self.claves
+
+    def insertar(self, clave, nodo):
+        heapq.heappush(self.frontera, (nodo.f, self.contador, clave, nodo))
+        self.claves.add(clave)
+        self.contador += 1
+
+    def extraer(self):
+        min_f = self.frontera[0][0]
+        lista_focal = [e for e in self.frontera if e[0] <= (1 + self.epsilon) * min_f]
+        elegido = min(lista_focal, key=lambda e: (e[3].cal, e[0], e[1]))
+        self.frontera.remove(elegido)
+        heapq.heapify(self.frontera)
+        self.claves.discard(elegido[2])
+        return elegido[2], elegido[3]
+
+def expandir_subepsilon(mapi, inicio, meta, frontera):
+    """
+    Bucle de expansión de A* Subε sin trazas, con la frontera indicada.
+
+    :return: Tupla (coste, calorías, nodos expandidos).
+    """
+    cerrados = set()
+    id_inicio, id_meta = mapi.id_casilla(inicio), mapi.id_casilla(meta)
+    frontera.insertar(id_inicio, Nodo(id_inicio, None, 0, manhattan_heuristica(inicio, meta),
+                                      cal=calcular_caloria_id(None, id_inicio, mapi)))
+    while frontera:
+        actual, nodo_actual = frontera.extraer()
+        cerrados.add(actual)
+        if actual == id_meta:
+            return nodo_actual.f, nodo_actual.cal, len(cerrados)
+        for vecino in mapi.getVecinosId(actual):
+            if vecino in cerrados or vecino in frontera:
+                continue
+            g_nuevo = nodo_actual.g + mapi.costo_movimiento_id(actual, vecino)
+            frontera.insertar(vecino, Nodo(vecino, nodo_actual, g_nuevo, manhattan_heuristica(mapi.casilla_de_id(vecino), meta),
+                                           cal=calcular_caloria_id(nodo_actual, vecino, mapi)))
+    return -1, -1, len(cerrados)
+
+def a_estrella_referencia(mapi, inicio, meta, heuristica):
+    """
+    A* tal y como estaba antes de los conjuntos hash: un vecino solo entra en
+    la frontera si no está ya en ella (se queda con el primer g) y los nodos
+    expandidos no se reabren. Mismo orden de vecinos y mismo montículo de
+    Nodo, así que da el mismo resultado. Solo se usa como referencia.
+
+    :return: Coste del camino, o -1 si no hay.
+    """
+    id_meta = mapi.id_casilla(meta)
+    id_inicio = mapi.id_casilla(inicio)
+    frontera = [Nodo(id_inicio, None, 0, heuristica(inicio, meta))]
+    en_frontera = {id_inicio}
+    interior = set()
+    while frontera:
+        nodo = heapq.heappop(frontera)
+        actual = nodo.getEstado()
+        en_frontera.discard(actual)
+        interior.add(actual)
+        if actual == id_meta:
+            return nodo.f
+        for vecino in mapi.getVecinosId(actual):
+            if vecino in interior or vecino in en_frontera:
+                continue
+            g_nuevo = nodo.g + mapi.costo_movimiento_id(actual, vecino)
+            heapq.heappush(frontera, Nodo(vecino, nodo, g_nuevo, heuristica(mapi.casilla_de_id(vecino), meta)))
+            en_frontera.add(vecino)
+    return -1
+
+def bench_referencia(mapas, max_pares, semilla):
+    """
+    Compara buscar_a_estrella con a_estrella_referencia en los mapas indicados,
+    con todas las heurísticas, sobre todos los pares origen/destino (o una
+    muestra de max_pares). Avisa de cada consulta en la que el coste empeora.
+    """
+    heuristicas = (("manhattan", manhattan_heuristica), ("euclidea", euclidea_heuristica),
+                   ("chebyshev", chebyshev_heuristica), ("octil", octil_heuristica), ("trivial", trivial_heuristica))
+    print(f"{'mapa':>10} {'heurística':>10} {'pares':>7} {'iguales':>8} {'mejor':>6} {'peor':>5}")
+    total_peor = 0
+    for ruta in mapas:
+        mapi = Mapa(ruta)
+        libres = [i for i in range(mapi.getAlto() * mapi.getAncho()) if mapi.transitable_id(i)]
+        pares = [(a, b) for a in libres for b in libres if a != b]
+        if max_pares is not None and len(pares) > max_pares:
+            pares = random.Random(semilla).sample(pares, max_pares)
+        for nombre, heuristica in heuristicas:
+            iguales = mejor = peor = 0
+            for a, b in pares:
+                inicio, meta = mapi.casilla_de_id(a), mapi.casilla_de_id(b)
+                ref = a_estrella_referencia(mapi, inicio, meta, heuristica)
+                coste = buscar_a_estrella(inicio, meta, mapi.getVecinos, mapi.costo_movimiento, heuristica, mapi,
+                                          SIN_TRAZA)[0]
+                if coste == ref:
+                    iguales += 1
+                elif ref == -1 or (coste != -1 and coste < ref):
+                    mejor += 1
+                else:
+                    peor += 1
+                    print(f"AVISO: {ruta} {nombre} ({inicio.getFila()},{inicio.getCol()})->"
+                          f"({meta.getFila()},{meta.getCol()}): {coste} > {ref}")
+            total_peor += peor
+            print(f"{ruta:>10} {nombre:>10} {len(pares):>7} {iguales:>8} {mejor:>6} {peor:>5}")
+    print("Ninguna consulta empeora" if total_peor == 0 else f"{total_peor} consultas empeoran")
+
+def bench_focal(tamanos, epsilons, semilla):
+    """Compara ListaFocal con la lista focal lineal en mapas generados."""
+    print(f"{'tamaño':>8} {'epsilon':>8} {'expandidos':>11} {'lineal (s)':>11} {'focal (s)':>10} {'mejora':>8}")
+    for tam in tamanos:
+        mapi = generar_mapa_abierto(tam, tam, semilla=semilla)
+        inicio = Casilla(*casilla_libre_cercana(mapi, 1, 1))
+        meta = Casilla(*casilla_libre_cercana(mapi, tam - 2, tam - 2))
+        for epsilon in epsilons:
+            t0 = time.perf_counter()
+            ref = expandir_subepsilon(mapi, inicio, meta, FocalLineal(epsilon))
+            t1 = time.perf_counter()
+            res = expandir_subepsilon(mapi, inicio, meta, ListaFocal(epsilon))
+            t2 = time.perf_counter()
+            if ref != res:
+                print(f"AVISO: resultados distintos {ref} != {res}")
+            print(f"{tam:>8} {epsilon:>8} {res[2]:>11} {t1 - t0:>11.3f} {t2 - t1:>10.3f} {(t1 - t0) / (t2 - t1):>7.1f}x")
+
+def medir(buscar, *args):
+    """
+    Ejecuta una búsqueda con traza de resumen en memoria.
+    :return: Tupla (coste, expandidos, segundos).
+    """
+    traza = TrazaBuffer(1, TRAZA_RESUMEN)
+    t0 = time.perf_counter()
+    coste = buscar(*args, traza)[0]
+    segundos = time.perf_counter() - t0
+    return coste, traza.eventos()[-1]["expandidos"], segundos
+
+def bench_bidireccional(tamanos, semilla):
+    """Nodos expandidos por A* y A* bidireccional en mapas abiertos y laberintos."""
+    print(f"{'mapa':>10} {'tamaño':>7} {'heurística':>10} {'coste':>9} {'exp. A*':>9} {'exp. bidir':>11} "
+          f"{'t A* (s)':>9} {'t bidir (s)':>12}")
+    for tam in tamanos:
+        for tipo, mapi in (("abierto", generar_mapa_abierto(tam, tam, semilla=semilla)),
+                           ("laberinto", generar_laberinto(tam | 1, tam | 1, semilla=semilla))):
+            mapi.preparar_adyacencia()  # Fuera de la medición
+            inicio = Casilla(*casilla_libre_cercana(mapi, 1, 1))
+            meta = Casilla(*casilla_libre_cercana(mapi, mapi.getAlto() - 2, mapi.getAncho() - 2))
+            for nombre, heuristica in (("octil", octil_heuristica), ("trivial", trivial_heuristica)):
+                args = (inicio, meta, mapi.getVecinos, mapi.costo_movimiento, heuristica, mapi)
+                coste, exp_a, t_a = medir(buscar_a_estrella, *args)
+                coste_b, exp_b, t_b = medir(buscar_a_estrella_bidireccional, *args)
+                if coste != coste_b:
+                    print(f"AVISO: costes distintos {coste} != {coste_b}")
+                print(f"{tipo:>10} {tam:>7} {nombre:>10} {coste:>9} {exp_a:>9} {exp_b:>11} {t_a:>9.3f} {t_b:>12.3f}")
+
+def bench_jps(tamanos, semilla):
+    """Puntos de salto expandidos por JPS frente a los nodos expandidos por A*."""
+    print(f"{'mapa':>10} {'tamaño':>7} {'coste':>9} {'exp. A*':>9} {'exp. JPS':>9} {'t A* (s)':>9} {'t JPS (s)':>10}")
+    for tam in tamanos:
+        for tipo, mapi in (("abierto", generar_mapa_abierto(tam, tam, semilla=semilla)),
+                           ("laberinto", generar_laberinto(tam | 1, tam | 1, semilla=semilla))):
+            mapi.preparar_adyacencia()  # Fuera de la medición
+            inicio = Casilla(*casilla_libre_cercana(mapi, 1, 1))
+            meta = Casilla(*casilla_libre_cercana(mapi, mapi.getAlto() - 2, mapi.getAncho() - 2))
+            args = (inicio, meta, mapi.getVecinos, mapi.costo_movimiento, octil_heuristica, mapi)
+            coste, exp_a, t_a = medir(buscar_a_estrella, *args)
+            coste_j, exp_j, t_j = medir(buscar_jps, *args)
+            if coste != coste_j:
+                print(f"AVISO: costes distintos {coste} != {coste_j}")
+            print(f"{tipo:>10} {tam:>7} {coste:>9} {exp_a:>9} {exp_j:>9} {t_a:>9.3f} {t_j:>10.3f}")
+
+def bench_cola(tamanos, semilla):
+    """A* con la frontera en un montículo de heapq frente a la cola por cubetas."""
+    print(f"{'mapa':>10} {'tamaño':>7} {'heurística':>10} {'coste heap':>11} {'coste cub.':>11} {'exp. heap':>10} "
+          f"{'exp. cub.':>10} {'t heap (s)':>11} {'t cub. (s)':>11} {'ratio':>7}")
+    for tam in tamanos:
+        for tipo, mapi in (("abierto", generar_mapa_abierto(tam, tam, semilla=semilla)),
+                           ("laberinto", generar_laberinto(tam | 1, tam | 1, semilla=semilla))):
+            mapi.preparar_adyacencia()  # Fuera de la medición
+            inicio = Casilla(*casilla_libre_cercana(mapi, 1, 1))
+            meta = Casilla(*casilla_libre_cercana(mapi, mapi.getAlto() - 2, mapi.getAncho() - 2))
+            for nombre, heuristica in (("octil", octil_heuristica), ("manhattan", manhattan_heuristica)):
+                args = (inicio, meta, mapi.getVecinos, mapi.costo_movimiento, heuristica, mapi)
+                coste_h, exp_h, t_h = medir(buscar_a_estrella, *args)
+                coste_c, exp_c, t_c = medir(lambda *a: buscar_a_estrella(*a, cola=ColaCubetas), *args)
+                # Con manhattan (no admisible) el desempate puede cambiar el camino y su coste
+                if coste_h != coste_c and heuristica is octil_heuristica:
+                    print(f"AVISO: costes distintos {coste_h} != {coste_c}")
+                print(f"{tipo:>10} {tam:>7} {nombre:>10} {coste_h:>11} {coste_c:>11} {exp_h:>10} {exp_c:>10} "
+                      f"{t_h:>11.3f} {t_c:>11.3f} {t_h / t_c:>6.2f}x")
+
+def bench_nodo(tamanos, semilla):
+    """
+    Tiempo de A* y memoria reservada por nodo expandido (pico de tracemalloc)
+    en mapas abiertos; se mide con la adyacencia ya preparada.
+    """
+    print(f"{'tamaño':>7} {'coste':>9} {'expandidos':>11} {'tiempo (s)':>11} {'nodos/s':>10} {'bytes/exp.':>11}")
+    for tam in tamanos:
+        mapi = generar_mapa_abierto(tam, tam, semilla=semilla)
+        mapi.preparar_adyacencia()
+        inicio = Casilla(*casilla_libre_cercana(mapi, 1, 1))
+        meta = Casilla(*casilla_libre_cercana(mapi, tam - 2, tam - 2))
+        args = (inicio, meta, mapi.getVecinos, mapi.costo_movimiento, octil_heuristica, mapi)
+        coste, expandidos, segundos = medir(buscar_a_estrella, *args)
+        tracemalloc.start()
+        buscar_a_estrella(*args, SIN_TRAZA)
+        pico = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        print(f"{tam:>7} {coste:>9} {expandidos:>11} {segundos:>11.3f} {expandidos / segundos:>10.0f} "
+              f"{pico / expandidos:>11.1f}")
+
+def bench_alt(tamanos, landmarks, consultas, semilla):
+    """Nodos expandidos por A* con la heurística octil y con ALT, y coste del preproceso de ALT."""
+    rnd = random.Random(semilla)
+    print(f"{'mapa':>10} {'tamaño':>7} {'landmarks':>10} {'t prep. (s)':>12} {'exp. octil':>11} {'exp. ALT':>9} "
+          f"{'t octil (s)':>12} {'t ALT (s)':>10}")
+    for tam in tamanos:
+        for tipo, mapi in (("abierto", generar_mapa_abierto(tam, tam, semilla=semilla)),
+                           ("laberinto", generar_laberinto(tam | 1, tam | 1, semilla=semilla))):
+            mapi.preparar_adyacencia()  # Fuera de la medición
+            t0 = time.perf_counter()
+            alt = HeuristicaALT.construir(mapi, landmarks)
+            t_prep = time.perf_counter() - t0
+
+            libres = [i for i in range(mapi.getAlto() * mapi.getAncho()) if mapi.transitable_id(i)]
+            exp_o = exp_l = 0
+            t_o = t_l = 0
+            for _ in range(consultas):
+                inicio, meta = (mapi.casilla_de_id(i) for i in rnd.sample(libres, 2))
+                coste_o, e, t = medir(buscar_a_estrella, inicio, meta, mapi.getVecinos, mapi.costo_movimiento,
+                                      octil_heuristica, mapi)
+                exp_o += e
+                t_o += t
+                coste_l, e, t = medir(buscar_a_estrella, inicio, meta, mapi.getVecinos, mapi.costo_movimiento,
+                                      alt, mapi)
+                exp_l += e
+                t_l += t
+                if coste_o != coste_l:
+                    print(f"AVISO: costes distintos {coste_o} != {coste_l}")
+            print(f"{tipo:>10} {tam:>7} {len(alt.landmarks):>10} {t_prep:>12.2f} {exp_o:>11} {exp_l:>9} "
+                  f"{t_o:>12.3f} {t_l:>10.3f}")
+
+def bench_frente_onda(tamanos, tam_laberinto, consultas, semilla):
+    """
+    Distancias a toda la rejilla con el frente de onda de NumPy frente al
+    Dijkstra de CampoDistancias, comprobando además algunas contra A*. Los
+    laberintos necesitan una iteración por cada pocas vueltas del camino, así
+    que solo se miden hasta 'tam_laberinto'.
+    """
+    if not hay_numpy():
+        print("El frente de onda necesita NumPy (pip install numpy)")
+        return
+    rnd = random.Random(semilla)
+    print(f"{'mapa':>10} {'tamaño':>7} {'iteraciones':>12} {'t Dijkstra (s)':>15} {'t onda (s)':>11} {'ratio':>7}")
+    for tam in tamanos:
+        mapas = [("abierto", generar_mapa_abierto(tam, tam, semilla=semilla)),
+                 ("mixto", generar_terreno_mixto(tam, tam, semilla=semilla))]
+        if tam <= tam_laberinto:
+            mapas.append(("laberinto", generar_laberinto(tam | 1, tam | 1, semilla=semilla)))
+        for tipo, mapi in mapas:
+            mapi.preparar_adyacencia()  # Fuera de la medición
+            meta = Casilla(*casilla_libre_cercana(mapi, mapi.getAlto() // 2, mapi.getAncho() // 2))
+            t0 = time.perf_counter()
+            campo = CampoDistancias(mapi, meta)
+            t1 = time.perf_counter()
+            onda, iteraciones = distancias_frente_onda(mapi, [mapi.id_casilla(meta)])
+            t2 = time.perf_counter()
+
+            onda = onda.ravel().tolist()
+            distintas = sum(1 for d, o in zip(campo.distancias, onda) if d != o and abs(d - o) > 1e-9)
+            if distintas:
+                print(f"AVISO: {distintas} distancias distintas de las de Dijkstra")
+            libres = [i for i in range(mapi.getAlto() * mapi.getAncho()) if mapi.transitable_id(i)]
+            for i in rnd.sample(libres, min(consultas, len(libres))):
+                coste = buscar_a_estrella(mapi.casilla_de_id(i), meta, mapi.getVecinos, mapi.costo_movimiento,
+                                          octil_heuristica if mapi.uniforme else trivial_heuristica, mapi,
+                                          SIN_TRAZA)[0]
+                if coste != (-1 if onda[i] == float("inf") else onda[i]) and abs(coste - onda[i]) > 1e-9:
+                    print(f"AVISO: coste de A* {coste} != {onda[i]}")
+            print(f"{tipo:>10} {tam:>7} {iteraciones:>12} {t1 - t0:>15.3f} {t2 - t1:>11.3f} "
+                  f"{(t1 - t0) / (t2 - t1):>6.2f}x")
+
+def bench_jerarquico(tamanos, tam_cluster, consultas, semilla):
+    """Calidad y tiempo de la búsqueda jerárquica frente a A* óptimo, y coste de rehacer clusters."""
+    rnd = random.Random(semilla)
+    print(f"{'mapa':>10} {'tamaño':>7} {'entradas':>9} {'t grafo':>8} {'t A* (s)':>9} {'t jer. (s)':>10} "
+          f"{'exceso medio':>13} {'exceso máx.':>12} {'t setCelda':>11}")
+    for tam in tamanos:
+        for tipo, mapi in (("abierto", generar_mapa_abierto(tam, tam, semilla=semilla)),
+                           ("laberinto", generar_laberinto(tam | 1, tam | 1, semilla=semilla))):
+            mapi.preparar_adyacencia()  # Fuera de la medición
+            t0 = time.perf_counter()
+            grafo = GrafoJerarquico(mapi, tam_cluster)
+            t_grafo = time.perf_counter() - t0
+
+            libres = [i for i in range(mapi.getAlto() * mapi.getAncho()) if mapi.transitable_id(i)]
+            t_a = t_j = 0
+            excesos = []
+            for _ in range(consultas):
+                inicio, meta = (mapi.casilla_de_id(i) for i in rnd.sample(libres, 2))
+                t0 = time.perf_counter()
+                optimo = buscar_a_estrella(inicio, meta, mapi.getVecinos, mapi.costo_movimiento,
+                                           octil_heuristica, mapi, SIN_TRAZA)[0]
+                t_a += time.perf_counter() - t0
+                t0 = time.perf_counter()
+                coste = grafo.buscar(inicio, meta, octil_heuristica, SIN_TRAZA)[0]
+                t_j += time.perf_counter() - t0
+                if optimo > 0:
+                    excesos.append(coste / optimo - 1)
+
+            # Rehacer tras cambiar una celda (solo los clusters afectados)
+            celda = mapi.casilla_de_id(rnd.choice(libres))
+            t0 = time.perf_counter()
+            mapi.setCelda(celda.getFila(), celda.getCol(), 1)
+            grafo.actualizar()
+            t_cambio = time.perf_counter() - t0
+
+            medio = 100 * sum(excesos) / len(excesos) if excesos else 0
+            maximo = 100 * max(excesos, default=0)
+            print(f"{tipo:>10} {tam:>7} {grafo.num_entradas():>9} {t_grafo:>8.2f} {t_a:>9.3f} {t_j:>10.3f} "
+                  f"{medio:>12.2f}% {maximo:>11.2f}% {t_cambio:>11.4f}")
+
+def bench_incremental(tamanos, pasos, cambios, semilla):
+    """
+    Replanificación con D* Lite frente a repetir A* completo: en cada paso el
+    agente avanza una casilla y se cambian 'cambios' celdas al azar.
+    """
+    rnd = random.Random(semilla)
+    print(f"{'tamaño':>7} {'cambios':>8} {'exp. A*':>10} {'exp. D*Lite':>12} {'t A* (s)':>9} {'t D*Lite (s)':>13}")
+    for tam in tamanos:
+        mapi = generar_mapa_abierto(tam, tam, densidad_muros=0.15, semilla=semilla)
+        mapi.preparar_adyacencia()
+        inicio = Casilla(*casilla_libre_cercana(mapi, 1, 1))
+        meta = Casilla(*casilla_libre_cercana(mapi, tam - 2, tam - 2))
+        planificador = PlanificadorDLite(mapi, inicio, meta)
+        planificador.planificar(SIN_TRAZA)  # La primera planificación es completa y no se cuenta
+        exp_a = exp_d = 0
+        t_a = t_d = 0
+        for _ in range(pasos):
+            for _ in range(cambios):
+                fila, col = rnd.randrange(1, tam - 1), rnd.randrange(1, tam - 1)
+                if (fila, col) not in ((inicio.getFila(), inicio.getCol()), (meta.getFila(), meta.getCol())):
+                    mapi.setCelda(fila, col, 1 if mapi.getCelda(fila, col) != 1 else 0)
+
+            coste, exp, t = medir(buscar_a_estrella, inicio, meta, mapi.getVecinos, mapi.costo_movimiento,
+                                  octil_heuristica, mapi)
+            exp_a += exp
+            t_a += t
+            t0 = time.perf_counter()
+            coste_d, _, camino = planificador.planificar(SIN_TRAZA)
+            t_d += time.perf_counter() - t0
+            exp_d += planificador.expandidos
+            if coste != coste_d:
+                print(f"AVISO: costes distintos {coste} != {coste_d}")
+            if len(camino) > 1:
+                inicio = camino[1]
+                planificador.mover_inicio(inicio)
+        print(f"{tam:>7} {cambios:>8} {exp_a:>10} {exp_d:>12} {t_a:>9.3f} {t_d:>13.3f}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks de los algoritmos de búsqueda")
+    parser.add_argument("--semilla", type=int, default=1)
+    sub = parser.add_subparsers(dest="prueba", required=True)
+
+    p = sub.add_parser("focal", help="Lista focal de A* Subε frente a la reconstrucción lineal")
+    p.add_argument("--tamanos", type=int, nargs="+", default=[100, 200, 300])
+    p.add_argument("--epsilons", type=float, nargs="+", default=[0.0, 0.2, 0.5, 1.0, 2.0])
+
+    p = sub.add_parser("bidireccional", help="A* bidireccional frente a A* unidireccional")
+    p.add_argument("--tamanos", type=int, nargs="+", default=[100, 200, 400])
+
+    p = sub.add_parser("jps", help="Jump Point Search frente a A*")
+    p.add_argument("--tamanos", type=int, nargs="+", default=[100, 200, 400])
+
+    p = sub.add_parser("cola", help="Frontera de A* en montículo (heapq) frente a cola por cubetas")
+    p.add_argument("--tamanos", type=int, nargs="+", default=[256, 512, 1024])
+
+    p = sub.add_parser("referencia", help="A* frente a su versión original (sin reapertura) en los mapas del repositorio")
+    p.add_argument("--mapas", nargs="+", default=["mapa.txt", "mapa1.txt", "mapa2.txt", "mapa3.txt", "mapa4.txt"])
+    p.add_argument("--max-pares", type=int, help="Muestra de pares origen/destino por mapa (por defecto todos)")
+
+    p = sub.add_parser("nodo", help="Velocidad de A* y memoria por nodo expandido")
+    p.add_argument("--tamanos", type=int, nargs="+", default=[256, 512, 1024])
+
+    p = sub.add_parser("alt", help="Heurística ALT (landmarks) frente a la distancia octil")
+    p.add_argument("--tamanos", type=int, nargs="+", default=[128, 256, 512])
+    p.add_argument("--landmarks", type=int, default=8)
+    p.add_argument("--consultas", type=int, default=20)
+
+    p = sub.add_parser("frente_onda", help="Distancias con el frente de onda de NumPy frente a Dijkstra")
+    p.add_argument("--tamanos", type=int, nargs="+", default=[512, 1024, 2048])
+    p.add_argument("--tam-laberinto", type=int, default=256)
+    p.add_argument("--consultas", type=int, default=5)
+
+    p = sub.add_parser("jerarquico", help="Búsqueda jerárquica (HPA*) frente a A* óptimo")
+    p.add_argument("--tamanos", type=int, nargs="+", default=[128, 256, 512])
+    p.add_argument("--cluster", type=int, default=16)
+    p.add_argument("--consultas", type=int, default=20)
+
+    p = sub.add_parser("incremental", help="Replanificación con D* Lite frente a A* completo")
+    p.add_argument("--tamanos", type=int, nargs="+", default=[100, 200, 400])
+    p.add_argument("--pasos", type=int, default=50)
+    p.add_argument("--cambios", type=int, default=5)
+
+    args = parser.parse_args()
+    if args.prueba == "focal":
+        bench_focal(args.tamanos, args.epsilons, args.semilla)
+    elif args.prueba == "bidireccional":
+        bench_bidireccional(args.tamanos, args.semilla)
+    elif args.prueba == "jps":
+        bench_jps(args.tamanos, args.semilla)
+    elif args.prueba == "cola":
+        bench_cola(args.tamanos, args.semilla)
+    elif args.prueba == "referencia":
+        bench_referencia(args.mapas, args.max_pares, args.semilla)
+    elif args.prueba == "nodo":
+        bench_nodo(args.tamanos, args.semilla)
+    elif args.prueba == "alt":
+        bench_alt(args.tamanos, args.landmarks, args.consultas, args.semilla)
+    elif args.prueba == "frente_onda":
+        bench_frente_onda(args.tamanos, args.tam_laberinto, args.consultas, args.semilla)
+    elif args.prueba == "jerarquico":
+        bench_jerarquico(args.tamanos, args.cluster, args.consultas, args.semilla)
+    elif args.prueba == "incremental":
+        bench_incremental(args.tamanos, args.pasos, args.cambios, args.semilla)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,363 @@
+# busqueda_jerarquica.py
+
+import heapq
+import time
+
+from mapa import GRADO_MAXIMO, MOVIMIENTOS
+from a_estrella import buscar_a_estrella, calorias_camino
+from traza import traza_por_defecto
+from perfilado import perfilable
+
+TAMANO_CLUSTER = 16
+
+# Grafos ya construidos de cada mapa, guardados en el propio mapa (así se liberan
+# con él): mapi.derivados[DERIVADO] -> {tam_cluster: GrafoJerarquico}
+DERIVADO = "grafos_jerarquicos"
+
+class GrafoJerarquico:
+    def __init__(self, mapi, tam_cluster=TAMANO_CLUSTER):
+        """
+        Grafo abstracto al estilo HPA* sobre un Mapa.
+
+        La rejilla se divide en clusters de tam_cluster x tam_cluster celdas.
+        En cada borde entre dos clusters vecinos (también los que solo se tocan
+        por una esquina) se eligen unas pocas entradas: una por cada tramo
+        de celdas enfrentadas transitables (dos, en los extremos, si el tramo es
+        largo) y cada paso diagonal que no cubre ningún tramo. Dentro de cada
+        cluster se precalcula con Dijkstra el coste entre sus entradas.
+
+        Una consulta busca primero en este grafo (unos pocos nodos por cluster)
+        y después solo refina, cluster a cluster, el pasillo elegido. El coste
+        no siempre es el óptimo: el camino está obligado a cruzar los bordes por
+        las entradas elegidas.
+
+        El grafo se registra como observador del mapa: cada setCelda marca los
+        bordes y clusters afectados, que se rehacen en la siguiente consulta.
+
+        :param mapi: Objeto Mapa.
+        :param tam_cluster: Lado de cada cluster, en celdas.
+        """
+        self.mapi = mapi
+        self.tam = tam_cluster
+        self.filas_clusters = -(-mapi.getAlto() // tam_cluster)
+        self.cols_clusters = -(-mapi.getAncho() // tam_cluster)
+        self.bordes = {}     # (k1, k2) con k1 < k2 -> lista de aristas (a, b, coste) entre ambos clusters
+        self.entre = {}      # Entrada -> {entrada de otro cluster: coste}
+        self.intra = {}      # Cluster -> {entrada: lista de (entrada, coste) dentro del cluster}
+        self.bordes_pendientes = set()
+        self.clusters_pendientes = set()
+
+        mapi.preparar_adyacencia()
+        for k in range(self.filas_clusters * self.cols_clusters):
+            cf, cc = divmod(k, self.cols_clusters)
+            for df, dc in ((0, 1), (1, -1), (1, 0), (1, 1)):
+                if 0 <= cf + df < self.filas_clusters and 0 <= cc + dc < self.cols_clusters:
+                    self._fijar_borde(k, (cf + df) * self.cols_clusters + cc + dc)
+        for k in range(self.filas_clusters * self.cols_clusters):
+            self._calcular_intra(k)
+        mapi.agregar_observador(self)
+
+    def cluster_de(self, id_celda):
+        """Índice del cluster que contiene la celda."""
+        fila, col = divmod(id_celda, self.mapi.getAncho())
+        return (fila // self.tam) * self.cols_clusters + col // self.tam
+
+    def num_entradas(self):
+        """Número de nodos del grafo abstracto."""
+        return sum(len(entradas) for entradas in self.intra.values())
+
+    def celda_cambiada(self, fila, col):
+        """Aviso de Mapa.setCelda: marca los bordes y clusters que hay que rehacer."""
+        mapi = self.mapi
+        id_celda = fila * mapi.getAncho() + col
+        k = self.cluster_de(id_celda)
+        self.clusters_pendientes.add(k)
+        for df, dc in MOVIMIENTOS:
+            if 0 <= fila + df < mapi.getAlto() and 0 <= col + dc < mapi.getAncho():
+                otro = self.cluster_de(id_celda + df * mapi.getAncho() + dc)
+                if otro != k:
+                    self.bordes_pendientes.add((min(k, otro), max(k, otro)))
+                    self.clusters_pendientes.add(otro)
+
+    def actualizar(self):
+        """Rehace solo los bordes y clusters afectados por los últimos setCelda."""
+        for k1, k2 in self.bordes_pendientes:
+            self._fijar_borde(k1, k2)
+        for k in self.clusters_pendientes:
+            self._calcular_intra(k)
+        self.bordes_pendientes.clear()
+        self.clusters_pendientes.clear()
+
+    def _fijar_borde(self, k1, k2):
+        """Sustituye las aristas entre dos clusters vecinos (k1 < k2)."""
+        for a, b, _ in self.bordes.pop((k1, k2), ()):
+            for x, y in ((a, b), (b, a)):
+                del self.entre[x][y]
+                if not self.entre[x]:
+                    del self.entre[x]
+        aristas = self._aristas_borde(k1, k2)
+        if aristas:
+            self.bordes[(k1, k2)] = aristas
+            for a, b, coste in aristas:
+                self.entre.setdefault(a, {})[b] = coste
+                self.entre.setdefault(b, {})[a] = coste
+
+    def _aristas_borde(self, k1, k2):
+        """Elige las entradas del borde entre dos clusters vecinos (k1 < k2)."""
+        mapi = self.mapi
+        ancho = mapi.getAncho()
+        tam = self.tam
+        cf1, cc1 = divmod(k1, self.cols_clusters)
+        cf2, cc2 = divmod(k2, self.cols_clusters)
+        if cf1 == cf2:
+            # Borde vertical: última columna de k1 frente a la primera de k2
+            filas = range(cf1 * tam, min(cf1 * tam + tam, mapi.getAlto()))
+            col = cc2 * tam
+            return self._aristas_linea([f * ancho + col - 1 for f in filas], [f * ancho + col for f in filas])
+        if cc1 == cc2:
+            # Borde horizontal: última fila de k1 frente a la primera de k2
+            cols = range(cc1 * tam, min(cc1 * tam + tam, ancho))
+            fila = cf2 * tam
+            return self._aristas_linea([(fila - 1) * ancho + c for c in cols], [fila * ancho + c for c in cols])
+        # Clusters que solo se tocan por una esquina: un único paso diagonal posible
+        fila = cf2 * tam
+        if cc2 > cc1:
+            a, b = (fila - 1) * ancho + cc2 * tam - 1, fila * ancho + cc2 * tam
+        else:
+            a, b = (fila - 1) * ancho + cc1 * tam, fila * ancho + cc1 * tam - 1
+        return [(a, b, mapi.costo_movimiento_id(a, b))] if mapi.transitable_id(a) and mapi.transitable_id(b) else []
+
+    def _aristas_linea(self, lado_a, lado_b):
+        """
+        Entradas entre dos líneas de celdas enfrentadas (lado_a[i] toca a lado_b[i]).
+        :return: Lista de aristas (a, b, coste).
+        """
+        transitable = self.mapi.transitable_id
+        coste = self.mapi.costo_movimiento_id
+        libre_a = [transitable(i) for i in lado_a]
+        libre_b = [transitable(i) for i in lado_b]
+        n = len(lado_a)
+        en_tramo = [libre_a[i] and libre_b[i] for i in range(n)]
+
+        aristas = []
+        i = 0
+        while i < n:
+            if not en_tramo[i]:
+                i += 1
+                continue
+            inicio_tramo = i
+            while i < n and en_tramo[i]:
+                i += 1
+            if i - inicio_tramo < 6:
+                elegidas = [(inicio_tramo + i - 1) // 2]
+            else:
+                elegidas = [inicio_tramo, i - 1]
+            aristas.extend((lado_a[j], lado_b[j], coste(lado_a[j], lado_b[j])) for j in elegidas)
+
+        # Pasos diagonales que no empiezan y acaban en un tramo ya representado
+        for i in range(n):
+            if libre_a[i]:
+                for j in (i - 1, i + 1):
+                    if 0 <= j < n and libre_b[j] and not (en_tramo[i] and en_tramo[j]):
+                        aristas.append((lado_a[i], lado_b[j], coste(lado_a[i], lado_b[j])))
+        return aristas
+
+    def _entradas_de(self, k):
+        """Entradas del cluster k, sacadas de los bordes con sus ocho vecinos."""
+        cf, cc = divmod(k, self.cols_clusters)
+        entradas = set()
+        for df in (-1, 0, 1):
+            for dc in (-1, 0, 1):
+                if (df or dc) and 0 <= cf + df < self.filas_clusters and 0 <= cc + dc < self.cols_clusters:
+                    otro = (cf + df) * self.cols_clusters + cc + dc
+                    for a, b, _ in self.bordes.get((min(k, otro), max(k, otro)), ()):
+                        entradas.add(a if otro > k else b)
+        return entradas
+
+    def _calcular_intra(self, k):
+        """Costes entre cada par de entradas del cluster k, sin salir de él."""
+        entradas = self._entradas_de(k)
+        intra = {}
+        for a in entradas:
+            distancias, _ = self._dijkstra_cluster(a, k, entradas)
+            intra[a] = [(b, distancias[b]) for b in entradas if b != a and b in distancias]
+        self.intra[k] = intra
+
+    def _dijkstra_cluster(self, origen, k, destinos):
+        """
+        Dijkstra desde 'origen' sin salir del cluster k. Termina en cuanto ha
+        fijado todos los 'destinos' alcanzables.
+        :return: Tupla (distancias, padres), diccionarios indexados por id.
+        """
+        adyacencia = self.mapi.adyacencia
+        grado, vecinos, costes = adyacencia.grado, adyacencia.vecinos, adyacencia.costes
+        ancho = self.mapi.getAncho()
+        cf, cc = divmod(k, self.cols_clusters)
+        fila_min, col_min = cf * self.tam, cc * self.tam
+        fila_max, col_max = fila_min + self.tam, col_min + self.tam
+
+        distancias = {origen: 0}
+        padres = {origen: None}
+        cerrados = set()
+        pendientes = len(destinos)
+        frontera = [(0, origen)]
+        while frontera and pendientes:
+            d, u = heapq.heappop(frontera)
+            if u in cerrados:
+                continue
+            cerrados.add(u)
+            if u in destinos:
+                pendientes -= 1
+            base = u * GRADO_MAXIMO
+            for j in range(base, base + grado[u]):
+                v = vecinos[j]
+                fila, col = divmod(v, ancho)
+                if not (fila_min <= fila < fila_max and col_min <= col < col_max):
+                    continue
+                nueva = d + costes[j]
+                if nueva < distancias.get(v, float("inf")):
+                    distancias[v] = nueva
+                    padres[v] = u
+                    heapq.heappush(frontera, (nueva, v))
+        return {u: distancias[u] for u in cerrados}, padres
+
+    @perfilable("jerarquico")
+    def buscar(self, inicio, meta, tipo_heuristica, traza=None, estadisticas=None):
+        """
+        Busca un camino de 'inicio' a 'meta' en el grafo abstracto y lo refina.
+        :param estadisticas: EstadisticasBusqueda opcional que se rellena al terminar
+                             con los contadores del A* abstracto. La preparación
+                             incluye reconstruir los clusters modificados y el
+                             refinado es la fase de reconstrucción.
+        :return: Tupla (coste, calorías, lista de casillas del camino).
+        """
+        t0 = time.perf_counter()
+        traza = traza_por_defecto(traza)
+        self.actualizar()
+        mapi = self.mapi
+        s = mapi.id_casilla(inicio)
+        t = mapi.id_casilla(meta)
+        if not mapi.transitable_id(s) or not mapi.transitable_id(t):
+            traza.mensaje("EL CONEJO NO PUEDE ALCANZAR LA ZANAHORIA")
+            traza.emitir_resumen("jerarquico", -1, -1, 0, [])
+            if estadisticas is not None:
+                estadisticas.fijar("jerarquico", 0, 0, 0, 0, 0, 0)
+            return -1, -1, []
+
+        # Conectar temporalmente el inicio y la meta con las entradas de sus clusters
+        ks, kt = self.cluster_de(s), self.cluster_de(t)
+        destinos_s = set(self.intra[ks]) | ({t} if ks == kt else set())
+        desde_s, _ = self._dijkstra_cluster(s, ks, destinos_s)
+        hacia_t, _ = self._dijkstra_cluster(t, kt, set(self.intra[kt]))
+
+        def vecinos_abstractos(u):
+            if u == s:
+                yield from ((v, d) for v, d in desde_s.items() if v in destinos_s and v != s)
+            else:
+                yield from self.intra[self.cluster_de(u)].get(u, ())
+            yield from self.entre.get(u, {}).items()
+            if u in hacia_t and u != t:
+                yield t, hacia_t[u]
+
+        # A* sobre el grafo abstracto
+        g = {s: 0}
+        padres = {s: None}
+        cerrados = set()
+        frontera = [(tipo_heuristica(inicio, meta), 0, s)]
+        generados = extracciones = duplicados = 0
+        inserciones = frontera_max = 1
+        if estadisticas is not None:
+            t0 = estadisticas.marcar("preparacion", t0)
+        while frontera:
+            _, g_u, u = heapq.heappop(frontera)
+            extracciones += 1
+            if u in cerrados:
+                duplicados += 1
+                continue
+            cerrados.add(u)
+            if u == t:
+                break
+            for v, coste in vecinos_abstractos(u):
+                generados += 1
+                nuevo = g_u + coste
+                if v not in cerrados and nuevo < g.get(v, float("inf")):
+                    g[v] = nuevo
+                    padres[v] = u
+                    heapq.heappush(frontera, (nuevo + tipo_heuristica(mapi.casilla_de_id(v), meta), nuevo, v))
+                    inserciones += 1
+                else:
+                    duplicados += 1
+            if len(frontera) > frontera_max:
+                frontera_max = len(frontera)
+        if estadisticas is not None:
+            t0 = estadisticas.marcar("busqueda", t0)
+            estadisticas.fijar("jerarquico", len(cerrados), generados, inserciones, extracciones, duplicados,
+                               frontera_max)
+        if t not in cerrados:
+            traza.mensaje("EL CONEJO NO PUEDE ALCANZAR LA ZANAHORIA")
+            traza.emitir_resumen("jerarquico", -1, -1, len(cerrados), [])
+            return -1, -1, []
+
+        abstracto = []
+        u = t
+        while u is not None:
+            abstracto.append(u)
+            u = padres[u]
+        abstracto.reverse()
+
+        camino = [mapi.casilla_de_id(i) for i in self._refinar(abstracto)]
+        cal = calorias_camino(camino, mapi)
+        traza.mensaje(f"LAS CALORIAS SON {cal}")
+        traza.emitir_resumen("jerarquico", g[t], cal, len(cerrados), camino)
+        if estadisticas is not None:
+            estadisticas.marcar("reconstruccion", t0)
+        return g[t], cal, camino
+
+    def _refinar(self, abstracto):
+        """Expande el camino abstracto en celdas, buscando solo dentro de cada cluster del pasillo."""
+        ids = [abstracto[0]]
+        for u, v in zip(abstracto, abstracto[1:]):
+            k = self.cluster_de(u)
+            if k != self.cluster_de(v):
+                ids.append(v)  # Arista entre clusters: son celdas vecinas
+                continue
+            _, padres = self._dijkstra_cluster(u, k, {v})
+            tramo = []
+            while v != u:
+                tramo.append(v)
+                v = padres[v]
+            ids.extend(reversed(tramo))
+        return ids
+
+def grafo_jerarquico(mapi, tam_cluster=TAMANO_CLUSTER):
+    """Devuelve el grafo jerárquico del mapa, construyéndolo solo la primera vez."""
+    grafos = mapi.derivados.setdefault(DERIVADO, {})
+    grafo = grafos.get(tam_cluster)
+    if grafo is None:
+        grafo = grafos[tam_cluster] = GrafoJerarquico(mapi, tam_cluster)
+    return grafo
+
+def a_estrella_jerarquico(camino, inicio, meta, obtener_vecinos, costo_movimiento, tipo_heuristica, mapi, traza=None,
+                          estadisticas=None):
+    """
+    Búsqueda jerárquica con la misma firma que a_estrella: marca el camino con
+    '*' en la matriz 'camino' y devuelve (coste, calorías).
+    """
+    coste, cal, camino_reconstruido = buscar_a_estrella_jerarquico(inicio, meta, obtener_vecinos, costo_movimiento,
+                                                                   tipo_heuristica, mapi, traza, estadisticas)
+    for casilla in camino_reconstruido:
+        camino[casilla.getFila()][casilla.getCol()] = '*'
+    return coste, cal
+
+def buscar_a_estrella_jerarquico(inicio, meta, obtener_vecinos, costo_movimiento, tipo_heuristica, mapi, traza=None,
+                                 estadisticas=None):
+    """
+    Búsqueda jerárquica sobre el grafo del mapa (ver GrafoJerarquico). Con
+    funciones de vecinos o de coste distintas de las del mapa se delega en
+    buscar_a_estrella.
+    :return: Tupla (coste, calorías, lista de casillas del camino).
+    """
+    if obtener_vecinos != mapi.getVecinos or costo_movimiento != mapi.costo_movimiento:
+        return buscar_a_estrella(inicio, meta, obtener_vecinos, costo_movimiento, tipo_heuristica, mapi, traza,
+                                 estadisticas)
+    return grafo_jerarquico(mapi).buscar(inicio, meta, tipo_heuristica, traza, estadisticas)
@@ -0,0 +1,103 @@
+# busqueda_segundo_plano.py
+
+import threading
+
+from traza import Traza, TRAZA_ITERACION, TRAZA_RESUMEN
+
+class BusquedaCancelada(Exception):
+    """Se lanza dentro de la búsqueda cuando se ha pedido cancelarla."""
+
+class TrazaExploracion(Traza):
+    def __init__(self, cancelar, reenviar=None):
+        """
+        Traza que acumula las casillas que la búsqueda va cerrando y añadiendo
+        a la frontera, para que otro hilo las recoja con tomar(). En cada
+        iteración comprueba 'cancelar' y, si está activado, lanza
+        BusquedaCancelada, así que la búsqueda se detiene en la siguiente
+        expansión.
+        :param cancelar: threading.Event que indica que hay que cancelar.
+        :param reenviar: Traza a la que se reenvían también los eventos (p. ej. la de consola).
+        """
+        super().__init__(TRAZA_ITERACION, reenviar.listas_completas if reenviar is not None else False)
+        self.cancelar = cancelar
+        self.reenviar = reenviar
+        self.cerrojo = threading.Lock()
+        self.cerrados = []
+        self.abiertos = []
+
+    def emitir(self, evento):
+        if evento["tipo"] == "iteracion":
+            if self.cancelar.is_set():
+                raise BusquedaCancelada()
+            with self.cerrojo:
+                self.abiertos.extend(tuple(c) for c in evento["vecinos"])
+                self.cerrados.append(tuple(evento["actual"]))
+            nivel = TRAZA_ITERACION
+        else:
+            nivel = TRAZA_RESUMEN
+        if self.reenviar is not None and self.reenviar.activa(nivel):
+            self.reenviar.emitir(evento)
+
+    def tomar(self):
+        """
+        Devuelve las casillas exploradas desde la llamada anterior.
+        :return: Tupla (cerradas, añadidas a la frontera), listas de (fila, col).
+        """
+        with self.cerrojo:
+            cerrados, self.cerrados = self.cerrados, []
+            abiertos, self.abiertos = self.abiertos, []
+        return cerrados, abiertos
+
+class BusquedaSegundoPlano:
+    def __init__(self, buscar, traza=None):
+        """
+        Ejecuta una búsqueda en un hilo aparte para no bloquear el bucle de
+        eventos. Se usa un hilo y no un proceso porque la búsqueda rellena la
+        matriz del camino y la caché del llamador; el GIL se cede con
+        frecuencia, así que la interfaz sigue respondiendo.
+
+        :param buscar: Función que recibe el argumento con nombre 'traza' y
+                       hace la búsqueda (p. ej. functools.partial de a_estrella).
+        :param traza: Traza a la que se reenvían los eventos, además de
+                      guardarse la exploración para la interfaz.
+        """
+        self.buscar = buscar
+        self.cancelacion = threading.Event()
+        self.traza = TrazaExploracion(self.cancelacion, traza)
+        self.resultado_busqueda = None
+        self.error = None
+        self.cancelada = False
+        self.hilo = threading.Thread(target=self._ejecutar, daemon=True)
+
+    def _ejecutar(self):
+        try:
+            self.resultado_busqueda = self.buscar(traza=self.traza)
+        except BusquedaCancelada:
+            self.cancelada = True
+        except Exception as e:
+            self.error = e
+
+    def iniciar(self):
+        self.hilo.start()
+        return self
+
+    def cancelar(self):
+        """Pide que la búsqueda se detenga; termina en la siguiente expansión."""
+        self.cancelacion.set()
+
+    def terminada(self):
+        return not self.hilo.is_alive()
+
+    def tomar_exploracion(self):
+        """Casillas cerradas y añadidas a la frontera desde la llamada anterior (ver TrazaExploracion.tomar)."""
+        return self.traza.tomar()
+
+    def resultado(self):
+        """
+        Resultado de la búsqueda una vez terminada: lo que devuelva 'buscar',
+        o None si se ha cancelado. Si la búsqueda falló, relanza su excepción.
+        """
+        self.hilo.join()
+        if self.error is not None:
+            raise self.error
+        return self.resultado_busqueda
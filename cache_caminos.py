@@ -0,0 +1,55 @@
+# cache_caminos.py
+
+from collections import OrderedDict
+
+class CacheCaminos:
+    def __init__(self, capacidad=1024):
+        """
+        Caché LRU de resultados de búsqueda.
+
+        Las claves incluyen el identificador y la versión del mapa, que
+        Mapa.setCelda incrementa en cada cambio, así que nunca se sirve un
+        resultado calculado sobre un mapa distinto del actual. Las entradas
+        antiguas no se vuelven a pedir y acaban saliendo por la cola LRU.
+
+        :param capacidad: Número máximo de resultados guardados.
+        """
+        self.capacidad = capacidad
+        self.entradas = OrderedDict()
+        self.aciertos = 0
+        self.fallos = 0
+
+    def __len__(self):
+        return len(self.entradas)
+
+    def clave(self, mapi, algoritmo, origen, destino, heuristica, epsilon=None):
+        """Construye la clave de una consulta."""
+        return (mapi.uid, mapi.version, algoritmo,
+                (origen.getFila(), origen.getCol()), (destino.getFila(), destino.getCol()),
+                heuristica, epsilon)
+
+    def obtener(self, clave):
+        """
+        Devuelve el resultado guardado para la clave, o None si no está.
+        :return: Tupla (coste, calorías, camino) o None.
+        """
+        resultado = self.entradas.get(clave)
+        if resultado is None:
+            self.fallos += 1
+            return None
+        self.entradas.move_to_end(clave)
+        self.aciertos += 1
+        return resultado
+
+    def guardar(self, clave, coste, cal, camino):
+        """Guarda un resultado, expulsando el menos usado si la caché está llena."""
+        self.entradas[clave] = (coste, cal, tuple(camino))
+        self.entradas.move_to_end(clave)
+        while len(self.entradas) > self.capacidad:
+            self.entradas.popitem(last=False)
+
+    def vaciar(self):
+        self.entradas.clear()
+
+    def __str__(self):
+        return f"CacheCaminos(Entradas={len(self.entradas)}/{self.capacidad}, Aciertos={self.aciertos}, Fallos={self.fallos})"
@@ -0,0 +1,127 @@
+# campo_distancias.py
+
+import heapq
+from array import array
+
+from mapa import GRADO_MAXIMO
+from a_estrella import calorias_camino
+from frente_onda import distancias_frente_onda
+
+INFINITO = float("inf")
+
+# Campos ya calculados de cada mapa, guardados en el propio mapa (así se liberan
+# con él): mapi.derivados[DERIVADO] -> {id_meta: CampoDistancias}
+DERIVADO = "campos_distancias"
+
+class CampoDistancias:
+    def __init__(self, mapi, meta, vectorizado=False):
+        """
+        Distancia desde cada celda del mapa hasta 'meta', calculada con un único
+        Dijkstra inverso que parte de la meta y usa los mismos costes 1 / 1.5 que
+        Mapa.costo_movimiento. Las distancias se guardan en un array('d') indexado
+        por id de celda (INFINITO si la celda no puede llegar a la meta).
+
+        Con el campo calculado, el coste desde cualquier origen es una consulta
+        directa y el camino se obtiene bajando por el gradiente en O(longitud).
+
+        :param mapi: Objeto Mapa.
+        :param meta: Casilla de destino.
+        :param vectorizado: Calcular las distancias con distancias_frente_onda
+                            (necesita NumPy) en lugar de con Dijkstra.
+        """
+        self.mapi = mapi
+        self.meta = meta
+        self.id_meta = mapi.id_casilla(meta)
+        self.version = mapi.version
+        if vectorizado:
+            self.distancias = array('d', distancias_frente_onda(mapi, [self.id_meta])[0].tobytes())
+        else:
+            self.distancias = array('d', [INFINITO]) * (mapi.getAlto() * mapi.getAncho())
+            self._calcular()
+
+    def _calcular(self):
+        # Un movimiento v -> u solo exige que u sea transitable, y la tabla de u
+        # contiene justo los vecinos transitables v con el coste del paso, que es
+        # simétrico. Por eso basta con recorrer la tabla desde la meta.
+        if not self.mapi.transitable_id(self.id_meta):
+            return
+        adyacencia = self.mapi.preparar_adyacencia()
+        grado, vecinos, costes = adyacencia.grado, adyacencia.vecinos, adyacencia.costes
+        distancias = self.distancias
+        distancias[self.id_meta] = 0
+        frontera = [(0, self.id_meta)]
+        while frontera:
+            d, u = heapq.heappop(frontera)
+            if d > distancias[u]:
+                continue
+            base = u * GRADO_MAXIMO
+            for k in range(base, base + grado[u]):
+                v = vecinos[k]
+                nueva = d + costes[k]
+                if nueva < distancias[v]:
+                    distancias[v] = nueva
+                    heapq.heappush(frontera, (nueva, v))
+
+    def vigente(self):
+        """Indica si el mapa no ha cambiado desde que se calculó el campo."""
+        return self.mapi.version == self.version
+
+    def _comprobar_vigente(self):
+        if not self.vigente():
+            raise ValueError("El mapa ha cambiado: hay que recalcular el campo de distancias")
+
+    def coste(self, origen):
+        """Coste mínimo desde 'origen' hasta la meta, o -1 si no hay camino."""
+        self._comprobar_vigente()
+        d = self.distancias[self.mapi.id_casilla(origen)]
+        return -1 if d == INFINITO else d
+
+    def camino(self, origen):
+        """
+        Camino óptimo desde 'origen' hasta la meta siguiendo el gradiente.
+        :return: Tupla (coste, calorías, lista de casillas); (-1, -1, []) si no hay camino.
+        """
+        self._comprobar_vigente()
+        mapi = self.mapi
+        adyacencia = mapi.preparar_adyacencia()
+        distancias = self.distancias
+        actual = mapi.id_casilla(origen)
+        if distancias[actual] == INFINITO:
+            return -1, -1, []
+
+        ids = [actual]
+        while actual != self.id_meta:
+            # El siguiente paso es un vecino v con d(v) + coste(actual, v) == d(actual)
+            base = actual * GRADO_MAXIMO
+            for k in range(base, base + adyacencia.grado[actual]):
+                v = adyacencia.vecinos[k]
+                if distancias[v] + adyacencia.costes[k] <= distancias[actual] + 1e-9:
+                    actual = v
+                    break
+            ids.append(actual)
+
+        casillas = [mapi.casilla_de_id(i) for i in ids]
+        return distancias[ids[0]], calorias_camino(casillas, mapi), casillas
+
+    def heuristica(self, casilla, meta):
+        """
+        Heurística perfecta para buscar hacia la meta del campo; tiene la firma
+        de las de heuristicas.py y puede pasarse como tipo_heuristica.
+        """
+        if meta.getFila() != self.meta.getFila() or meta.getCol() != self.meta.getCol():
+            raise ValueError("El campo de distancias se calculó para otra meta")
+        self._comprobar_vigente()
+        return self.distancias[self.mapi.id_casilla(casilla)]
+
+def campo_distancias(mapi, meta, vectorizado=False):
+    """
+    Devuelve el campo de distancias hacia 'meta', reutilizando el ya calculado
+    mientras el mapa no cambie y recalculándolo si ha cambiado.
+    :param vectorizado: Ver CampoDistancias.
+    """
+    campos = mapi.derivados.setdefault(DERIVADO, {})
+    id_meta = mapi.id_casilla(meta)
+    campo = campos.get(id_meta)
+    if campo is None or not campo.vigente():
+        campo = campos[id_meta] = CampoDistancias(mapi, meta, vectorizado)
+    return campo
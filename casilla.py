@@ -1,4 +1,6 @@
 class Casilla:
+    __slots__ = ("fila", "columna")
+
     def __init__(self, fila, columna):
         self.fila = fila
         self.columna = columna
@@ -9,5 +11,13 @@ class Casilla:
     def getCol(self):
         return self.columna
 
+    def __eq__(self, otra):
+        if not isinstance(otra, Casilla):
+            return NotImplemented
+        return self.fila == otra.fila and self.columna == otra.columna
+
+    def __hash__(self):
+        return hash((self.fila, self.columna))
+
     def __str__(self):
         return f"({self.fila}, {self.columna})"
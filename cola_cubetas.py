@@ -0,0 +1,67 @@
+# cola_cubetas.py
+
+from heapq import heappush, heappop
+from itertools import count
+
+RESOLUCION = 0.5  # Los pasos cuestan 1 o 1.5 y las heurísticas de rejilla dan múltiplos de 0.5
+
+class ColaCubetas:
+    def __init__(self, resolucion=RESOLUCION):
+        """
+        Cola de prioridad por cubetas para la frontera de A*.
+
+        Los nodos se reparten en cubetas según f cuantizado, f // resolucion,
+        y se extrae siempre de la primera cubeta no vacía. Cada cubeta es un
+        montículo pequeño de tuplas (f, -g, orden de inserción, nodo), así que
+        dentro de una cubeta sale antes el nodo de menor f exacto y, con la
+        misma f, el de mayor g (el más cercano a la meta) y después el más
+        antiguo; las comparaciones son de tuplas y nunca llaman a Nodo.__lt__.
+
+        El índice de la primera cubeta solo avanza mientras f no decrece
+        (heurística consistente); si se inserta un nodo con f menor, retrocede.
+        Como todos los nodos de cubetas anteriores tienen f menor y dentro de
+        la cubeta se ordena por f, se extrae en el mismo orden que un
+        montículo por f y el coste es el óptimo con cualquier f (también con
+        euclidea o terrenos con multiplicador). Con f múltiplos de la
+        resolución (costes uniformes con manhattan, chebyshev, octil o
+        trivial) cada cubeta tiene una sola f y el montículo solo desempata.
+
+        :param resolucion: Ancho de cada cubeta en unidades de f.
+        """
+        self.escala = 1 / resolucion
+        self.cubetas = []      # índice -> montículo de (f, -g, seq, nodo)
+        self.minimo = 0        # Ninguna cubeta anterior tiene entradas
+        self.tam = 0
+        self.orden = count()   # Desempate estable por orden de inserción
+
+    def __len__(self):
+        return self.tam
+
+    def __iter__(self):
+        """Recorre los nodos de la cola, sin orden."""
+        for cubeta in self.cubetas:
+            for entrada in cubeta:
+                yield entrada[3]
+
+    def insertar(self, nodo):
+        """Añade un nodo (con f y g ya calculados)."""
+        indice = int(nodo.f * self.escala + 1e-9)  # Tolerancia para sumas de 1.5 con error de redondeo
+        try:
+            cubeta = self.cubetas[indice]
+        except IndexError:
+            self.cubetas.extend([] for _ in range(indice + 1 - len(self.cubetas)))
+            cubeta = self.cubetas[indice]
+        if indice < self.minimo:
+            self.minimo = indice
+        heappush(cubeta, (nodo.f, -nodo.g, next(self.orden), nodo))
+        self.tam += 1
+
+    def extraer(self):
+        """Extrae el nodo de menor f y, a igualdad, mayor g. La cola no debe estar vacía."""
+        cubetas = self.cubetas
+        indice = self.minimo
+        while not cubetas[indice]:
+            indice += 1
+        self.minimo = indice
+        self.tam -= 1
+        return heappop(cubetas[indice])[3]
@@ -0,0 +1,115 @@
+# consultas_lote.py
+
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from casilla import Casilla
+from a_estrella import buscar_a_estrella
+from a_estrella_subepsilon import buscar_a_estrella_subepsilon
+from traza import SIN_TRAZA
+
+class ResultadoCamino:
+    def __init__(self, coste, cal, camino):
+        """
+        Resultado de una consulta de camino.
+        :param coste: Coste del camino, o -1 si no existe.
+        :param cal: Calorías del camino.
+        :param camino: Lista de casillas desde el origen hasta el destino.
+        """
+        self.coste = coste
+        self.cal = cal
+        self.camino = camino
+
+    def getCoste(self):
+        return self.coste
+
+    def getCalorias(self):
+        return self.cal
+
+    def getCamino(self):
+        return self.camino
+
+    def __eq__(self, otro):
+        return (isinstance(otro, ResultadoCamino) and self.coste == otro.coste
+                and self.cal == otro.cal and self.camino == otro.camino)
+
+    def __str__(self):
+        return f"ResultadoCamino(Coste={self.coste}, Cal={self.cal}, Pasos={len(self.camino)})"
+
+def resolver_consulta(mapi, consulta):
+    """
+    Resuelve una consulta sobre un mapa sin trazas.
+
+    :param mapi: Objeto Mapa.
+    :param consulta: Tupla (origen, destino, heuristica, epsilon). Origen y destino
+                     son casillas o pares (fila, col); con epsilon None se usa
+                     a_estrella y, si no, a_estrella_subepsilon.
+    :return: ResultadoCamino.
+    """
+    origen, destino, heuristica, epsilon = consulta
+    origen = _como_casilla(origen)
+    destino = _como_casilla(destino)
+    if epsilon is None:
+        coste, cal, camino = buscar_a_estrella(origen, destino, mapi.getVecinos, mapi.costo_movimiento,
+                                               heuristica, mapi, SIN_TRAZA)
+    else:
+        coste, cal, camino = buscar_a_estrella_subepsilon(origen, destino, mapi.getVecinos, mapi.costo_movimiento,
+                                                          heuristica, epsilon, mapi, SIN_TRAZA)
+    return ResultadoCamino(coste, cal, camino)
+
+def resolver_lote(mapi, consultas, procesos=None, en_orden=True, tam_bloque=16):
+    """
+    Resuelve muchas consultas sobre el mismo mapa repartiéndolas en procesos.
+
+    El mapa se envía una sola vez a cada proceso del pool (en su inicializador);
+    a cada tarea solo viajan las consultas de un bloque y sus resultados.
+    Las heurísticas deben poder serializarse (funciones definidas a nivel de módulo).
+
+    :param mapi: Objeto Mapa.
+    :param consultas: Lista de tuplas (origen, destino, heuristica, epsilon).
+    :param procesos: Número de procesos; por defecto os.cpu_count(). Con 1 se
+                     resuelve todo en el proceso actual.
+    :param en_orden: Si es True devuelve la lista de resultados en el orden de
+                     las consultas. Si es False devuelve un generador de pares
+                     (indice, resultado) según se van terminando.
+    :param tam_bloque: Consultas por tarea enviada al pool.
+    """
+    consultas = list(consultas)
+    if procesos is None:
+        procesos = os.cpu_count() or 1
+
+    if procesos <= 1:
+        pares = ((i, resolver_consulta(mapi, c)) for i, c in enumerate(consultas))
+        return [r for _, r in pares] if en_orden else pares
+
+    numeradas = list(enumerate(consultas))
+    bloques = [numeradas[i:i + tam_bloque] for i in range(0, len(numeradas), tam_bloque)]
+    if en_orden:
+        resultados = [None] * len(consultas)
+        for indice, resultado in _resolver_en_pool(mapi, bloques, procesos):
+            resultados[indice] = resultado
+        return resultados
+    return _resolver_en_pool(mapi, bloques, procesos)
+
+def _resolver_en_pool(mapi, bloques, procesos):
+    """Generador de (indice, resultado) a medida que los procesos terminan sus bloques."""
+    with ProcessPoolExecutor(max_workers=procesos, initializer=_iniciar_proceso, initargs=(mapi,)) as pool:
+        futuros = [pool.submit(_resolver_bloque, bloque) for bloque in bloques]
+        for futuro in as_completed(futuros):
+            yield from futuro.result()
+
+# Mapa de cada proceso del pool, fijado una sola vez por _iniciar_proceso
+_mapa_proceso = None
+
+def _iniciar_proceso(mapi):
+    global _mapa_proceso
+    _mapa_proceso = mapi
+    _mapa_proceso.preparar_adyacencia()
+
+def _resolver_bloque(bloque):
+    return [(indice, resolver_consulta(_mapa_proceso, consulta)) for indice, consulta in bloque]
+
+def _como_casilla(posicion):
+    if isinstance(posicion, Casilla):
+        return posicion
+    return Casilla(posicion[0], posicion[1])
@@ -0,0 +1,35 @@
+# convertir_mapa.py
+
+import argparse
+import time
+
+from mapa import Mapa
+from terreno import TablaTerrenos
+
+def convertir(origen, destino, terrenos=None):
+    """
+    Convierte un mapa de texto al formato binario (ver formato_binario).
+    :param origen: Mapa de texto.
+    :param destino: Fichero binario de salida.
+    :param terrenos: TablaTerrenos con los símbolos del texto; por defecto TERRENOS_POR_DEFECTO.
+    :return: El Mapa leído.
+    """
+    mapi = Mapa(origen, terrenos=terrenos)
+    mapi.guardar_binario(destino)
+    return mapi
+
+def main():
+    parser = argparse.ArgumentParser(description="Convierte mapas de texto al formato binario")
+    parser.add_argument("origen", nargs="+", help="Mapas de texto")
+    parser.add_argument("--terrenos", help="Tabla de terrenos en JSON (por defecto la de terreno.py)")
+    args = parser.parse_args()
+
+    terrenos = TablaTerrenos.desde_archivo(args.terrenos) if args.terrenos else None
+    for origen in args.origen:
+        destino = origen.rsplit(".", 1)[0] + ".mapa"
+        t0 = time.perf_counter()
+        mapi = convertir(origen, destino, terrenos)
+        print(f"{origen} -> {destino}: {mapi.getAlto()}x{mapi.getAncho()} en {time.perf_counter() - t0:.3f} s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,198 @@
+# d_estrella_lite.py
+
+import heapq
+import time
+from array import array
+
+from mapa import GRADO_MAXIMO, MOVIMIENTOS
+from a_estrella import calorias_camino
+from traza import traza_por_defecto
+from perfilado import perfilable
+
+INFINITO = float("inf")
+
+class PlanificadorDLite:
+    def __init__(self, mapi, inicio, meta):
+        """
+        Planificador incremental D* Lite (Koenig y Likhachev, 2002).
+
+        Busca hacia atrás, desde la meta, y conserva entre llamadas los valores
+        g y rhs de cada celda y la cola de prioridad. Cuando cambian celdas del
+        mapa (se registra como observador de setCelda) o el agente avanza, la
+        siguiente llamada a planificar solo vuelve a expandir las celdas cuyo
+        coste hasta la meta ha cambiado, en lugar de repetir toda la búsqueda.
+
+        Usa los costes de Mapa.costo_movimiento (1 recto, 1.5 diagonal, por el
+        multiplicador del terreno) y la distancia octil como heurística, que es
+        consistente mientras ningún multiplicador sea menor que 1.
+
+        :param mapi: Objeto Mapa.
+        :param inicio: Casilla de partida del agente.
+        :param meta: Casilla de destino.
+        """
+        self.mapi = mapi
+        self.adyacencia = mapi.preparar_adyacencia()
+        self.inicio = mapi.id_casilla(inicio)
+        self.meta = mapi.id_casilla(meta)
+        self.ultimo = self.inicio  # Inicio con el que se calcularon las claves de la cola
+        self.km = 0                # Corrección acumulada de las claves al mover el inicio
+        num_celdas = mapi.getAlto() * mapi.getAncho()
+        self.g = array('d', [INFINITO]) * num_celdas
+        self.rhs = array('d', [INFINITO]) * num_celdas
+        self.cola = []             # Entradas (clave1, clave2, id), con borrado perezoso
+        self.en_cola = {}          # id -> clave vigente en la cola
+        self.cambios = set()       # Celdas cambiadas desde la última planificación
+        self.expandidos = 0        # Celdas expandidas en la última planificación
+        self.inserciones = 0       # Inserciones en la cola desde la creación
+        self.obsoletas = 0         # Entradas obsoletas descartadas desde la creación
+
+        self.rhs[self.meta] = 0
+        self._insertar(self.meta)
+        mapi.agregar_observador(self)
+
+    def celda_cambiada(self, fila, col):
+        """Aviso de Mapa.setCelda: la celda se tendrá en cuenta en la siguiente planificación."""
+        self.cambios.add(fila * self.mapi.getAncho() + col)
+
+    def mover_inicio(self, casilla):
+        """Cambia la casilla de partida (p. ej. porque el agente ha avanzado)."""
+        self.inicio = self.mapi.id_casilla(casilla)
+
+    def _h(self, a, b):
+        """Distancia octil entre dos celdas."""
+        ancho = self.mapi.getAncho()
+        df = abs(a // ancho - b // ancho)
+        dc = abs(a % ancho - b % ancho)
+        return 1.5 * min(df, dc) + abs(df - dc)
+
+    def _clave(self, u):
+        k2 = min(self.g[u], self.rhs[u])
+        return k2 + self._h(self.inicio, u) + self.km, k2
+
+    def _insertar(self, u):
+        clave = self._clave(u)
+        self.en_cola[u] = clave
+        heapq.heappush(self.cola, (clave[0], clave[1], u))
+        self.inserciones += 1
+
+    def _actualizar_vertice(self, u):
+        """Recalcula rhs(u) y coloca u en la cola solo si queda inconsistente."""
+        if u != self.meta:
+            if self.mapi.transitable_id(u):
+                # La fila de u en la tabla contiene sus vecinos transitables con el coste del paso
+                g = self.g
+                ady = self.adyacencia
+                base = u * GRADO_MAXIMO
+                self.rhs[u] = min((ady.costes[k] + g[ady.vecinos[k]] for k in range(base, base + ady.grado[u])),
+                                  default=INFINITO)
+            else:
+                self.rhs[u] = INFINITO
+        self.en_cola.pop(u, None)
+        if self.g[u] != self.rhs[u]:
+            self._insertar(u)
+
+    def _tope(self):
+        """Clave mínima vigente de la cola, descartando entradas obsoletas."""
+        cola = self.cola
+        while cola:
+            k1, k2, u = cola[0]
+            if self.en_cola.get(u) == (k1, k2):
+                return k1, k2
+            heapq.heappop(cola)
+            self.obsoletas += 1
+        return INFINITO, INFINITO
+
+    def _calcular_camino_minimo(self):
+        """
+        :return: Tupla (expandidos, generados, extracciones, reinsertados, tamaño máximo de la cola).
+        """
+        g, rhs, ady = self.g, self.rhs, self.adyacencia
+        inicio = self.inicio
+        expandidos = generados = extracciones = reinsertados = 0
+        cola_max = len(self.cola)
+        while self._tope() < self._clave(inicio) or rhs[inicio] != g[inicio]:
+            k1, k2, u = heapq.heappop(self.cola)
+            extracciones += 1
+            del self.en_cola[u]
+            clave_nueva = self._clave(u)
+            if (k1, k2) < clave_nueva:
+                self._insertar(u)
+                reinsertados += 1
+                continue
+            expandidos += 1
+            base = u * GRADO_MAXIMO
+            if g[u] > rhs[u]:
+                g[u] = rhs[u]
+            else:
+                g[u] = INFINITO
+                self._actualizar_vertice(u)
+            # Los predecesores de u son sus vecinos transitables (la misma fila de la tabla)
+            if self.mapi.transitable_id(u):
+                generados += ady.grado[u]
+                for k in range(base, base + ady.grado[u]):
+                    self._actualizar_vertice(ady.vecinos[k])
+            if len(self.cola) > cola_max:
+                cola_max = len(self.cola)
+        return expandidos, generados, extracciones, reinsertados, cola_max
+
+    @perfilable("d_estrella_lite")
+    def planificar(self, traza=None, estadisticas=None):
+        """
+        Repara la solución con los cambios pendientes y devuelve el camino
+        óptimo actual desde el inicio hasta la meta.
+        :param estadisticas: EstadisticasBusqueda opcional que se rellena con los
+                             contadores de esta planificación (los duplicados son
+                             las entradas obsoletas o con clave desfasada). La
+                             preparación es la reparación de las celdas cambiadas.
+        :return: Tupla (coste, calorías, lista de casillas del camino).
+        """
+        t0 = time.perf_counter()
+        inserciones, obsoletas = self.inserciones, self.obsoletas
+        traza = traza_por_defecto(traza)
+        mapi = self.mapi
+        if self.cambios or self.inicio != self.ultimo:
+            self.km += self._h(self.ultimo, self.inicio)
+            self.ultimo = self.inicio
+            ancho, alto = mapi.getAncho(), mapi.getAlto()
+            for u in self.cambios:
+                # Cambian todas las aristas que tocan la celda: ella y sus vecinas
+                self._actualizar_vertice(u)
+                fila, col = divmod(u, ancho)
+                for df, dc in MOVIMIENTOS:
+                    if 0 <= fila + df < alto and 0 <= col + dc < ancho:
+                        self._actualizar_vertice(u + df * ancho + dc)
+            self.cambios.clear()
+        if estadisticas is not None:
+            t0 = estadisticas.marcar("preparacion", t0)
+        self.expandidos, generados, extracciones, reinsertados, cola_max = self._calcular_camino_minimo()
+        if estadisticas is not None:
+            t0 = estadisticas.marcar("busqueda", t0)
+            estadisticas.fijar("d_estrella_lite", self.expandidos, generados, self.inserciones - inserciones,
+                               extracciones + self.obsoletas - obsoletas, reinsertados + self.obsoletas - obsoletas,
+                               cola_max)
+
+        coste = self.g[self.inicio]
+        if coste == INFINITO:
+            traza.mensaje("EL CONEJO NO PUEDE ALCANZAR LA ZANAHORIA")
+            traza.emitir_resumen("d_estrella_lite", -1, -1, self.expandidos, [])
+            return -1, -1, []
+
+        camino = [mapi.casilla_de_id(i) for i in self._extraer_camino()]
+        cal = calorias_camino(camino, mapi)
+        traza.mensaje(f"LAS CALORIAS SON {cal}")
+        traza.emitir_resumen("d_estrella_lite", coste, cal, self.expandidos, camino)
+        if estadisticas is not None:
+            estadisticas.marcar("reconstruccion", t0)
+        return coste, cal, camino
+
+    def _extraer_camino(self):
+        """Baja desde el inicio por el vecino que minimiza coste + g hasta llegar a la meta."""
+        g, ady = self.g, self.adyacencia
+        actual = self.inicio
+        ids = [actual]
+        while actual != self.meta:
+            base = actual * GRADO_MAXIMO
+            actual = min(range(base, base + ady.grado[actual]), key=lambda k: ady.costes[k] + g[ady.vecinos[k]])
+            actual = ady.vecinos[actual]
+            ids.append(actual)
+        return ids
@@ -0,0 +1,138 @@
+# escenarios.py
+
+import time
+
+_INICIO = time.perf_counter()  # Lo primero que se ejecuta: referencia del tiempo hasta el primer resultado
+
+import argparse
+import sys
+
+# Heurísticas de a_estrella por nombre; las funciones se buscan al ejecutar para
+# no importar los algoritmos (ni el mapa) antes de haber leído los argumentos
+HEURISTICAS = ("octil", "manhattan", "euclidea", "chebyshev", "trivial")
+
+def leer_escenario(ruta, epsilon=None):
+    """
+    Lee un fichero de escenario con una consulta por línea:
+
+        fila_origen col_origen fila_destino col_destino [epsilon]
+
+    Las líneas vacías y las que empiezan por '#' se ignoran. Sin epsilon en la
+    línea se usa el indicado; con epsilon None la consulta se resuelve con
+    a_estrella y, si no, con a_estrella_subepsilon.
+
+    :param ruta: Fichero de escenario.
+    :param epsilon: Epsilon por defecto de las consultas.
+    :return: Lista de tuplas ((fila, col), (fila, col), epsilon).
+    """
+    consultas = []
+    with open(ruta, "r", encoding="utf-8") as fich:
+        for numero, linea in enumerate(fich, 1):
+            campos = linea.split()
+            if not campos or campos[0].startswith("#"):
+                continue
+            if len(campos) not in (4, 5):
+                raise ValueError(f"{ruta}:{numero}: se esperaban 4 o 5 campos y hay {len(campos)}")
+            try:
+                fo, co, fd, cd = (int(c) for c in campos[:4])
+                eps = float(campos[4]) if len(campos) == 5 else epsilon
+            except ValueError:
+                raise ValueError(f"{ruta}:{numero}: valor no numérico en '{linea.strip()}'") from None
+            consultas.append(((fo, co), (fd, cd), eps))
+    return consultas
+
+def ejecutar_escenario(mapi, consultas, heuristica, con_camino=False):
+    """
+    Resuelve las consultas en orden y sin trazas.
+
+    :param mapi: Objeto Mapa.
+    :param consultas: Lista de tuplas ((fila, col), (fila, col), epsilon), como las de leer_escenario.
+    :param heuristica: Función heurística.
+    :param con_camino: Incluir en cada resultado la lista de casillas del camino.
+    :return: Tupla (lista de resultados como diccionarios, instante de perf_counter
+             en que terminó la primera consulta o None si no había ninguna).
+    """
+    from casilla import Casilla
+    from a_estrella import buscar_a_estrella
+    from a_estrella_subepsilon import buscar_a_estrella_subepsilon
+    from traza import SIN_TRAZA
+
+    resultados = []
+    primero = None
+    for origen, destino, epsilon in consultas:
+        for fila, col in (origen, destino):
+            if not (0 <= fila < mapi.getAlto() and 0 <= col < mapi.getAncho()):
+                raise ValueError(f"La casilla ({fila}, {col}) está fuera del mapa")
+        inicio, meta = Casilla(*origen), Casilla(*destino)
+        t0 = time.perf_counter()
+        if epsilon is None:
+            coste, cal, camino = buscar_a_estrella(inicio, meta, mapi.getVecinos, mapi.costo_movimiento,
+                                                   heuristica, mapi, SIN_TRAZA)
+        else:
+            coste, cal, camino = buscar_a_estrella_subepsilon(inicio, meta, mapi.getVecinos, mapi.costo_movimiento,
+                                                              heuristica, epsilon, mapi, SIN_TRAZA)
+        t1 = time.perf_counter()
+        if primero is None:
+            primero = t1
+        resultado = {"origen": list(origen), "destino": list(destino),
+                     "algoritmo": "a_estrella" if epsilon is None else "a_estrella_subepsilon",
+                     "epsilon": epsilon, "coste": coste, "cal": cal, "pasos": len(camino),
+                     "segundos": round(t1 - t0, 6)}
+        if con_camino:
+            resultado["camino"] = [[casilla.getFila(), casilla.getCol()] for casilla in camino]
+        resultados.append(resultado)
+    return resultados, primero
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Resuelve un escenario de consultas sobre un mapa sin interfaz "
+                                                 "gráfica y escribe los resultados en JSON")
+    parser.add_argument("mapa", help="Mapa de texto o binario (ver formato_binario)")
+    parser.add_argument("escenario", help="Fichero con una consulta por línea: fila_o col_o fila_d col_d [epsilon]")
+    parser.add_argument("--heuristica", choices=HEURISTICAS, default="octil")
+    parser.add_argument("--epsilon", type=float, help="Epsilon de las consultas que no lo indican "
+                                                      "(por defecto se usa a_estrella)")
+    parser.add_argument("--terrenos", help="Tabla de terrenos en JSON (por defecto la de terreno.py)")
+    parser.add_argument("--camino", action="store_true", help="Incluir el camino de cada consulta")
+    parser.add_argument("--salida", help="Fichero JSON de salida (por defecto la salida estándar)")
+    args = parser.parse_args(argv)
+
+    try:
+        consultas = leer_escenario(args.escenario, args.epsilon)
+    except (OSError, ValueError) as error:
+        parser.error(str(error))
+
+    t0 = time.perf_counter()
+    import a_estrella
+    from mapa import Mapa
+    from terreno import TablaTerrenos
+    t_importacion = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    mapi = Mapa(args.mapa, terrenos=TablaTerrenos.desde_archivo(args.terrenos) if args.terrenos else None)
+    t_mapa = time.perf_counter() - t0
+
+    try:
+        resultados, primero = ejecutar_escenario(mapi, consultas, getattr(a_estrella, args.heuristica + "_heuristica"),
+                                                 args.camino)
+    except ValueError as error:
+        parser.error(str(error))
+
+    import json
+    fin = time.perf_counter()
+    salida = {
+        "mapa": args.mapa, "alto": mapi.getAlto(), "ancho": mapi.getAncho(), "heuristica": args.heuristica,
+        # Segundos desde que se empezó a ejecutar este módulo (sin el arranque del intérprete)
+        "tiempos": {"importacion": round(t_importacion, 6), "carga_mapa": round(t_mapa, 6),
+                    "primer_resultado": None if primero is None else round(primero - _INICIO, 6),
+                    "total": round(fin - _INICIO, 6)},
+        "resultados": resultados,
+    }
+    if args.salida:
+        with open(args.salida, "w", encoding="utf-8") as fich:
+            json.dump(salida, fich, ensure_ascii=False, indent=1)
+    else:
+        json.dump(salida, sys.stdout, ensure_ascii=False, indent=1)
+        sys.stdout.write("\n")
+
+if __name__ == "__main__":
+    main()
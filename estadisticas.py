@@ -0,0 +1,62 @@
+# estadisticas.py
+
+import time
+
+class EstadisticasBusqueda:
+    def __init__(self):
+        """
+        Contadores de una búsqueda. Se pasa vacío a una función buscar_* (o a
+        su envoltorio) mediante el parámetro 'estadisticas' y la búsqueda lo
+        rellena al terminar.
+
+        - expandidos: nodos sacados de la frontera y expandidos.
+        - generados: sucesores examinados al expandir (aristas recorridas).
+        - inserciones / extracciones: operaciones sobre la cola de prioridad.
+        - duplicados: sucesores o entradas de la cola descartados por estar ya
+          cerrados, por no mejorar el g conocido o por haber quedado obsoletos.
+        - frontera_max: mayor tamaño alcanzado por la frontera.
+        - focal_max / focal_media: tamaño de la lista focal al extraer (solo A* Subε).
+        - tiempos: segundos de cada fase ("preparacion", "busqueda", "reconstruccion").
+        """
+        self.algoritmo = None
+        self.expandidos = 0
+        self.generados = 0
+        self.inserciones = 0
+        self.extracciones = 0
+        self.duplicados = 0
+        self.frontera_max = 0
+        self.focal_max = 0
+        self.focal_media = 0.0
+        self.tiempos = {}
+
+    def fijar(self, algoritmo, expandidos, generados, inserciones, extracciones, duplicados, frontera_max):
+        """Vuelca de una vez los contadores que la búsqueda lleva en variables locales."""
+        self.algoritmo = algoritmo
+        self.expandidos = expandidos
+        self.generados = generados
+        self.inserciones = inserciones
+        self.extracciones = extracciones
+        self.duplicados = duplicados
+        self.frontera_max = frontera_max
+
+    def marcar(self, fase, t0):
+        """
+        Suma a la fase el tiempo transcurrido desde t0.
+        :return: El instante actual, para encadenar la fase siguiente.
+        """
+        ahora = time.perf_counter()
+        self.tiempos[fase] = self.tiempos.get(fase, 0) + ahora - t0
+        return ahora
+
+    def a_dict(self):
+        """Devuelve los contadores como diccionario (p. ej. para volcarlos a JSON)."""
+        return dict(self.__dict__, tiempos=dict(self.tiempos))
+
+    def __str__(self):
+        tiempos = " ".join(f"{fase}={segundos:.4f}s" for fase, segundos in self.tiempos.items())
+        texto = (f"{self.algoritmo}: expandidos={self.expandidos} generados={self.generados} "
+                 f"inserciones={self.inserciones} extracciones={self.extracciones} "
+                 f"duplicados={self.duplicados} frontera_max={self.frontera_max}")
+        if self.focal_max:
+            texto += f" focal_max={self.focal_max} focal_media={self.focal_media:.1f}"
+        return f"{texto} {tiempos}"
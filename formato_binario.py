@@ -0,0 +1,73 @@
+# formato_binario.py
+
+import mmap
+import struct
+
+from terreno import TablaTerrenos, TipoTerreno
+
+# Formato binario de mapa (little endian):
+#   cabecera: magia, versión, número de terrenos, alto, ancho, desplazamiento de la rejilla
+#   tabla de terrenos: por cada uno, código, símbolo, transitable, coste, calorías,
+#                      longitud del nombre y el nombre en UTF-8
+#   rejilla: alto*ancho bytes con el código de cada celda, fila a fila
+MAGIA = b"MAPA"
+VERSION = 1
+CABECERA = struct.Struct("<4sHHIIQ")
+TERRENO = struct.Struct("<BcBdiB")
+
+def es_binario(ruta):
+    """Indica si el fichero empieza con la marca del formato binario."""
+    with open(ruta, "rb") as fich:
+        return fich.read(len(MAGIA)) == MAGIA
+
+def escribir(ruta, alto, ancho, terrenos, celdas):
+    """
+    Guarda un mapa en formato binario.
+    :param ruta: Fichero de salida.
+    :param alto: Número de filas.
+    :param ancho: Número de columnas.
+    :param terrenos: TablaTerrenos del mapa.
+    :param celdas: Objeto tipo bytes con los alto*ancho códigos de celda.
+    """
+    tabla = b""
+    for tipo in terrenos:
+        nombre = tipo.nombre.encode("utf-8")
+        tabla += TERRENO.pack(tipo.codigo, tipo.simbolo.encode("ascii"), tipo.transitable,
+                              tipo.coste, tipo.calorias, len(nombre)) + nombre
+    tipos = list(terrenos)
+    with open(ruta, "wb") as fich:
+        fich.write(CABECERA.pack(MAGIA, VERSION, len(tipos), alto, ancho, CABECERA.size + len(tabla)))
+        fich.write(tabla)
+        fich.write(celdas)
+
+def abrir(ruta):
+    """
+    Abre un mapa binario proyectando el fichero en memoria con mmap. La
+    rejilla no se lee: las páginas se cargan cuando se accede a ellas y las
+    comparten todos los procesos que abren el mismo fichero. La proyección es
+    copia en escritura, así que setCelda no modifica el fichero.
+    :param ruta: Fichero del mapa.
+    :return: Tupla (alto, ancho, terrenos, celdas), con celdas un memoryview escribible.
+    """
+    with open(ruta, "rb") as fich:
+        proyeccion = mmap.mmap(fich.fileno(), 0, access=mmap.ACCESS_COPY)
+    magia, version, num_terrenos, alto, ancho, desplazamiento = CABECERA.unpack_from(proyeccion, 0)
+    if magia != MAGIA:
+        raise ValueError(f"{ruta} no es un mapa binario")
+    if version != VERSION:
+        raise ValueError(f"Versión de mapa binario no soportada: {version}")
+
+    tipos = []
+    posicion = CABECERA.size
+    for _ in range(num_terrenos):
+        codigo, simbolo, transitable, coste, calorias, longitud = TERRENO.unpack_from(proyeccion, posicion)
+        posicion += TERRENO.size
+        nombre = proyeccion[posicion:posicion + longitud].decode("utf-8")
+        posicion += longitud
+        tipos.append(TipoTerreno(codigo, simbolo.decode("ascii"), nombre, bool(transitable),
+                                 int(coste) if coste.is_integer() else coste, calorias))
+
+    if len(proyeccion) < desplazamiento + alto * ancho:
+        raise ValueError(f"{ruta} está truncado")
+    celdas = memoryview(proyeccion)[desplazamiento:desplazamiento + alto * ancho]
+    return alto, ancho, TablaTerrenos(tipos), celdas
@@ -0,0 +1,116 @@
+# frente_onda.py
+
+try:
+    import numpy as np
+except ImportError:  # NumPy es opcional: solo lo necesita este módulo
+    np = None
+
+MAX_ITERACIONES = 100000
+
+def hay_numpy():
+    """Indica si está instalado NumPy, necesario para distancias_frente_onda."""
+    return np is not None
+
+def distancias_frente_onda(mapi, origenes, max_iteraciones=MAX_ITERACIONES):
+    """
+    Distancia desde el conjunto de celdas 'origenes' a todas las celdas del
+    mapa, calculada de golpe sobre la rejilla con NumPy en lugar de nodo a
+    nodo con un montículo.
+
+    Es un barrido rápido (fast sweeping, como la transformada de distancia
+    chamfer): cada iteración recorre la rejilla en los cuatro sentidos (de
+    arriba abajo, de abajo arriba, de izquierda a derecha y de derecha a
+    izquierda) y, en cada barrido, cada línea se relaja a la vez a partir de
+    la anterior con sus tres vecinos (recto 1, diagonales 1.5, por el
+    multiplicador medio del terreno, igual que Mapa.costo_movimiento). Entre
+    los cuatro sentidos se cubren los ocho movimientos, y se repite hasta que
+    una iteración no mejora ninguna distancia; entonces son las mismas que
+    daría Dijkstra. Los muros no reciben ni propagan distancia. Cada barrido
+    se salta las líneas cuya anterior no ha cambiado desde la última vez que
+    pasó por ellas, así que las iteraciones finales solo tocan la zona que
+    aún se está corrigiendo.
+
+    El número de iteraciones crece con las vueltas que dan los caminos: en
+    mapas abiertos bastan unas pocas, pero en laberintos puede necesitar
+    muchas y ser más lento que campo_distancias.
+
+    :param mapi: Objeto Mapa.
+    :param origenes: Ids de las celdas de partida (distancia 0); las no transitables se ignoran.
+    :param max_iteraciones: Límite de iteraciones; si se alcanza sin converger se lanza RuntimeError.
+    :return: Tupla (array de NumPy alto x ancho con las distancias, np.inf
+             donde no se llega, número de iteraciones).
+    """
+    if np is None:
+        raise ImportError("distancias_frente_onda necesita NumPy (pip install numpy)")
+    alto, ancho = mapi.getAlto(), mapi.getAncho()
+    libre = np.frombuffer(bytes(mapi.transitables), dtype=np.uint8).reshape(alto, ancho) != 0
+    coste = None if mapi.uniforme else np.frombuffer(mapi.coste_celda, dtype=np.float64).reshape(alto, ancho)
+
+    distancias = np.full((alto, ancho), np.inf)
+    for id_celda in origenes:
+        fila, col = divmod(id_celda, ancho)
+        if libre[fila, col]:
+            distancias[fila, col] = 0
+
+    # Vistas de la rejilla en cada sentido: recorrer sus filas de arriba abajo
+    # equivale a barrer la rejilla original en ese sentido
+    def vistas(a):
+        return a, a[::-1], a.T, a.T[::-1]
+
+    # Líneas cambiadas desde que cada barrido pasó por ellas: filas para los
+    # dos barridos verticales y columnas para los dos horizontales
+    filas = [np.ones(alto, dtype=bool) for _ in range(2)]
+    columnas = [np.ones(ancho, dtype=bool) for _ in range(2)]
+    propias = ([filas[0], filas[1]], [filas[0][::-1], filas[1][::-1]],
+               [columnas[0], columnas[1]], [columnas[0][::-1], columnas[1][::-1]])
+    cruzadas = (columnas, columnas, filas, filas)
+
+    bloqueadas = ~libre
+    barridos = list(zip(vistas(distancias), vistas(bloqueadas),
+                        vistas(coste) if coste is not None else [None] * 4,
+                        (propias[0][0], propias[1][1], propias[2][0], propias[3][1]), propias, cruzadas))
+    for iteracion in range(1, max_iteraciones + 1):
+        mejorado = False
+        for d, bloqueada, c, pendientes, propia, cruzada in barridos:
+            if _barrer(d, bloqueada, c, pendientes, propia, cruzada):
+                mejorado = True
+        if not mejorado:
+            return distancias, iteracion
+    raise RuntimeError(f"El frente de onda no ha convergido en {max_iteraciones} iteraciones")
+
+def _barrer(d, bloqueada, coste, pendientes, propia, cruzada):
+    """
+    Relaja cada fila de 'd' a partir de la anterior (recto y las dos
+    diagonales). Modifica 'd' en su sitio.
+    :param pendientes: Marcas de las filas que han cambiado desde que este barrido pasó por ellas.
+    :param propia: Marcas (de todos los barridos) de las filas de 'd', para marcar las que cambien.
+    :param cruzada: Marcas de las columnas de 'd', para marcar las posiciones que cambien.
+    :return: True si ha mejorado alguna distancia.
+    """
+    mejorado = False
+    for r in range(1, d.shape[0]):
+        if not pendientes[r - 1]:
+            continue
+        pendientes[r - 1] = False
+        anterior = d[r - 1]
+        fila = d[r]
+        if coste is None:
+            candidata = anterior + 1
+            np.minimum(candidata[1:], anterior[:-1] + 1.5, out=candidata[1:])
+            np.minimum(candidata[:-1], anterior[1:] + 1.5, out=candidata[:-1])
+        else:
+            c, c_anterior = coste[r], coste[r - 1]
+            # Mismo orden de operaciones que Mapa._coste_paso, para obtener los mismos valores
+            candidata = anterior + (c + c_anterior) / 2
+            np.minimum(candidata[1:], anterior[:-1] + 1.5 * ((c[1:] + c_anterior[:-1]) / 2), out=candidata[1:])
+            np.minimum(candidata[:-1], anterior[1:] + 1.5 * ((c[:-1] + c_anterior[1:]) / 2), out=candidata[:-1])
+        candidata[bloqueada[r]] = np.inf
+        mejoras = candidata < fila
+        if mejoras.any():
+            np.minimum(fila, candidata, out=fila)
+            for marcas in propia:
+                marcas[r] = True
+            for marcas in cruzada:
+                marcas[mejoras] = True
+            mejorado = True
+    return mejorado
@@ -1,19 +1,14 @@
 # funciones_apoyo.py
 
-from casilla import Casilla
+from mapa import GRADO_MAXIMO
 
 def obtener_vecinos(estado, mapa):
     """Obtiene los vecinos de una casilla en 8 direcciones."""
-    vecinos = []
-    fila, columna = estado.getFila(), estado.getCol()
-    movimientos = [(-1,0), (1,0), (0,-1), (0,1), (-1,-1), (-1,1), (1,-1), (1,1)]  # 8 direcciones
-    for df, dc in movimientos:
-        nueva_fila = fila + df
-        nueva_columna = columna + dc
-        vecino = Casilla(nueva_fila, nueva_columna)
-        if mapa.es_valido(vecino):
-            vecinos.append(vecino)
-    return vecinos
+    # Se leen de la tabla de adyacencia del mapa, que se construye una sola vez
+    adyacencia = mapa.preparar_adyacencia()
+    base = mapa.id_casilla(estado) * GRADO_MAXIMO
+    return [mapa.casilla_de_id(adyacencia.vecinos[k])
+            for k in range(base, base + adyacencia.grado[mapa.id_casilla(estado)])]
 
 def costo_movimiento(estado_actual, vecino, mapa):
     """Calcula el costo de moverse de una casilla a otra basado en el tipo de movimiento."""
@@ -0,0 +1,156 @@
+# generador_mapas.py
+
+import random
+from mapa import Mapa
+
+def generar_mapa_abierto(alto, ancho, densidad_muros=0.2, prop_agua=0.1, prop_roca=0.1, semilla=None):
+    """
+    Genera un mapa con borde de muros y obstáculos repartidos al azar.
+
+    :param alto: Número de filas del mapa.
+    :param ancho: Número de columnas del mapa.
+    :param densidad_muros: Probabilidad de que una celda interior sea muro.
+    :param prop_agua: Probabilidad de que una celda transitable sea agua.
+    :param prop_roca: Probabilidad de que una celda transitable sea roca.
+    :param semilla: Semilla del generador aleatorio, para repetir el mismo mapa.
+    :return: Objeto Mapa.
+    """
+    azar = random.Random(semilla)
+    matriz = []
+    for fila in range(alto):
+        matriz.append([])
+        for col in range(ancho):
+            if fila in (0, alto - 1) or col in (0, ancho - 1) or azar.random() < densidad_muros:
+                matriz[fila].append(1)
+            else:
+                r = azar.random()
+                if r < prop_agua:
+                    matriz[fila].append(4)
+                elif r < prop_agua + prop_roca:
+                    matriz[fila].append(5)
+                else:
+                    matriz[fila].append(0)
+    return Mapa(matriz=matriz)
+
+def generar_laberinto(alto, ancho, semilla=None):
+    """
+    Genera un laberinto perfecto (en 4-conectividad hay un único camino entre
+    dos celdas cualesquiera) con pasillos de una celda de ancho, por búsqueda en profundidad aleatoria.
+    Las celdas de pasillo están en coordenadas impares.
+
+    :param alto: Número de filas del mapa.
+    :param ancho: Número de columnas del mapa.
+    :param semilla: Semilla del generador aleatorio.
+    :return: Objeto Mapa.
+    """
+    azar = random.Random(semilla)
+    matriz = [[1] * ancho for _ in range(alto)]
+    matriz[1][1] = 0
+    pila = [(1, 1)]
+    while pila:
+        fila, col = pila[-1]
+        opciones = [(fila + df, col + dc, fila + df // 2, col + dc // 2)
+                    for df, dc in ((-2, 0), (2, 0), (0, -2), (0, 2))
+                    if 0 < fila + df < alto - 1 and 0 < col + dc < ancho - 1 and matriz[fila + df][col + dc] == 1]
+        if not opciones:
+            pila.pop()
+            continue
+        nueva_fila, nueva_col, muro_fila, muro_col = azar.choice(opciones)
+        matriz[muro_fila][muro_col] = 0
+        matriz[nueva_fila][nueva_col] = 0
+        pila.append((nueva_fila, nueva_col))
+    return Mapa(matriz=matriz)
+
+def generar_habitaciones(alto, ancho, tam_celda=16, semilla=None):
+    """
+    Genera un mapa de habitaciones rectangulares unidas por pasillos. El mapa
+    se divide en bloques de tam_celda x tam_celda; en cada bloque se excava una
+    habitación de tamaño y posición al azar, y cada habitación se une con la
+    del bloque de la derecha y la del bloque de abajo por un pasillo en L, así
+    que todas las habitaciones quedan conectadas.
+
+    :param alto: Número de filas del mapa.
+    :param ancho: Número de columnas del mapa.
+    :param tam_celda: Lado de cada bloque (al menos 5).
+    :param semilla: Semilla del generador aleatorio.
+    :return: Objeto Mapa.
+    """
+    azar = random.Random(semilla)
+    matriz = [[1] * ancho for _ in range(alto)]
+    filas_bloques = max(1, (alto - 2) // tam_celda)
+    cols_bloques = max(1, (ancho - 2) // tam_celda)
+
+    centros = {}
+    for bf in range(filas_bloques):
+        for bc in range(cols_bloques):
+            # Límites del bloque, dejando una celda de muro alrededor
+            f0 = 1 + bf * tam_celda
+            c0 = 1 + bc * tam_celda
+            f1 = min(f0 + tam_celda - 1, alto - 1)
+            c1 = min(c0 + tam_celda - 1, ancho - 1)
+            alto_hab = azar.randint(max(1, (f1 - f0) // 3), max(1, f1 - f0 - 1))
+            ancho_hab = azar.randint(max(1, (c1 - c0) // 3), max(1, c1 - c0 - 1))
+            fila = azar.randint(f0, max(f0, f1 - alto_hab))
+            col = azar.randint(c0, max(c0, c1 - ancho_hab))
+            for f in range(fila, min(fila + alto_hab, alto - 1)):
+                matriz[f][col:min(col + ancho_hab, ancho - 1)] = [0] * (min(col + ancho_hab, ancho - 1) - col)
+            centros[(bf, bc)] = (fila + alto_hab // 2, col + ancho_hab // 2)
+
+    for (bf, bc), (fila, col) in centros.items():
+        for vecino in ((bf, bc + 1), (bf + 1, bc)):
+            if vecino in centros:
+                fila2, col2 = centros[vecino]
+                for c in range(min(col, col2), max(col, col2) + 1):
+                    matriz[fila][c] = 0
+                for f in range(min(fila, fila2), max(fila, fila2) + 1):
+                    matriz[f][col2] = 0
+    return Mapa(matriz=matriz)
+
+def generar_terreno_mixto(alto, ancho, tam_mancha=8, prop_agua=0.3, prop_roca=0.2, densidad_muros=0.05, semilla=None):
+    """
+    Genera un mapa sin apenas muros con manchas de agua, roca y hierba, para
+    medir los algoritmos que tienen en cuenta las calorías del terreno. El
+    terreno se elige por bloques de tam_mancha x tam_mancha con los bordes
+    desplazados al azar, y después se reparten algunos muros sueltos.
+
+    :param alto: Número de filas del mapa.
+    :param ancho: Número de columnas del mapa.
+    :param tam_mancha: Tamaño aproximado de cada mancha de terreno.
+    :param prop_agua: Proporción de manchas de agua.
+    :param prop_roca: Proporción de manchas de roca.
+    :param densidad_muros: Probabilidad de que una celda interior sea muro.
+    :param semilla: Semilla del generador aleatorio.
+    :return: Objeto Mapa.
+    """
+    azar = random.Random(semilla)
+    manchas = {}
+
+    def terreno_mancha(bf, bc):
+        if (bf, bc) not in manchas:
+            r = azar.random()
+            manchas[(bf, bc)] = 4 if r < prop_agua else 5 if r < prop_agua + prop_roca else 0
+        return manchas[(bf, bc)]
+
+    matriz = []
+    for fila in range(alto):
+        matriz.append([])
+        for col in range(ancho):
+            if fila in (0, alto - 1) or col in (0, ancho - 1) or azar.random() < densidad_muros:
+                matriz[fila].append(1)
+            else:
+                desplazamiento = azar.randint(-1, 1)
+                matriz[fila].append(terreno_mancha((fila + desplazamiento) // tam_mancha,
+                                                   (col + desplazamiento) // tam_mancha))
+    return Mapa(matriz=matriz)
+
+def casilla_libre_cercana(mapi, fila, col):
+    """
+    Devuelve las coordenadas de la celda transitable más cercana (en recorrido
+    por anillos) a la posición indicada, o None si no hay ninguna.
+    """
+    for radio in range(max(mapi.getAlto(), mapi.getAncho())):
+        for f in range(fila - radio, fila + radio + 1):
+            for c in range(col - radio, col + radio + 1):
+                if mapi.transitable(f, c):
+                    return f, c
+    return None
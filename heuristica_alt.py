@@ -0,0 +1,185 @@
+# heuristica_alt.py
+
+import heapq
+import os
+import struct
+import zlib
+from array import array
+from collections import Counter
+
+from mapa import GRADO_MAXIMO
+from a_estrella import octil_heuristica
+
+NUM_LANDMARKS = 8
+INFINITO = float("inf")
+
+# Fichero de tablas de landmarks (little endian):
+#   cabecera: magia, versión, alto, ancho, número de landmarks, landmarks pedidos, CRC32 de la rejilla
+#   ids de los landmarks (int32) y distancias (float32), landmark a landmark
+MAGIA = b"ALTM"
+VERSION = 2
+CABECERA = struct.Struct("<4sHIIIII")
+
+# Heurísticas ya construidas de cada mapa, guardadas en el propio mapa (así se
+# liberan con él): mapi.derivados[DERIVADO] -> {num_landmarks: HeuristicaALT}
+DERIVADO = "heuristicas_alt"
+
+class HeuristicaALT:
+    admisible = True  # a_estrella no necesita comprobar si sobreestima
+
+    def __init__(self, mapi, landmarks, distancias, pedidos=None):
+        """
+        Heurística ALT (A*, landmarks y desigualdad triangular; Goldberg y
+        Harrelson, 2005).
+
+        Para cada landmark L se guarda la distancia real d(L, x) a todas las
+        celdas. Como los costes son simétricos, por la desigualdad triangular
+        |d(L, meta) - d(L, n)| <= d(n, meta), así que el máximo sobre los
+        landmarks es admisible y consistente, y a diferencia de las otras
+        heurísticas tiene en cuenta los muros y el terreno. Con costes
+        uniformes se toma también la distancia octil, que puede ser mejor
+        cerca de la meta.
+
+        Se llama como las demás, heuristica(casilla, meta). Si el mapa cambia
+        después de calcular las distancias, deja de usarlas hasta que se vuelva
+        a construir con construir() (heuristica_alt() lo hace sola).
+
+        :param mapi: Mapa al que corresponden las distancias.
+        :param landmarks: Lista de ids de los landmarks.
+        :param distancias: array('f') con len(landmarks)*alto*ancho distancias;
+                           la de la celda i al landmark k está en k*alto*ancho + i.
+        :param pedidos: Landmarks pedidos a construir(); puede haber menos en
+                        'landmarks' si el mapa no da para más. Por defecto len(landmarks).
+        """
+        self.mapi = mapi
+        self.ancho = mapi.getAncho()
+        self.landmarks = landmarks
+        self.pedidos = len(landmarks) if pedidos is None else pedidos
+        self.distancias = distancias
+        self.version = mapi.version  # Versión del mapa con la que se calcularon
+        self.octil = mapi.uniforme   # Con multiplicadores < 1 la octil no sería admisible
+        self._meta = None
+        self._desde_meta = []        # (desplazamiento del landmark, d(L, meta)) para la meta actual
+
+    def __call__(self, nodo_actual, nodo_meta):
+        if self.mapi.version != self.version:
+            return octil_heuristica(nodo_actual, nodo_meta) if self.octil else 0
+        ancho = self.ancho
+        meta = nodo_meta.getFila() * ancho + nodo_meta.getCol()
+        if meta != self._meta:
+            n = self.mapi.getAlto() * ancho
+            distancias = self.distancias
+            # Los landmarks de otra región que la meta no aportan nada
+            self._desde_meta = [(k * n, distancias[k * n + meta]) for k in range(len(self.landmarks))
+                                if distancias[k * n + meta] != INFINITO]
+            self._meta = meta
+        actual = nodo_actual.getFila() * ancho + nodo_actual.getCol()
+        mejor = octil_heuristica(nodo_actual, nodo_meta) if self.octil else 0
+        distancias = self.distancias
+        for desplazamiento, d_meta in self._desde_meta:
+            cota = abs(d_meta - distancias[desplazamiento + actual])
+            if cota > mejor:
+                mejor = cota
+        return mejor
+
+    @classmethod
+    def construir(cls, mapi, num_landmarks=NUM_LANDMARKS):
+        """
+        Elige los landmarks y calcula sus distancias con un Dijkstra por cada uno.
+
+        Los landmarks se eligen por el punto más lejano: el primero es la celda
+        más alejada de una celda de la componente conexa más grande, y cada
+        siguiente la que está más lejos de todos los ya elegidos. Así quedan en
+        los extremos del mapa, donde las cotas son mejores.
+        """
+        etiquetas = mapi.componentes
+        n = mapi.getAlto() * mapi.getAncho()
+        tamanos = Counter(etiquetas.etiqueta(i) for i in range(n) if mapi.transitable_id(i))
+        distancias = array('f')
+        landmarks = []
+        if tamanos:
+            mayor = tamanos.most_common(1)[0][0]
+            semilla = next(i for i in range(n) if mapi.transitable_id(i) and etiquetas.etiqueta(i) == mayor)
+            lejania = _dijkstra(mapi, semilla)  # Distancia al landmark más cercano de los ya elegidos
+            for _ in range(num_landmarks):
+                landmark = max(range(n), key=lambda i: lejania[i] if lejania[i] != INFINITO else -1)
+                if landmark in landmarks or lejania[landmark] == 0:
+                    break  # Región con menos celdas que landmarks
+                landmarks.append(landmark)
+                desde = _dijkstra(mapi, landmark)
+                distancias.extend(desde)
+                lejania = [min(a, b) for a, b in zip(lejania, desde)] if len(landmarks) > 1 else desde
+        return cls(mapi, landmarks, distancias, num_landmarks)
+
+    def guardar(self, ruta):
+        """Guarda los landmarks y sus distancias para no tener que recalcularlas."""
+        mapi = self.mapi
+        with open(ruta, "wb") as fich:
+            fich.write(CABECERA.pack(MAGIA, VERSION, mapi.getAlto(), mapi.getAncho(), len(self.landmarks),
+                                     self.pedidos, zlib.crc32(mapi.celdas)))
+            array('i', self.landmarks).tofile(fich)
+            self.distancias.tofile(fich)
+
+    @classmethod
+    def cargar(cls, ruta, mapi):
+        """
+        Carga una tabla guardada con guardar().
+        :return: HeuristicaALT, o None si el fichero es de otro mapa (dimensiones
+                 o celdas distintas) o de otra versión del formato.
+        """
+        with open(ruta, "rb") as fich:
+            cabecera = fich.read(CABECERA.size)
+            if len(cabecera) < CABECERA.size:
+                return None
+            magia, version, alto, ancho, num_landmarks, pedidos, crc = CABECERA.unpack(cabecera)
+            if magia != MAGIA or version != VERSION or (alto, ancho) != (mapi.getAlto(), mapi.getAncho()) \
+                    or crc != zlib.crc32(mapi.celdas):
+                return None
+            landmarks = array('i')
+            landmarks.fromfile(fich, num_landmarks)
+            distancias = array('f')
+            distancias.fromfile(fich, num_landmarks * alto * ancho)
+        return cls(mapi, list(landmarks), distancias, pedidos)
+
+def _dijkstra(mapi, origen):
+    """Distancias desde 'origen' a todas las celdas (INFINITO si no se alcanzan)."""
+    adyacencia = mapi.preparar_adyacencia()
+    grado, vecinos_ady, costes_ady = adyacencia.grado, adyacencia.vecinos, adyacencia.costes
+    distancia = [INFINITO] * (mapi.getAlto() * mapi.getAncho())
+    distancia[origen] = 0
+    frontera = [(0, origen)]
+    while frontera:
+        d, actual = heapq.heappop(frontera)
+        if d > distancia[actual]:
+            continue
+        base = actual * GRADO_MAXIMO
+        for k in range(base, base + grado[actual]):
+            vecino = vecinos_ady[k]
+            nueva = d + costes_ady[k]
+            if nueva < distancia[vecino]:
+                distancia[vecino] = nueva
+                heapq.heappush(frontera, (nueva, vecino))
+    return distancia
+
+def heuristica_alt(mapi, num_landmarks=NUM_LANDMARKS, ruta=None):
+    """
+    Devuelve la heurística ALT del mapa, construyéndola solo la primera vez.
+    :param ruta: Fichero opcional de la tabla: si existe, corresponde al mapa y
+                 se construyó pidiendo num_landmarks se carga (aunque el mapa
+                 diera para menos); si no, se calcula y se guarda en él.
+    """
+    heuristicas = mapi.derivados.setdefault(DERIVADO, {})
+    heuristica = heuristicas.get(num_landmarks)
+    if heuristica is not None and heuristica.version == mapi.version:
+        return heuristica
+    heuristica = None
+    if ruta is not None and os.path.exists(ruta):
+        heuristica = HeuristicaALT.cargar(ruta, mapi)
+        if heuristica is not None and heuristica.pedidos != num_landmarks:
+            heuristica = None
+    if heuristica is None:
+        heuristica = HeuristicaALT.construir(mapi, num_landmarks)
+        if ruta is not None:
+            heuristica.guardar(ruta)
+    heuristicas[num_landmarks] = heuristica
+    return heuristica
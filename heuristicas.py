@@ -1,10 +1,16 @@
 from a_estrella import *
-def seleccionar_heuristica():
+from heuristica_alt import heuristica_alt
+def seleccionar_heuristica(mapi=None, ruta_alt=None):
+    """
+    :param mapi: Mapa de la búsqueda; necesario para la heurística ALT.
+    :param ruta_alt: Fichero donde se guardan o de donde se cargan los landmarks de ALT.
+    """
     print("Selecciona la heurística:")
     print("1. Trivial")
     print("2. Manhattan")
     print("3. Euclidiana")
     print("4. Chebyshev")
+    print("5. ALT (landmarks)")
     
     #opcion = input("Introduce el número de la heurística que deseas usar: ")
     opcion = "2"
@@ -17,6 +23,8 @@ def seleccionar_heuristica():
         return euclidea_heuristica
     elif opcion == "4":
         return chebyshev_heuristica
+    elif opcion == "5" and mapi is not None:
+        return heuristica_alt(mapi, ruta=ruta_alt)
     else:
         print("Opción no válida, usando heurística trivial por defecto.")
         return trivial_heuristica
@@ -0,0 +1,258 @@
+# jps.py
+
+import heapq
+import time
+
+from nodo import Nodo
+from a_estrella import buscar_a_estrella, calorias_camino, inalcanzable
+from traza import TRAZA_ITERACION, traza_por_defecto, evento_iteracion
+from perfilado import perfilable
+
+MOVIMIENTOS_INICIALES = [(-1, 0), (1, 0), (0, -1), (0, 1), (-1, -1), (-1, 1), (1, -1), (1, 1)]
+
+def jps(camino, inicio, meta, obtener_vecinos, costo_movimiento, tipo_heuristica, mapi, traza=None,
+        estadisticas=None, cola=None):
+    """
+    Jump Point Search con la misma firma que a_estrella: marca el camino con
+    '*' en la matriz 'camino' y devuelve (coste, calorías).
+    """
+    coste, cal, camino_reconstruido = buscar_jps(inicio, meta, obtener_vecinos, costo_movimiento,
+                                                 tipo_heuristica, mapi, traza, estadisticas, cola)
+    for casilla in camino_reconstruido:
+        camino[casilla.getFila()][casilla.getCol()] = '*'
+    return coste, cal
+
+@perfilable("jps")
+def buscar_jps(inicio, meta, obtener_vecinos, costo_movimiento, tipo_heuristica, mapi, traza=None,
+               estadisticas=None, cola=None):
+    """
+    Jump Point Search sobre la rejilla 8-conexa del mapa (pasos rectos de
+    coste 1 y diagonales de 1.5, diagonales permitidas aunque rocen muros).
+
+    En lugar de añadir a la frontera todos los vecinos, avanza en línea recta
+    o diagonal desde cada nodo hasta el siguiente punto de salto (la meta o
+    una casilla con vecinos forzados por un muro), descartando los caminos
+    simétricos. Las reglas de poda son válidas para cualquier coste diagonal
+    entre 1 y 2, así que el coste es el mismo que el de a_estrella con una
+    heurística consistente (octil_heuristica es la más informada). El camino
+    devuelto se expande casilla a casilla entre puntos de salto.
+
+    Solo funciona con la rejilla del propio mapa y con todos los terrenos de
+    coste uniforme: en otro caso se delega en buscar_a_estrella.
+
+    :param estadisticas: EstadisticasBusqueda opcional que se rellena al terminar
+                         (los generados son los puntos de salto encontrados).
+    :param cola: Clase de la frontera, como en buscar_a_estrella (p. ej.
+                 ColaCubetas); por defecto un montículo de tuplas (f, g, casilla).
+    :return: Tupla (coste, calorías, lista de casillas del camino).
+    """
+    if obtener_vecinos != mapi.getVecinos or costo_movimiento != mapi.costo_movimiento or not mapi.uniforme:
+        return buscar_a_estrella(inicio, meta, obtener_vecinos, costo_movimiento, tipo_heuristica, mapi, traza,
+                                 estadisticas, cola)
+
+    t0 = time.perf_counter()
+    traza = traza_por_defecto(traza)
+    por_iteracion = traza.activa(TRAZA_ITERACION)
+    ancho = mapi.getAncho()
+    transitable = mapi.transitable
+    meta_fc = (meta.getFila(), meta.getCol())
+
+    if inalcanzable(mapi.id_casilla(inicio), mapi.id_casilla(meta), obtener_vecinos, mapi):
+        traza.mensaje("EL CONEJO NO PUEDE ALCANZAR LA ZANAHORIA")
+        traza.emitir_resumen("jps", -1, -1, 0, [])
+        if estadisticas is not None:
+            estadisticas.fijar("jps", 0, 0, 0, 0, 0, 0)
+        return -1, -1, []
+
+    inicio_fc = (inicio.getFila(), inicio.getCol())
+    g = {inicio_fc: 0}
+    padres = {inicio_fc: None}
+    cerrados = set()
+    expandidos = []
+    if cola is None:
+        frontera = []
+
+        def insertar(f, g_nuevo, salto):
+            heapq.heappush(frontera, (f, g_nuevo, salto))
+
+        def extraer():
+            return heapq.heappop(frontera)
+
+        def casillas_frontera():
+            return (e[2] for e in frontera)
+    else:
+        # La cola guarda nodos: el estado es la casilla (fila, col) y h = f - g
+        frontera = cola()
+
+        def insertar(f, g_nuevo, salto):
+            frontera.insertar(Nodo(salto, None, g_nuevo, f - g_nuevo))
+
+        def extraer():
+            nodo = frontera.extraer()
+            return nodo.f, nodo.g, nodo.estado
+
+        def casillas_frontera():
+            return (nodo.estado for nodo in frontera)
+    insertar(tipo_heuristica(inicio, meta), 0, inicio_fc)
+
+    # Contadores para las estadísticas
+    generados = extracciones = duplicados = 0
+    inserciones = frontera_max = 1
+    if estadisticas is not None:
+        t0 = estadisticas.marcar("preparacion", t0)
+
+    while frontera:
+        _, g_actual, actual = extraer()
+        extracciones += 1
+        if actual in cerrados or g_actual > g[actual]:
+            duplicados += 1
+            continue
+        cerrados.add(actual)
+        expandidos.append(actual[0] * ancho + actual[1])
+
+        if actual == meta_fc:
+            if estadisticas is not None:
+                t0 = estadisticas.marcar("busqueda", t0)
+                estadisticas.fijar("jps", len(expandidos), generados, inserciones, extracciones, duplicados,
+                                   frontera_max)
+            camino_reconstruido = _expandir_camino(actual, padres, mapi)
+            cal = calorias_camino(camino_reconstruido, mapi)
+            traza.mensaje(f"LAS CALORIAS SON {cal}")
+            traza.emitir_resumen("jps", g_actual, cal, len(expandidos), camino_reconstruido)
+            if estadisticas is not None:
+                estadisticas.marcar("reconstruccion", t0)
+            return g_actual, cal, camino_reconstruido
+
+        saltos = []
+        for df, dc in _direcciones(actual, padres[actual], transitable):
+            salto = _saltar(actual, df, dc, meta_fc, transitable)
+            if salto is None:
+                continue
+            generados += 1
+            if salto in cerrados:
+                duplicados += 1
+                continue
+            g_nuevo = g_actual + _distancia(actual, salto)
+            if g_nuevo >= g.get(salto, float("inf")):
+                duplicados += 1
+            else:
+                g[salto] = g_nuevo
+                padres[salto] = actual
+                h = tipo_heuristica(mapi.casilla_de_id(salto[0] * ancho + salto[1]), meta)
+                insertar(g_nuevo + h, g_nuevo, salto)
+                inserciones += 1
+                if por_iteracion:
+                    saltos.append(salto[0] * ancho + salto[1])
+
+        if len(frontera) > frontera_max:
+            frontera_max = len(frontera)
+
+        if por_iteracion:
+            evento_iteracion(traza, ancho, len(expandidos), expandidos[-1], saltos, expandidos,
+                             (c[0] * ancho + c[1] for c in casillas_frontera()), len(frontera))
+
+    if estadisticas is not None:
+        estadisticas.marcar("busqueda", t0)
+        estadisticas.fijar("jps", len(expandidos), generados, inserciones, extracciones, duplicados, frontera_max)
+    traza.mensaje("EL CONEJO NO PUEDE ALCANZAR LA ZANAHORIA")
+    traza.emitir_resumen("jps", -1, -1, len(expandidos), [])
+    return -1, -1, []
+
+def _signo(x):
+    return (x > 0) - (x < 0)
+
+def _distancia(a, b):
+    """Coste del tramo recto o diagonal entre dos puntos de salto (distancia octil)."""
+    df = abs(a[0] - b[0])
+    dc = abs(a[1] - b[1])
+    return 1.5 * min(df, dc) + abs(df - dc) if df and dc else df + dc
+
+def _direcciones(actual, padre, transitable):
+    """Direcciones en las que hay que saltar desde 'actual' tras podar las simétricas."""
+    if padre is None:
+        return MOVIMIENTOS_INICIALES
+    f, c = actual
+    df = _signo(f - padre[0])
+    dc = _signo(c - padre[1])
+    direcciones = []
+    if df and dc:
+        # Diagonal: naturales (df,0), (0,dc), (df,dc); forzadas si hay un muro detrás
+        direcciones += [(df, 0), (0, dc), (df, dc)]
+        if not transitable(f - df, c):
+            direcciones.append((-df, dc))
+        if not transitable(f, c - dc):
+            direcciones.append((df, -dc))
+    elif dc:
+        # Horizontal: natural (0,dc); forzadas si hay muro arriba o abajo
+        direcciones.append((0, dc))
+        if not transitable(f + 1, c):
+            direcciones.append((1, dc))
+        if not transitable(f - 1, c):
+            direcciones.append((-1, dc))
+    else:
+        # Vertical: natural (df,0); forzadas si hay muro a un lado
+        direcciones.append((df, 0))
+        if not transitable(f, c + 1):
+            direcciones.append((df, 1))
+        if not transitable(f, c - 1):
+            direcciones.append((df, -1))
+    return direcciones
+
+def _saltar_recto(f, c, df, dc, meta, transitable):
+    """Avanza en línea recta desde (f, c) y devuelve el siguiente punto de salto o None."""
+    while True:
+        f += df
+        c += dc
+        if not transitable(f, c):
+            return None
+        if (f, c) == meta:
+            return f, c
+        if dc:
+            if (transitable(f + 1, c + dc) and not transitable(f + 1, c)) or \
+               (transitable(f - 1, c + dc) and not transitable(f - 1, c)):
+                return f, c
+        else:
+            if (transitable(f + df, c + 1) and not transitable(f, c + 1)) or \
+               (transitable(f + df, c - 1) and not transitable(f, c - 1)):
+                return f, c
+
+def _saltar(actual, df, dc, meta, transitable):
+    """Devuelve el siguiente punto de salto desde 'actual' en la dirección (df, dc), o None."""
+    f, c = actual
+    if not (df and dc):
+        return _saltar_recto(f, c, df, dc, meta, transitable)
+    while True:
+        f += df
+        c += dc
+        if not transitable(f, c):
+            return None
+        if (f, c) == meta:
+            return f, c
+        # Vecinos forzados de un paso diagonal
+        if (transitable(f - df, c + dc) and not transitable(f - df, c)) or \
+           (transitable(f + df, c - dc) and not transitable(f, c - dc)):
+            return f, c
+        # Es punto de salto si desde aquí un salto recto encuentra alguno
+        if _saltar_recto(f, c, df, 0, meta, transitable) is not None or \
+           _saltar_recto(f, c, 0, dc, meta, transitable) is not None:
+            return f, c
+
+def _expandir_camino(final, padres, mapi):
+    """Convierte la cadena de puntos de salto en la lista completa de casillas."""
+    puntos = []
+    nodo = final
+    while nodo is not None:
+        puntos.append(nodo)
+        nodo = padres[nodo]
+    puntos.reverse()
+
+    casillas = [mapi.casilla_de_id(puntos[0][0] * mapi.getAncho() + puntos[0][1])]
+    for (f1, c1), (f2, c2) in zip(puntos, puntos[1:]):
+        df = _signo(f2 - f1)
+        dc = _signo(c2 - c1)
+        f, c = f1, c1
+        while (f, c) != (f2, c2):
+            f += df
+            c += dc
+            casillas.append(mapi.casilla_de_id(f * mapi.getAncho() + c))
+    return casillas
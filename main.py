@@ -1,61 +1,321 @@
 import sys, pygame
+import queue
+from functools import partial
 from casilla import *
 from mapa import *
 from pygame.locals import *
 from a_estrella import *
 from heuristicas import *
 from a_estrella_subepsilon import *
-from funciones_apoyo import obtener_vecinos, costo_movimiento, manhattan_heuristica
+from ara_estrella import ara_estrella
+from funciones_apoyo import manhattan_heuristica
+from traza import TrazaConsola, TRAZA_ITERACION, TRAZA_RESUMEN
+from cache_caminos import CacheCaminos
+from busqueda_segundo_plano import BusquedaSegundoPlano
 
 
 
 MARGEN=5
 MARGEN_INFERIOR=60
 TAM=30
+# Tamaño máximo de la zona del mapa en la ventana: los mapas mayores se recorren
+# con las flechas y se acercan o alejan con la rueda del ratón o con +/-
+ANCHO_MAX=1200
+ALTO_MAX=720
+TAMANOS_ZOOM=[1, 2, 4, 8, 16, 30, 45]
 NEGRO=(0,0,0)
 HIERBA=(250, 180, 160)
 MURO=(30, 70, 140)
 AGUA=(173, 216, 230) 
 ROCA=(110, 75, 48)
 AMARILLO=(204, 255, 0) 
+GRIS=(128, 128, 128)
+CERRADO=(225, 110, 90)       # Casillas ya expandidas por la búsqueda en curso
+ABIERTO=(250, 225, 120)      # Casillas en su frontera
+ROJO=(200, 40, 40)
+MAX_RECTS=300                # Con más casillas nuevas por fotograma se actualiza toda la zona del mapa
+PRESUPUESTO_ARA=2.0          # Segundos para mejorar el camino en el modo ARA* (tecla A)
+MAX_CELDAS_TRAZA=40*40      # En mapas mayores la consola solo muestra el resultado (la traza completa es cuadrática)
+COLORES={0: HIERBA, 1: MURO, 4: AGUA, 5: ROCA}  # Color de cada código de celda; el resto, GRIS
+
+# ---------------------------------------------------------------------
+# Vista del mapa
+# ---------------------------------------------------------------------
+
+class VistaMapa:
+    def __init__(self, mapi, ancho_area, alto_area, personaje, objetivo):
+        """
+        Parte visible del mapa en la ventana, con desplazamiento y zoom.
+
+        El terreno se guarda en una superficie de 8 bits con un píxel por celda
+        cuya paleta da el color de cada código, y la parte visible se escala a
+        una superficie en caché que solo se vuelve a generar si cambia el mapa
+        (su versión), el zoom o el desplazamiento. Las casillas exploradas por
+        la búsqueda se pintan sobre esa caché a medida que llegan, y el camino
+        y los sprites encima al dibujar.
+        :param mapi: Mapa a mostrar.
+        :param ancho_area: Ancho en píxeles de la zona del mapa en la ventana.
+        :param alto_area: Alto en píxeles de la zona del mapa en la ventana.
+        :param personaje: Imagen del origen.
+        :param objetivo: Imagen del destino.
+        """
+        self.mapi=mapi
+        self.area=pygame.Rect(MARGEN, MARGEN, ancho_area, alto_area)
+        self.imagenes=(personaje, objetivo)
+        self.fila0=0               # Primera fila y columna visibles
+        self.col0=0
+        self.camino=set()          # (fila, col) de las casillas del camino
+        self.cerrados=set()        # (fila, col) de las casillas exploradas por la última búsqueda
+        self.abiertos=set()
+        self.origen=Casilla(-1,-1)
+        self.destino=Casilla(-1,-1)
+        self.base=None             # Un píxel por celda
+        self.version=None          # Versión del mapa con la que se generó 'base'
+        self.terreno=None          # Parte visible escalada, None si hay que regenerarla
+
+        # Zoom inicial: TAM si el mapa cabe entero, si no el mayor con el que quepa
+        self.zoom=0
+        for i, tam in enumerate(TAMANOS_ZOOM):
+            paso=tam+tam//6
+            if tam<=TAM and mapi.getAncho()*paso<=ancho_area and mapi.getAlto()*paso<=alto_area:
+                self.zoom=i
+        self._fijar_zoom(self.zoom)
+
+    def _fijar_zoom(self, indice):
+        self.zoom=indice
+        self.tam=TAMANOS_ZOOM[indice]
+        self.separacion=self.tam//6   # Borde negro entre celdas (MARGEN con TAM=30)
+        self.paso=self.tam+self.separacion
+        self.sprites=[pygame.transform.scale(imagen, [self.tam, self.tam]) for imagen in self.imagenes]
+        self.terreno=None
+
+    def celdas_visibles(self):
+        """Número de filas y columnas que caben (al menos en parte) en la zona del mapa."""
+        filas=min(self.mapi.getAlto()-self.fila0, -(-self.area.height//self.paso))
+        cols=min(self.mapi.getAncho()-self.col0, -(-self.area.width//self.paso))
+        return filas, cols
+
+    def _limitar(self):
+        self.fila0=max(0, min(self.fila0, self.mapi.getAlto()-self.area.height//self.paso))
+        self.col0=max(0, min(self.col0, self.mapi.getAncho()-self.area.width//self.paso))
+
+    def desplazar(self, dfilas, dcols):
+        """
+        Desplaza la vista un número de celdas.
+        :return: Si la vista ha cambiado.
+        """
+        anterior=(self.fila0, self.col0)
+        self.fila0+=dfilas
+        self.col0+=dcols
+        self._limitar()
+        if (self.fila0, self.col0)==anterior:
+            return False
+        self.terreno=None
+        return True
+
+    def cambiar_zoom(self, delta, pos):
+        """
+        Acerca (delta>0) o aleja (delta<0) la vista manteniendo fija la celda de la posición pos.
+        :return: Si la vista ha cambiado.
+        """
+        indice=max(0, min(len(TAMANOS_ZOOM)-1, self.zoom+delta))
+        if indice==self.zoom:
+            return False
+        x=min(max(pos[0], self.area.left), self.area.right-1)-MARGEN
+        y=min(max(pos[1], self.area.top), self.area.bottom-1)-MARGEN
+        fila=self.fila0+y//self.paso
+        col=self.col0+x//self.paso
+        self._fijar_zoom(indice)
+        self.fila0=fila-y//self.paso
+        self.col0=col-x//self.paso
+        self._limitar()
+        return True
+
+    def celda_en(self, pos):
+        """Casilla bajo una posición de la ventana, o None si no corresponde al mapa."""
+        if not self.area.collidepoint(pos):
+            return None
+        fila=self.fila0+(pos[1]-MARGEN)//self.paso
+        col=self.col0+(pos[0]-MARGEN)//self.paso
+        if fila>=self.mapi.getAlto() or col>=self.mapi.getAncho():
+            return None
+        return Casilla(fila, col)
+
+    def fijar_camino(self, camino):
+        """Guarda las casillas marcadas en la matriz del camino para pintarlas encima del terreno."""
+        self.camino={(fil, col) for fil, filaCamino in enumerate(camino)
+                     for col, valor in enumerate(filaCamino) if valor!='.'}
+
+    def limpiar_exploracion(self):
+        """Borra el camino y la exploración de la búsqueda anterior."""
+        self.camino=set()
+        self.cerrados=set()
+        self.abiertos=set()
+        self.terreno=None
+
+    def explorar(self, screen, cerrados, abiertos):
+        """
+        Añade casillas exploradas por la búsqueda en curso, las pinta en la
+        caché del terreno y vuelve a dibujar en la ventana las que están visibles.
+        :param cerrados: Casillas (fila, col) expandidas.
+        :param abiertos: Casillas (fila, col) añadidas a la frontera.
+        :return: Lista de rectángulos de la ventana modificados.
+        """
+        nuevas=[]
+        for casilla in abiertos:
+            if casilla not in self.cerrados and casilla not in self.abiertos:
+                self.abiertos.add(casilla)
+                nuevas.append(casilla)
+        for casilla in cerrados:
+            if casilla not in self.cerrados:
+                self.abiertos.discard(casilla)
+                self.cerrados.add(casilla)
+                nuevas.append(casilla)
+        if self.pendiente():
+            return []  # Se pintarán al regenerar el terreno
+        rects=[]
+        screen.set_clip(self.area)
+        for fila, col in nuevas:
+            if self._visible(fila, col):
+                rect=self._rect_celda(fila, col)
+                self._pintar_exploracion(fila, col, rect.move(-MARGEN, -MARGEN))
+                screen.blit(self.terreno, rect, rect.move(-MARGEN, -MARGEN))
+                self._pintar_encima(screen, fila, col, rect)
+                rects.append(rect.clip(self.area))
+        screen.set_clip(None)
+        return rects if len(rects)<=MAX_RECTS else [self.area]
+
+    def _pintar_exploracion(self, fila, col, rect):
+        if (fila, col) in self.cerrados:
+            self.terreno.fill(CERRADO, rect)
+        elif (fila, col) in self.abiertos:
+            self.terreno.fill(ABIERTO, rect)
+
+    def pendiente(self):
+        """Indica si hay que regenerar el terreno (y por tanto redibujar toda la vista)."""
+        return self.terreno is None or self.version!=self.mapi.version
+
+    def _generar_terreno(self):
+        mapi=self.mapi
+        if self.version!=mapi.version:
+            self.base=pygame.image.fromstring(bytes(mapi.celdas), (mapi.getAncho(), mapi.getAlto()), "P")
+            self.base.set_palette([COLORES.get(codigo, GRIS) for codigo in range(256)])
+            self.version=mapi.version
+        filas, cols=self.celdas_visibles()
+        visible=self.base.subsurface((self.col0, self.fila0, cols, filas))
+        terreno=pygame.transform.scale(visible, (cols*self.paso, filas*self.paso)).convert()
+        if self.separacion:
+            for i in range(cols):
+                terreno.fill(NEGRO, (i*self.paso+self.tam, 0, self.separacion, filas*self.paso))
+            for i in range(filas):
+                terreno.fill(NEGRO, (0, i*self.paso+self.tam, cols*self.paso, self.separacion))
+        self.terreno=terreno
+        for fila, col in self.abiertos|self.cerrados:
+            if 0<=fila-self.fila0<filas and 0<=col-self.col0<cols:
+                self._pintar_exploracion(fila, col, self._rect_celda(fila, col).move(-MARGEN, -MARGEN))
+
+    def _rect_celda(self, fila, col):
+        return pygame.Rect(MARGEN+(col-self.col0)*self.paso, MARGEN+(fila-self.fila0)*self.paso, self.tam, self.tam)
+
+    def _visible(self, fila, col):
+        filas, cols=self.celdas_visibles()
+        return 0<=fila-self.fila0<filas and 0<=col-self.col0<cols
+
+    def _pintar_encima(self, screen, fila, col, rect):
+        if (fila, col) in self.camino:
+            screen.fill(AMARILLO, rect)
+        if fila==self.origen.getFila() and col==self.origen.getCol():
+            screen.blit(self.sprites[0], rect)
+        if fila==self.destino.getFila() and col==self.destino.getCol():
+            screen.blit(self.sprites[1], rect)
+
+    def dibujar(self, screen):
+        """
+        Dibuja toda la vista: el terreno en caché y encima el camino y los sprites.
+        :return: Rectángulo de la ventana que se ha modificado.
+        """
+        if self.pendiente():
+            self._generar_terreno()
+        screen.set_clip(self.area)
+        screen.fill(NEGRO, self.area)
+        screen.blit(self.terreno, self.area.topleft)
+        filas, cols=self.celdas_visibles()
+        casillas=set(self.camino)
+        casillas.update(((self.origen.getFila(), self.origen.getCol()), (self.destino.getFila(), self.destino.getCol())))
+        for fila, col in casillas:
+            if 0<=fila-self.fila0<filas and 0<=col-self.col0<cols:
+                self._pintar_encima(screen, fila, col, self._rect_celda(fila, col))
+        screen.set_clip(None)
+        return self.area
+
+    def dibujar_celda(self, screen, casilla):
+        """
+        Vuelve a dibujar una sola celda (p. ej. al mover el origen o el destino).
+        :return: Rectángulo de la ventana modificado, o None si la celda no está visible.
+        """
+        fila, col=casilla.getFila(), casilla.getCol()
+        if not self._visible(fila, col):
+            return None
+        rect=self._rect_celda(fila, col)
+        screen.set_clip(self.area)
+        screen.blit(self.terreno, rect, rect.move(-MARGEN, -MARGEN))
+        self._pintar_encima(screen, fila, col, rect)
+        screen.set_clip(None)
+        return rect.clip(self.area)
 
 # ---------------------------------------------------------------------
 # Funciones
 # ---------------------------------------------------------------------
 
 # Devuelve si una casilla del mapa se puede seleccionar como destino o como origen
+# (según la tabla de terrenos del mapa, igual que los algoritmos de búsqueda)
 def bueno(mapi, pos):
-    res= False
-    
-    if mapi.getCelda(pos.getFila(),pos.getCol())==0 or mapi.getCelda(pos.getFila(),pos.getCol())==4 or mapi.getCelda(pos.getFila(),pos.getCol())==5:
-       res=True
-    
-    return res
+    return mapi.transitable(pos.getFila(), pos.getCol())
     
-# Devuelve si una posición de la ventana corresponde al mapa
-def esMapa(mapi, posicion):
-    res=False     
-    
-    if posicion[0] > MARGEN and posicion[0] < mapi.getAncho()*(TAM+MARGEN)+MARGEN and \
-    posicion[1] > MARGEN and posicion[1] < mapi.getAlto()*(TAM+MARGEN)+MARGEN:
-        res= True       
-    
-    return res
-    
-#Devuelve si se ha pulsado algún botón
-def pulsaBoton(mapi, posicion):
+#Vacía la cola sin bloquear y devuelve el último elemento (None si estaba vacía)
+def ultimo_de_cola(cola):
+    ultimo=None
+    while True:
+        try:
+            ultimo=cola.get_nowait()
+        except queue.Empty:
+            return ultimo
+
+#Devuelve si se ha pulsado el botón de cancelar, que ocupa el sitio de los otros dos
+def pulsaCancelar(posicion, anchoVentana, yBotones):
+    return anchoVentana//2-65 < posicion[0] < anchoVentana//2+65 and \
+           yBotones+10 < posicion[1] < yBotones+40
+
+#Devuelve si se ha pulsado algún botón (yBotones es el borde inferior de la zona del mapa)
+def pulsaBoton(posicion, anchoVentana, yBotones):
     res=-1
     
-    if posicion[0] > (mapi.getAncho()*(TAM+MARGEN)+MARGEN)//2-65 and posicion[0] < (mapi.getAncho()*(TAM+MARGEN)+MARGEN)//2-15 and \
-       posicion[1] > mapi.getAlto()*(TAM+MARGEN)+MARGEN+10 and posicion[1] < MARGEN_INFERIOR+mapi.getAlto()*(TAM+MARGEN)+MARGEN:
+    if posicion[0] > anchoVentana//2-65 and posicion[0] < anchoVentana//2-15 and \
+       posicion[1] > yBotones+10 and posicion[1] < MARGEN_INFERIOR+yBotones:
         res=1
-    elif posicion[0] > (mapi.getAncho()*(TAM+MARGEN)+MARGEN)//2+15 and posicion[0] < (mapi.getAncho()*(TAM+MARGEN)+MARGEN)//2+65 and \
-       posicion[1] > mapi.getAlto()*(TAM+MARGEN)+MARGEN+10 and posicion[1] < MARGEN_INFERIOR+mapi.getAlto()*(TAM+MARGEN)+MARGEN:
+    elif posicion[0] > anchoVentana//2+15 and posicion[0] < anchoVentana//2+65 and \
+       posicion[1] > yBotones+10 and posicion[1] < MARGEN_INFERIOR+yBotones:
         res=2
 
     
     return res
    
+# Dibuja los botones (o el de cancelar si hay una búsqueda en curso) y el coste y las calorías bajo el mapa
+def dibujaPanel(screen, panel, boton1, boton2, textos, cancelar=None):
+    screen.fill(NEGRO, panel)
+    if cancelar is not None:
+        rect=pygame.Rect(panel.centerx-65, panel.top+10, 130, 30)
+        screen.fill(ROJO, rect)
+        screen.blit(cancelar, cancelar.get_rect(center=rect.center))
+    else:
+        screen.blit(boton1, [panel.centerx-65, panel.top+10])
+        screen.blit(boton2, [panel.centerx+15, panel.top+10])
+    if textos is not None:
+        textoCoste, textoEnergia=textos
+        screen.blit(textoCoste, [panel.right-90, panel.top+15])
+        screen.blit(textoEnergia, [5, panel.top+15])
+    return panel
+
 # Construye la matriz para guardar el camino
 def inic(mapi):    
     cam=[]
@@ -79,13 +339,15 @@ def main():
         file=sys.argv[-1]
          
     mapi=Mapa(file)     
-    camino=inic(mapi)
     
-    anchoVentana=mapi.getAncho()*(TAM+MARGEN)+MARGEN
-    altoVentana= MARGEN_INFERIOR+mapi.getAlto()*(TAM+MARGEN)+MARGEN    
+    anchoArea=min(mapi.getAncho()*(TAM+MARGEN), ANCHO_MAX)
+    altoArea=min(mapi.getAlto()*(TAM+MARGEN), ALTO_MAX)
+    anchoVentana=anchoArea+MARGEN
+    altoVentana= MARGEN_INFERIOR+altoArea+MARGEN    
     dimension=[anchoVentana,altoVentana]
     screen=pygame.display.set_mode(dimension)
     pygame.display.set_caption("Practica 1")
+    pygame.key.set_repeat(250, 40)  # Mantener una flecha pulsada sigue desplazando
     
     boton1=pygame.image.load("boton1.png").convert()
     boton1=pygame.transform.scale(boton1,[50, 30])
@@ -94,98 +356,152 @@ def main():
     boton2=pygame.transform.scale(boton2,[50, 30])
     
     personaje=pygame.image.load("rabbit.png").convert()
-    personaje=pygame.transform.scale(personaje,[TAM, TAM])
-    
     objetivo=pygame.image.load("carrot.png").convert()
-    objetivo=pygame.transform.scale(objetivo,[TAM, TAM])
+    vista=VistaMapa(mapi, anchoArea, altoArea, personaje, objetivo)
+    panel=pygame.Rect(0, vista.area.bottom, anchoVentana, MARGEN_INFERIOR)
+    fuente= pygame.font.Font(None, 25)
+    textoCancelar=fuente.render("Cancelar", True, AMARILLO)
     
+    # Traza completa de cada iteración por consola, como pide la práctica, en los
+    # mapas de su tamaño; en los grandes la exploración ya se ve en la ventana
+    if mapi.getAlto()*mapi.getAncho()<=MAX_CELDAS_TRAZA:
+        traza=TrazaConsola(TRAZA_ITERACION, listas_completas=True)
+    else:
+        traza=TrazaConsola(TRAZA_RESUMEN)
+    # Resultados de consultas repetidas sobre el mismo mapa
+    cache=CacheCaminos()
+
     coste=-1
     cal=0
+    textos=None          # Superficies con el coste y las calorías, se renderizan solo al cambiar
+    busqueda=None        # BusquedaSegundoPlano en curso
+    mejoras=queue.Queue() # Soluciones (coste, cal, cota) que va encontrando ARA* en su hilo
     running= True    
     origen=Casilla(-1,-1)
     destino=Casilla(-1,-1)
+    redibujar=True       # Hay que dibujar la ventana entera
+    celdasSucias=[]      # Casillas que hay que volver a dibujar
     
     while running:        
+        lanzar=-1            # Búsqueda pedida en este fotograma: 1 A*, 2 A* Subε, 3 ARA*
         #procesamiento de eventos
         for event in pygame.event.get():
             if event.type==pygame.QUIT:               
                 running=False 
-            if event.type==pygame.MOUSEBUTTONDOWN:
-                pos=pygame.mouse.get_pos()      
-                if pulsaBoton(mapi, pos)==1 or pulsaBoton(mapi, pos)==2:
-                    if origen.getFila()==-1 or destino.getFila()==-1:
-                        print('Error: No hay origen o destino')
-                    else:
-                        camino=inic(mapi)
-                        if pulsaBoton(mapi, pos)==1:
-                            ###########################
-                            tipo_heuristica = seleccionar_heuristica()
-                            coste, cal= a_estrella(camino,origen, destino, mapi.getVecinos, mapi.costo_movimiento,tipo_heuristica,mapi)           
-                            if coste==-1:
-                                print('Error: No existe un camino válido entre origen y destino')
-                        else:
-                            ###########################                                                   
-                            #coste, cal=llamar a A estrella subepsilon
-                            epsilon = 0.5  # Puedes definir el valor de epsilon según el escenario
-                            tipo_heuristica = manhattan_heuristica
-                            coste, cal = a_estrella_subepsilon(camino, origen, destino,mapi.getVecinos, mapi.costo_movimiento,tipo_heuristica, epsilon,mapi)
-                            if coste==-1:
-                                print('Error: No existe un camino válido entre origen y destino')
-                            
-                elif esMapa(mapi,pos):                    
-                    if event.button==1: #botón izquierdo                        
-                        colOrigen=pos[0]//(TAM+MARGEN)
-                        filOrigen=pos[1]//(TAM+MARGEN)
-                        casO=Casilla(filOrigen, colOrigen)                        
-                        if bueno(mapi, casO):
-                            origen=casO
-                        else: # se ha hecho click en una celda no accesible
+            elif event.type==pygame.MOUSEWHEEL:
+                redibujar|=vista.cambiar_zoom(1 if event.y>0 else -1, pygame.mouse.get_pos())
+            elif event.type==pygame.KEYDOWN:
+                if event.key==pygame.K_UP:
+                    redibujar|=vista.desplazar(-1, 0)
+                elif event.key==pygame.K_DOWN:
+                    redibujar|=vista.desplazar(1, 0)
+                elif event.key==pygame.K_LEFT:
+                    redibujar|=vista.desplazar(0, -1)
+                elif event.key==pygame.K_RIGHT:
+                    redibujar|=vista.desplazar(0, 1)
+                elif event.key in (pygame.K_PLUS, pygame.K_EQUALS, pygame.K_KP_PLUS):
+                    redibujar|=vista.cambiar_zoom(1, vista.area.center)
+                elif event.key in (pygame.K_MINUS, pygame.K_KP_MINUS):
+                    redibujar|=vista.cambiar_zoom(-1, vista.area.center)
+                elif event.key==pygame.K_ESCAPE and busqueda is not None:
+                    busqueda.cancelar()
+                elif event.key==pygame.K_a and busqueda is None:
+                    lanzar=3
+            elif event.type==pygame.MOUSEBUTTONDOWN and event.button in (1, 3):
+                pos=event.pos
+                boton=pulsaBoton(pos, anchoVentana, vista.area.bottom)
+                if busqueda is not None and pulsaCancelar(pos, anchoVentana, vista.area.bottom):
+                    busqueda.cancelar()
+                elif busqueda is None and (boton==1 or boton==2):
+                    lanzar=boton
+                else:
+                    casilla=vista.celda_en(pos)
+                    if casilla is not None:
+                        if not bueno(mapi, casilla): # se ha hecho click en una celda no accesible
                             print('Error: Esa casilla no es válida')
-                    elif event.button==3: #botón derecho
-                        colDestino=pos[0]//(TAM+MARGEN)
-                        filDestino=pos[1]//(TAM+MARGEN)
-                        casD=Casilla(filDestino, colDestino)                        
-                        if bueno(mapi, casD):
-                            destino=casD
-                        else: # se ha hecho click en una celda no accesible
-                            print('Error: Esa casilla no es válida')         
+                        elif event.button==1: #botón izquierdo                        
+                            celdasSucias+=[origen, casilla]
+                            origen=casilla
+                            vista.origen=origen
+                        else: #botón derecho
+                            celdasSucias+=[destino, casilla]
+                            destino=casilla
+                            vista.destino=destino
         
-        #código de dibujo        
-        #limpiar pantalla
-        screen.fill(NEGRO)
-        #pinta mapa
-        for fil in range(mapi.getAlto()):
-            for col in range(mapi.getAncho()):                
-                if camino[fil][col]!='.':
-                    pygame.draw.rect(screen, AMARILLO, [(TAM+MARGEN)*col+MARGEN, (TAM+MARGEN)*fil+MARGEN, TAM, TAM], 0)
-                elif mapi.getCelda(fil,col)==0:
-                    pygame.draw.rect(screen, HIERBA, [(TAM+MARGEN)*col+MARGEN, (TAM+MARGEN)*fil+MARGEN, TAM, TAM], 0)
-                elif mapi.getCelda(fil,col)==4:
-                    pygame.draw.rect(screen, AGUA, [(TAM+MARGEN)*col+MARGEN, (TAM+MARGEN)*fil+MARGEN, TAM, TAM], 0)
-                elif mapi.getCelda(fil,col)==5:
-                    pygame.draw.rect(screen, ROCA, [(TAM+MARGEN)*col+MARGEN, (TAM+MARGEN)*fil+MARGEN, TAM, TAM], 0)                                    
-                elif mapi.getCelda(fil,col)==1:
-                    pygame.draw.rect(screen, MURO, [(TAM+MARGEN)*col+MARGEN, (TAM+MARGEN)*fil+MARGEN, TAM, TAM], 0)
-                    
-        #pinta origen
-        screen.blit(personaje, [(TAM+MARGEN)*origen.getCol()+MARGEN, (TAM+MARGEN)*origen.getFila()+MARGEN])        
-        #pinta destino
-        screen.blit(objetivo, [(TAM+MARGEN)*destino.getCol()+MARGEN, (TAM+MARGEN)*destino.getFila()+MARGEN])       
-        #pinta botón
-        screen.blit(boton1, [anchoVentana//2-65, mapi.getAlto()*(TAM+MARGEN)+MARGEN+10])
-        screen.blit(boton2, [anchoVentana//2+15, mapi.getAlto()*(TAM+MARGEN)+MARGEN+10])
-        #pinta coste y energía
-        if coste!=-1:            
-            fuente= pygame.font.Font(None, 25)
-            textoCoste=fuente.render("Coste: "+str(coste), True, AMARILLO)            
-            screen.blit(textoCoste, [anchoVentana-90, mapi.getAlto()*(TAM+MARGEN)+MARGEN+15])
-            textoEnergía=fuente.render("Cal: "+str(cal), True, AMARILLO)
-            screen.blit(textoEnergía, [5, mapi.getAlto()*(TAM+MARGEN)+MARGEN+15])
+        if lanzar!=-1:
+            if origen.getFila()==-1 or destino.getFila()==-1:
+                print('Error: No hay origen o destino')
+            else:
+                # La búsqueda se hace en otro hilo; el resultado se recoge más abajo al terminar
+                camino=inic(mapi)
+                if lanzar==1:
+                    ###########################
+                    tipo_heuristica = seleccionar_heuristica(mapi, file+'.alt')
+                    buscar=partial(a_estrella, camino, origen, destino, mapi.getVecinos, mapi.costo_movimiento, tipo_heuristica, mapi, cache=cache)
+                elif lanzar==2:
+                    ###########################                                                   
+                    #coste, cal=llamar a A estrella subepsilon
+                    epsilon = 0.5  # Puedes definir el valor de epsilon según el escenario
+                    tipo_heuristica = manhattan_heuristica
+                    buscar=partial(a_estrella_subepsilon, camino, origen, destino, mapi.getVecinos, mapi.costo_movimiento, tipo_heuristica, epsilon, mapi, cache=cache)
+                else:
+                    # ARA*: primer camino rápido y mejoras hasta agotar el presupuesto o llegar al óptimo
+                    ultimo_de_cola(mejoras)  # Descarta las que dejara la búsqueda anterior
+                    buscar=partial(ara_estrella, camino, origen, destino, mapi.getVecinos, mapi.costo_movimiento, octil_heuristica, mapi,
+                                   tiempo_max=PRESUPUESTO_ARA, al_mejorar=lambda coste, cal, cota: mejoras.put((coste, cal, cota)))
+                busqueda=BusquedaSegundoPlano(buscar, traza).iniciar()
+                vista.limpiar_exploracion()
+                textos=None
+                redibujar=True
+
+        #exploración y resultado de la búsqueda en curso
+        sucios=[]
+        # Última solución de ARA*: se muestra su coste mientras sigue mejorando
+        ultima=ultimo_de_cola(mejoras)
+        if ultima is not None:
+            coste, cal, cota=ultima
+            textos=(fuente.render("Coste: "+str(coste), True, AMARILLO),
+                    fuente.render("Cal: "+str(cal)+" (x"+format(cota, ".2f")+")", True, AMARILLO))
+            sucios.append(dibujaPanel(screen, panel, boton1, boton2, textos, textoCancelar if busqueda is not None else None))
+        if busqueda is not None:
+            terminada=busqueda.terminada()  # Antes de tomar la exploración, para no perder la última
+            sucios+=vista.explorar(screen, *busqueda.tomar_exploracion())
+            if terminada:
+                resultado=busqueda.resultado()
+                busqueda=None
+                redibujar=True
+                if resultado is None:
+                    print('Búsqueda cancelada')
+                else:
+                    coste, cal=resultado
+                    vista.fijar_camino(camino)
+                    if coste==-1:
+                        print('Error: No existe un camino válido entre origen y destino')
+                    else:
+                        textos=(fuente.render("Coste: "+str(coste), True, AMARILLO),
+                                fuente.render("Cal: "+str(cal), True, AMARILLO))
+
+        #código de dibujo: solo se actualiza lo que ha cambiado
+        if redibujar or vista.pendiente():
+            screen.fill(NEGRO)
+            vista.dibujar(screen)
+            dibujaPanel(screen, panel, boton1, boton2, textos, textoCancelar if busqueda is not None else None)
+            sucios=[screen.get_rect()]
+        else:
+            for casilla in celdasSucias:
+                rect=vista.dibujar_celda(screen, casilla)
+                if rect is not None:
+                    sucios.append(rect)
+        redibujar=False
+        celdasSucias=[]
             
         #actualizar pantalla
-        pygame.display.flip()
+        if sucios:
+            pygame.display.update(sucios)
         reloj.tick(40)
         
+    if busqueda is not None:
+        busqueda.cancelar()
     pygame.quit()
     
 #---------------------------------------------------------------------
@@ -1,24 +1,339 @@
+import itertools
+import weakref
+from array import array
+from collections import deque
 from casilla import Casilla
+from terreno import TERRENOS_POR_DEFECTO
+import formato_binario
+
+# Movimientos posibles (vertical, horizontal y diagonal), en el orden en que se devuelven los vecinos
+MOVIMIENTOS = [(-1, 0), (1, 0), (0, -1), (0, 1),
+               (-1, -1), (-1, 1), (1, -1), (1, 1)]
+GRADO_MAXIMO = len(MOVIMIENTOS)
+
+# Identificadores únicos de mapa, para distinguir mapas en las cachés
+_contador_mapas = itertools.count()
+
+# Arrays por celda que se construyen la primera vez que se usan
+_ARRAYS_TERRENO = ("transitables", "coste_celda", "calorias_celda")
+_CONSTRUIDOS_AL_USAR = _ARRAYS_TERRENO + ("componentes",)
+
+class Adyacencia:
+    def __init__(self, num_celdas):
+        """
+        Tabla de vecinos precalculada al estilo CSR.
+
+        Las aristas de la celda con id i ocupan las posiciones
+        [i*GRADO_MAXIMO, i*GRADO_MAXIMO + grado[i]) de 'vecinos' y 'costes'.
+        El desplazamiento de cada fila es fijo, así que una fila se puede
+        rehacer sin mover las demás. Para recorrer los vecinos de una celda
+        basta un bucle sobre ese rango de índices, sin crear listas ni casillas.
+
+        :param num_celdas: Número total de celdas (alto*ancho).
+        """
+        self.grado = bytearray(num_celdas)                                # Vecinos válidos de cada celda
+        self.vecinos = array('l', [0]) * (num_celdas * GRADO_MAXIMO)     # Ids de las celdas vecinas
+        self.costes = [0] * (num_celdas * GRADO_MAXIMO)                   # Coste de cada arista (1 o 1.5)
+
+    def fijar_fila(self, id_celda, aristas):
+        """
+        Sustituye las aristas de una celda.
+        :param id_celda: Id de la celda.
+        :param aristas: Iterable de pares (id_vecino, coste).
+        """
+        k = base = id_celda * GRADO_MAXIMO
+        for vecino, coste in aristas:
+            if k - base == GRADO_MAXIMO:
+                raise ValueError(f"La celda {id_celda} tiene más de {GRADO_MAXIMO} vecinos")
+            self.vecinos[k] = vecino
+            self.costes[k] = coste
+            k += 1
+        self.grado[id_celda] = k - base
+
+class Componentes:
+    def __init__(self, transitables, alto, ancho):
+        """
+        Etiquetado de las componentes conexas de las celdas transitables, con
+        los mismos movimientos que la tabla de vecinos (diagonales incluidas).
+
+        'etiquetas' guarda una etiqueta por celda (0 si no es transitable). Al
+        unir dos regiones no se reescriben sus celdas: las etiquetas se enlazan
+        con union-find en 'padre' y la etiqueta de una celda es la raíz de la
+        suya. Al partir una región se vuelven a etiquetar solo los trozos que
+        se separan.
+
+        :param transitables: bytearray de celdas transitables del mapa (se
+                             comparte, así que debe estar ya actualizado
+                             cuando se llama a celda_cambiada).
+        :param alto: Número de filas.
+        :param ancho: Número de columnas.
+        """
+        self.transitables = transitables
+        self.alto = alto
+        self.ancho = ancho
+        self.etiquetas = array('i', [0]) * (alto * ancho)
+        self.padre = [0]  # padre[etiqueta]; la etiqueta 0 es la de las celdas no transitables
+        for id_celda in range(alto * ancho):
+            if transitables[id_celda] and not self.etiquetas[id_celda]:
+                self._rellenar(id_celda, self._nueva_etiqueta())
+
+    def _nueva_etiqueta(self):
+        self.padre.append(len(self.padre))
+        return len(self.padre) - 1
+
+    def _vecinas(self, id_celda):
+        """Ids de las celdas transitables vecinas."""
+        fila, col = divmod(id_celda, self.ancho)
+        transitables = self.transitables
+        vecinas = []
+        for df, dc in MOVIMIENTOS:
+            if 0 <= fila + df < self.alto and 0 <= col + dc < self.ancho:
+                vecina = id_celda + df * self.ancho + dc
+                if transitables[vecina]:
+                    vecinas.append(vecina)
+        return vecinas
+
+    def _rellenar(self, id_celda, etiqueta):
+        """Pone la etiqueta a toda la región de id_celda que aún no la tiene."""
+        etiquetas = self.etiquetas
+        transitables = self.transitables
+        alto, ancho = self.alto, self.ancho
+        desplazamientos = [(df, dc, df * ancho + dc) for df, dc in MOVIMIENTOS]
+        etiquetas[id_celda] = etiqueta
+        pila = [id_celda]
+        while pila:
+            actual = pila.pop()
+            fila, col = divmod(actual, ancho)
+            for df, dc, d in desplazamientos:
+                vecina = actual + d
+                if 0 <= fila + df < alto and 0 <= col + dc < ancho and transitables[vecina] \
+                        and etiquetas[vecina] != etiqueta:
+                    etiquetas[vecina] = etiqueta
+                    pila.append(vecina)
+
+    def raiz(self, etiqueta):
+        padre = self.padre
+        while padre[etiqueta] != etiqueta:
+            padre[etiqueta] = padre[padre[etiqueta]]
+            etiqueta = padre[etiqueta]
+        return etiqueta
+
+    def etiqueta(self, id_celda):
+        """Etiqueta de la componente de la celda (0 si no es transitable)."""
+        return self.raiz(self.etiquetas[id_celda])
+
+    def conectadas(self, id1, id2):
+        """Indica si hay un camino entre las dos celdas (ambas transitables)."""
+        e1 = self.etiquetas[id1]
+        e2 = self.etiquetas[id2]
+        return e1 != 0 and e2 != 0 and (e1 == e2 or self.raiz(e1) == self.raiz(e2))
+
+    def celda_cambiada(self, id_celda, era_transitable):
+        """
+        Actualiza las etiquetas después de que la celda cambie de terreno.
+        :param era_transitable: Si la celda era transitable antes del cambio.
+        """
+        ahora = bool(self.transitables[id_celda])
+        if ahora == bool(era_transitable):
+            return
+        vecinas = self._vecinas(id_celda)
+        if ahora:
+            # Se abre un paso: la celda une las regiones de sus vecinas
+            raices = sorted({self.raiz(self.etiquetas[v]) for v in vecinas})
+            if not raices:
+                self.etiquetas[id_celda] = self._nueva_etiqueta()
+                return
+            for otra in raices[1:]:
+                self.padre[otra] = raices[0]
+            self.etiquetas[id_celda] = raices[0]
+        else:
+            self.etiquetas[id_celda] = 0
+            self._separar(vecinas)
+
+    def _separar(self, vecinas):
+        """
+        Comprueba si al cerrarse una celda su región se ha partido y etiqueta
+        de nuevo los trozos separados.
+
+        Las vecinas que se tocan entre sí siguen unidas sin pasar por la celda,
+        así que solo hace falta buscar desde un representante de cada grupo de
+        vecinas contiguas. Las búsquedas avanzan por turnos; cuando dos se
+        encuentran se fusionan, y la que se agota sin encontrar a ninguna otra
+        es un trozo separado. Así el coste es el del trozo más pequeño cuando
+        hay corte, aunque sin corte puede recorrer la región entera.
+        """
+        grupos = []
+        for v in vecinas:
+            unidos = [g for g in grupos if any(abs(v // self.ancho - w // self.ancho) <= 1 and
+                                                abs(v % self.ancho - w % self.ancho) <= 1 for w in g)]
+            nuevo = [v]
+            for g in unidos:
+                nuevo.extend(g)
+                grupos.remove(g)
+            grupos.append(nuevo)
+        if len(grupos) <= 1:
+            return
+
+        representantes = [g[0] for g in grupos]
+        grupo_de = {v: i for i, v in enumerate(representantes)}   # Celda visitada -> búsqueda que la visitó
+        fusion = list(range(len(representantes)))                  # union-find entre búsquedas
+        colas = [deque([v]) for v in representantes]
+        visitadas = [[v] for v in representantes]
+        activas = set(range(len(representantes)))
+        separadas = []
+
+        def buscar_raiz(i):
+            while fusion[i] != i:
+                i = fusion[i]
+            return i
+
+        while len(activas) > 1:
+            for i in list(activas):
+                if i not in activas:
+                    continue
+                if not colas[i]:
+                    activas.discard(i)   # Agotada sin encontrar a otra: es un trozo separado
+                    separadas.append(i)
+                    continue
+                for vecina in self._vecinas(colas[i].popleft()):
+                    j = grupo_de.get(vecina)
+                    if j is None:
+                        grupo_de[vecina] = i
+                        colas[i].append(vecina)
+                        visitadas[i].append(vecina)
+                        continue
+                    j = buscar_raiz(j)
+                    if j != i:
+                        # Las dos búsquedas están en la misma región: se fusionan en i
+                        fusion[j] = i
+                        colas[i].extend(colas[j])
+                        visitadas[i].extend(visitadas[j])
+                        colas[j] = visitadas[j] = None
+                        activas.discard(j)
+        # La búsqueda que queda conserva la etiqueta antigua
+        for i in separadas:
+            etiqueta = self._nueva_etiqueta()
+            for id_celda in visitadas[i]:
+                self.etiquetas[id_celda] = etiqueta
 
 class Mapa:
-    def __init__(self, archivo):        
-        self.mapa = leer(archivo)         
-        self.alto = len(self.mapa)
-        self.ancho = len(self.mapa[0])
+    def __init__(self, archivo=None, matriz=None, terrenos=None):
+        """
+        Crea el mapa leyéndolo de un fichero (de texto o binario, ver
+        formato_binario) o a partir de una matriz.
+
+        Las celdas se guardan en un bytearray plano, fila a fila, de modo que la
+        celda (fila, col) ocupa la posición fila*ancho+col. Ese índice es el id
+        entero con el que trabajan internamente los algoritmos de búsqueda. Con
+        un fichero binario la rejilla es una proyección mmap del fichero y no se
+        lee hasta que se usa.
+
+        A partir de la tabla de terrenos se precalculan tres arrays por celda
+        (transitable, multiplicador de coste y calorías), así que consultar el
+        terreno de una celda es un único acceso por índice. Cada array se
+        construye la primera vez que se usa, para que abrir un mapa grande sea
+        inmediato.
+
+        :param archivo: Ruta del fichero con el mapa.
+        :param matriz: Lista de filas con los códigos de cada celda (0, 1, 4, 5).
+        :param terrenos: TablaTerrenos; por defecto la del fichero binario o TERRENOS_POR_DEFECTO.
+        """
+        self.terrenos = terrenos if terrenos is not None else TERRENOS_POR_DEFECTO
+        self.archivo_binario = None  # Fichero proyectado en memoria, si lo hay
+        if matriz is None and formato_binario.es_binario(archivo):
+            self.alto, self.ancho, terrenos_fichero, self.celdas = formato_binario.abrir(archivo)
+            if terrenos is None:
+                self.terrenos = terrenos_fichero
+            self.archivo_binario = archivo
+        else:
+            if matriz is None:
+                matriz = leer(archivo, self.terrenos)
+            self.alto = len(matriz)
+            self.ancho = len(matriz[0])
+            self.celdas = bytearray(b"".join(bytes(fila) for fila in matriz))
+        self._precalcular_terreno()
+        self.adyacencia = None  # Tabla de vecinos, se construye con preparar_adyacencia
+        self.uid = next(_contador_mapas)  # Identificador único del mapa
+        self.version = 0                  # Se incrementa con cada cambio de celda
+        self.observadores = weakref.WeakSet()  # Objetos avisados en cada setCelda
+        # Estructuras calculadas a partir del mapa por otros módulos (campos de
+        # distancias, grafos jerárquicos, landmarks), por nombre. Se guardan en el
+        # propio mapa y no en diccionarios de módulo para que se liberen con él
+        self.derivados = {}
+
+    def __getstate__(self):
+        """
+        Al serializar (p. ej. para otro proceso) no se copian la tabla de vecinos
+        ni los arrays por celda ni los derivados: se reconstruyen allí. Un mapa binario sin cambios
+        tampoco copia la rejilla, el otro proceso vuelve a proyectar el fichero.
+        """
+        estado = self.__dict__.copy()
+        estado["adyacencia"] = None
+        estado["observadores"] = None
+        estado["derivados"] = {}
+        for nombre in _CONSTRUIDOS_AL_USAR:
+            estado.pop(nombre, None)
+        if self.archivo_binario is not None:
+            if self.version == 0:
+                estado["celdas"] = None
+            else:
+                estado["celdas"] = bytearray(self.celdas)
+                estado["archivo_binario"] = None
+        return estado
+
+    def __setstate__(self, estado):
+        self.__dict__.update(estado)
+        self.observadores = weakref.WeakSet()
+        if self.celdas is None:
+            self.celdas = formato_binario.abrir(self.archivo_binario)[3]
+
+    def __getattr__(self, nombre):
+        # Solo se llama cuando el atributo no existe: construye los arrays por celda en su primer uso
+        if nombre in _CONSTRUIDOS_AL_USAR and "celdas" in self.__dict__:
+            valor = getattr(self, "_construir_" + nombre)()
+            setattr(self, nombre, valor)
+            return valor
+        raise AttributeError(nombre)
+
+    def _precalcular_terreno(self):
+        """Prepara las tablas por código de terreno con las que se construyen los arrays por celda."""
+        terrenos = self.terrenos
+        self._transitable_codigo = bytes(terrenos.transitable(codigo) for codigo in range(256))
+        self._coste_codigo = [terrenos.coste(codigo) for codigo in range(256)]
+        self._calorias_codigo = [terrenos.calorias(codigo) for codigo in range(256)]
+        self.uniforme = terrenos.coste_uniforme()  # Todos los pasos cuestan 1 o 1.5
+
+    def _celdas_bytes(self):
+        # translate solo existe en bytes/bytearray; la rejilla de un mapa binario es un memoryview
+        return self.celdas if isinstance(self.celdas, bytearray) else bytes(self.celdas)
+
+    def _construir_transitables(self):
+        return bytearray(self._celdas_bytes().translate(self._transitable_codigo))
+
+    def _construir_coste_celda(self):
+        return array('d', map(self._coste_codigo.__getitem__, self.celdas))
+
+    def _construir_componentes(self):
+        return Componentes(self.transitables, self.alto, self.ancho)
+
+    def _construir_calorias_celda(self):
+        if all(0 <= cal <= 255 for cal in self._calorias_codigo):
+            return bytearray(self._celdas_bytes().translate(bytes(self._calorias_codigo)))
+        return array('l', map(self._calorias_codigo.__getitem__, self.celdas))
 
     def __str__(self):
         salida = ""
         for f in range(self.alto):
             for c in range(self.ancho):
-                if self.mapa[f][c] == 0:
+                if self.getCelda(f, c) == 0:
                     salida += "  "
-                if self.mapa[f][c] == 1:
+                if self.getCelda(f, c) == 1:
                     salida += "# "
-                if self.mapa[f][c] == 3:
+                if self.getCelda(f, c) == 3:
                     salida += "D "
-                if self.mapa[f][c] == 4:
+                if self.getCelda(f, c) == 4:
                     salida += "~ "
-                if self.mapa[f][c] == 5:
+                if self.getCelda(f, c) == 5:
                     salida += "* "
             salida += "\n"
         return salida
@@ -30,10 +345,61 @@ class Mapa:
         return self.ancho
 
     def getCelda(self, y, x):
-        return self.mapa[y][x]
+        return self.celdas[y * self.ancho + x]
 
     def setCelda(self, y, x, valor):
-        self.mapa[y][x] = valor
+        id_celda = y * self.ancho + x
+        era_transitable = self._transitable_codigo[self.celdas[id_celda]]
+        self.celdas[id_celda] = valor
+        # Solo se actualizan los arrays por celda que ya se han construido
+        for nombre, por_codigo in (("transitables", self._transitable_codigo), ("coste_celda", self._coste_codigo),
+                                   ("calorias_celda", self._calorias_codigo)):
+            if nombre in self.__dict__:
+                self.__dict__[nombre][id_celda] = por_codigo[valor]
+        if "componentes" in self.__dict__:
+            self.componentes.celda_cambiada(id_celda, era_transitable)
+        self.version += 1
+        if self.adyacencia is not None:
+            # Solo cambian las aristas de la celda y de sus vecinas
+            self.adyacencia.fijar_fila(y * self.ancho + x, self._aristas(y * self.ancho + x))
+            for df, dc in MOVIMIENTOS:
+                if 0 <= y + df < self.alto and 0 <= x + dc < self.ancho:
+                    id_vecina = (y + df) * self.ancho + x + dc
+                    self.adyacencia.fijar_fila(id_vecina, self._aristas(id_vecina))
+        for observador in list(self.observadores):
+            observador.celda_cambiada(y, x)
+
+    def agregar_observador(self, observador):
+        """
+        Registra un objeto con un método celda_cambiada(fila, col) al que se
+        llama después de cada setCelda. Solo se guarda una referencia débil,
+        así que el observador deja de recibir avisos cuando se libera.
+        """
+        self.observadores.add(observador)
+
+    def transitable(self, fila, col):
+        """Indica si (fila, col) está dentro del mapa y se puede pisar."""
+        return 0 <= fila < self.alto and 0 <= col < self.ancho and self.transitables[fila * self.ancho + col] == 1
+
+    def transitable_id(self, id_celda):
+        """Versión de transitable para ids de celdas (que siempre están dentro del mapa)."""
+        return self.transitables[id_celda] == 1
+
+    def conectadas(self, id1, id2):
+        """
+        Indica en O(1) si hay camino entre dos celdas con los movimientos del
+        mapa (ver Componentes). El etiquetado se hace en la primera consulta.
+        """
+        return self.componentes.conectadas(id1, id2)
+
+    def id_casilla(self, casilla):
+        """Devuelve el id entero (fila*ancho+col) de una casilla."""
+        return casilla.getFila() * self.ancho + casilla.getCol()
+
+    def casilla_de_id(self, id_celda):
+        """Devuelve la Casilla correspondiente a un id entero."""
+        fila, col = divmod(id_celda, self.ancho)
+        return Casilla(fila, col)
 
     def getVecinos(self, casilla):
         """
@@ -41,73 +407,132 @@ class Mapa:
         :param casilla: Instancia de la clase Casilla.
         :return: Lista de casillas vecinas accesibles.
         """
-        vecinos = []
-        filas = self.getAlto()
-        columnas = self.getAncho()
-        fila, col = casilla.getFila(), casilla.getCol()
+        return [self.casilla_de_id(v) for v in self.getVecinosId(self.id_casilla(casilla))]
+
+    def getVecinosId(self, id_celda):
+        """
+        Versión de getVecinos que trabaja con ids enteros y no crea casillas.
+        :param id_celda: Id de la celda (fila*ancho+col).
+        :return: Lista de ids de las celdas vecinas accesibles.
+        """
+        if self.adyacencia is not None:
+            base = id_celda * GRADO_MAXIMO
+            return list(self.adyacencia.vecinos[base:base + self.adyacencia.grado[id_celda]])
+        return [vecino for vecino, _ in self._aristas(id_celda)]
 
-        # Movimientos posibles (vertical, horizontal y diagonal)
-        movimientos = [(-1, 0), (1, 0), (0, -1), (0, 1),
-                       (-1, -1), (-1, 1), (1, -1), (1, 1)]
+    def _aristas(self, id_celda):
+        """Calcula las aristas (id_vecino, coste) de una celda a partir de la rejilla."""
+        aristas = []
+        transitables = self.transitables
+        ancho = self.ancho
+        fila, col = divmod(id_celda, ancho)
 
         # Comprobar cada posible movimiento
-        for movimiento in movimientos:
-            nueva_fila = fila + movimiento[0]
-            nueva_col = col + movimiento[1]
-            
+        for df, dc in MOVIMIENTOS:
+            nueva_fila = fila + df
+            nueva_col = col + dc
+
             # Comprobar que esté dentro de los límites del mapa
-            if 0 <= nueva_fila < filas and 0 <= nueva_col < columnas:
-                if self.getCelda(nueva_fila, nueva_col) != 1:  # Suponiendo que '1' es intransitable
-                    vecinos.append(Casilla(nueva_fila, nueva_col))
+            if 0 <= nueva_fila < self.alto and 0 <= nueva_col < ancho:
+                vecino = nueva_fila * ancho + nueva_col
+                if transitables[vecino]:
+                    aristas.append((vecino, self._coste_paso(id_celda, vecino, df == 0 or dc == 0)))
+
+        return aristas
+
+    def preparar_adyacencia(self):
+        """
+        Construye (una sola vez) la tabla de vecinos y costes de todo el mapa.
+        A partir de entonces setCelda la mantiene actualizada.
+        :return: Objeto Adyacencia.
+        """
+        if self.adyacencia is None:
+            adyacencia = Adyacencia(self.alto * self.ancho)
+            for id_celda in range(self.alto * self.ancho):
+                adyacencia.fijar_fila(id_celda, self._aristas(id_celda))
+            self.adyacencia = adyacencia
+        return self.adyacencia
 
-        return vecinos
+    def _coste_paso(self, id1, id2, recto):
+        """
+        Coste del paso entre dos celdas vecinas: 1 recto o 1.5 diagonal,
+        multiplicado por la media de los multiplicadores de ambas celdas.
+        """
+        paso = 1 if recto else 1.5
+        if self.uniforme:
+            return paso
+        multiplicador = (self.coste_celda[id1] + self.coste_celda[id2]) / 2
+        return paso if multiplicador == 1 else paso * multiplicador
 
     def costo_movimiento(self,casilla1, casilla2):
-        # Movimientos horizontales o verticales (costo 1)
-        if casilla1.getFila() == casilla2.getFila() or casilla1.getCol() == casilla2.getCol():
-            return 1
-        # Movimientos diagonales (costo 1.5)
-        else:
-            return 1.5
+        # Movimientos horizontales o verticales (costo 1) o diagonales (costo 1.5), según el terreno
+        recto = casilla1.getFila() == casilla2.getFila() or casilla1.getCol() == casilla2.getCol()
+        return self._coste_paso(self.id_casilla(casilla1), self.id_casilla(casilla2), recto)
+
+    def costo_movimiento_id(self, id1, id2):
+        """Versión de costo_movimiento para ids de celdas vecinas."""
+        fila1, col1 = divmod(id1, self.ancho)
+        fila2, col2 = divmod(id2, self.ancho)
+        return self._coste_paso(id1, id2, fila1 == fila2 or col1 == col2)
     
+    def adyacencia_para(self, obtener_vecinos, costo_movimiento):
+        """
+        Devuelve la tabla de adyacencia que corresponde a las funciones dadas.
+
+        Si son las del propio mapa se usa (y se construye si hace falta) la
+        tabla del mapa. Si son funciones externas sobre casillas, se construye
+        una tabla nueva llamándolas una vez por celda.
+        :return: Objeto Adyacencia.
+        """
+        if obtener_vecinos == self.getVecinos and costo_movimiento == self.costo_movimiento:
+            return self.preparar_adyacencia()
+
+        adyacencia = Adyacencia(self.alto * self.ancho)
+        for id_celda in range(self.alto * self.ancho):
+            casilla = self.casilla_de_id(id_celda)
+            adyacencia.fijar_fila(id_celda, [(self.id_casilla(v), costo_movimiento(casilla, v))
+                                             for v in obtener_vecinos(casilla)])
+        return adyacencia
+
     def obtener_tipo_terreno(self, casilla):
         """Devuelve el tipo de terreno en una casilla específica."""
-        # Suponiendo que tienes un atributo 'mapa' que guarda el tipo de cada casilla
-        fila = casilla.getFila()
-        columna = casilla.getCol()
-        
-        tipo = self.mapa[fila][columna]  # Obtenemos el valor del mapa para esa casilla        
-        if tipo == 0:
-            return "hierba"
-        elif tipo == 4:
-            return "agua"
-        elif tipo == 5:
-            return "roca"
-        else:
-            return "no_transitable"  # Por ejemplo, para celda no transitable
+        return self.obtener_tipo_terreno_id(self.id_casilla(casilla))
 
+    def obtener_tipo_terreno_id(self, id_celda):
+        """Devuelve el tipo de terreno de la celda con el id indicado."""
+        return self.terrenos.nombre(self.celdas[id_celda])
 
+    def calorias_id(self, id_celda):
+        """Calorías que cuesta pisar la celda con el id indicado."""
+        return self.calorias_celda[id_celda]
+
+    def guardar_binario(self, ruta):
+        """Guarda el mapa, con su tabla de terrenos, en el formato de formato_binario."""
+        formato_binario.escribir(ruta, self.alto, self.ancho, self.terrenos, self.celdas)
+
+
+
+def leer(archivo, terrenos=TERRENOS_POR_DEFECTO):
+    """
+    Lee un mapa de texto. Cada línea se convierte de una vez con
+    bytes.translate: los símbolos de la tabla de terrenos pasan a su código y
+    el resto de caracteres (saltos de línea, espacios...) se descartan.
+    :param archivo: Ruta del fichero de texto.
+    :param terrenos: TablaTerrenos con los símbolos de cada código.
+    :return: Lista de filas, cada una un bytes con los códigos de sus celdas.
+    """
+    traduccion = bytearray(range(256))
+    simbolos = set()
+    for tipo in terrenos:
+        simbolo = tipo.simbolo.encode("latin-1")
+        traduccion[simbolo[0]] = tipo.codigo
+        simbolos.add(simbolo[0])
+    descartar = bytes(c for c in range(256) if c not in simbolos)
 
-def leer(archivo):
-    mapa = []
     try:
-        fich = open(archivo, "r")
-        fila = -1
-        for cadena in fich:
-            fila = fila + 1
-            mapa.append([])
-            for i in range(len(cadena)):
-                if cadena[i] == ".":
-                    mapa[fila].append(0)
-                if cadena[i] == "#":
-                    mapa[fila].append(1)
-                if cadena[i] == "~":
-                    mapa[fila].append(4)
-                if cadena[i] == "*":
-                    mapa[fila].append(5)
-    except:
+        with open(archivo, "rb") as fich:
+            datos = fich.read()
+    except OSError:
         print("Error de fichero")
-        fich.close()
-
-    fich.close()
-    return mapa
+        raise
+    return [linea.translate(traduccion, descartar) for linea in datos.splitlines()]
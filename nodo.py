@@ -1,10 +1,14 @@
 # nodo.py
 
 class Nodo:
+    # Sin __dict__ por instancia: las búsquedas crean un nodo por inserción en la frontera
+    __slots__ = ("estado", "padre", "g", "h", "f", "cal")
+
     def __init__(self, estado, padre=None, g=0, h=0, cal=0):
         """
         Clase Nodo para el algoritmo A* Subε.
-        :param estado: Objeto Casilla que representa la posición en el mapa.
+        :param estado: Posición en el mapa: un objeto Casilla o, en los algoritmos
+                       de búsqueda, el id entero de la celda (fila*ancho+col).
         :param padre: Nodo padre desde el cual se llegó a este nodo.
         :param g: Costo acumulado desde el inicio hasta este nodo.
         :param h: Heurística estimada desde este nodo hasta el destino.
@@ -28,7 +32,11 @@ class Nodo:
         return self.estado == otro.estado
 
     def __lt__(self, otro):
-        """Comparación basada en el valor de f para utilizar heapq."""
+        """
+        Comparación basada en el valor de f para utilizar heapq con nodos
+        sueltos. Las búsquedas principales meten tuplas (f, seq, nodo) en el
+        montículo, que se comparan en C sin llegar a este método.
+        """
         return self.f < otro.f
 
     def __hash__(self):
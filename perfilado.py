@@ -0,0 +1,104 @@
+# perfilado.py
+
+import functools
+import itertools
+import os
+import time
+import warnings
+from contextlib import contextmanager
+
+# Variables de entorno que activan el perfilado sin tocar el código:
+#   BUSQUEDA_PERFIL=cprofile  -> perfil de tiempos con cProfile (.prof y resumen .txt)
+#   BUSQUEDA_PERFIL=memoria   -> reparto de memoria con tracemalloc (.txt)
+#   BUSQUEDA_PERFIL_DIR=ruta  -> directorio de los informes (por defecto el actual)
+VARIABLE_PERFIL = "BUSQUEDA_PERFIL"
+VARIABLE_DIRECTORIO = "BUSQUEDA_PERFIL_DIR"
+LINEAS_INFORME = 30
+MODOS = ("cprofile", "memoria")
+
+_numero_informe = itertools.count(1)
+_perfilando = False  # Evita perfilar otra vez las búsquedas anidadas (p. ej. JPS que delega en A*)
+_modos_avisados = set()  # Valores desconocidos de BUSQUEDA_PERFIL de los que ya se ha avisado
+
+@contextmanager
+def perfilar(modo, ruta_base):
+    """
+    Perfila el bloque de código y escribe el informe al salir.
+    :param modo: "cprofile" o "memoria".
+    :param ruta_base: Ruta de los informes sin extensión.
+    """
+    global _perfilando
+    if modo not in MODOS:
+        raise ValueError(f"Modo de perfilado desconocido: {modo}")
+    if _perfilando:
+        yield
+        return
+    _perfilando = True
+    # cProfile, pstats y tracemalloc se importan solo al perfilar: pstats
+    # arrastra dataclasses e inspect y alargaría el arranque de cualquier búsqueda
+    try:
+        if modo == "cprofile":
+            import cProfile
+            import io
+            import pstats
+            perfil = cProfile.Profile()
+            perfil.enable()
+            try:
+                yield
+            finally:
+                perfil.disable()
+                perfil.dump_stats(ruta_base + ".prof")
+                texto = io.StringIO()
+                pstats.Stats(perfil, stream=texto).sort_stats("cumulative").print_stats(LINEAS_INFORME)
+                with open(ruta_base + ".txt", "w", encoding="utf-8") as fich:
+                    fich.write(texto.getvalue())
+        else:
+            import tracemalloc
+            ya_activo = tracemalloc.is_tracing()
+            if not ya_activo:
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+            t0 = time.perf_counter()
+            try:
+                yield
+            finally:
+                segundos = time.perf_counter() - t0
+                actual, pico = tracemalloc.get_traced_memory()
+                instantanea = tracemalloc.take_snapshot()
+                if not ya_activo:
+                    tracemalloc.stop()
+                with open(ruta_base + ".txt", "w", encoding="utf-8") as fich:
+                    fich.write(f"Pico: {pico / 1024:.1f} KiB  Al terminar: {actual / 1024:.1f} KiB  "
+                               f"Tiempo: {segundos:.3f} s\n")
+                    for estadistica in instantanea.statistics("lineno")[:LINEAS_INFORME]:
+                        fich.write(f"{estadistica}\n")
+    finally:
+        _perfilando = False
+
+def perfilable(nombre):
+    """
+    Decorador para las funciones de búsqueda: si la variable de entorno
+    BUSQUEDA_PERFIL está definida, cada llamada se perfila y deja su informe
+    en BUSQUEDA_PERFIL_DIR como <nombre>-<pid>-<n>. Si no, solo cuesta leer
+    la variable. Con un valor desconocido se avisa una vez (RuntimeWarning) y
+    las búsquedas se ejecutan sin perfilar.
+    """
+    def decorador(funcion):
+        @functools.wraps(funcion)
+        def envoltorio(*args, **kwargs):
+            modo = os.environ.get(VARIABLE_PERFIL)
+            if not modo or _perfilando:
+                return funcion(*args, **kwargs)
+            if modo not in MODOS:
+                if modo not in _modos_avisados:
+                    _modos_avisados.add(modo)
+                    warnings.warn(f"{VARIABLE_PERFIL}={modo} no es un modo de perfilado ({', '.join(MODOS)}); "
+                                  f"se ignora", RuntimeWarning, stacklevel=2)
+                return funcion(*args, **kwargs)
+            directorio = os.environ.get(VARIABLE_DIRECTORIO, ".")
+            os.makedirs(directorio, exist_ok=True)
+            ruta_base = os.path.join(directorio, f"{nombre}-{os.getpid()}-{next(_numero_informe)}")
+            with perfilar(modo, ruta_base):
+                return funcion(*args, **kwargs)
+        return envoltorio
+    return decorador
@@ -0,0 +1,180 @@
+# suite_benchmark.py
+
+import argparse
+import contextlib
+import io
+import json
+import platform
+import time
+import tracemalloc
+
+from casilla import Casilla
+from a_estrella import (buscar_a_estrella, manhattan_heuristica, euclidea_heuristica, chebyshev_heuristica,
+                        octil_heuristica, trivial_heuristica)
+from a_estrella_subepsilon import buscar_a_estrella_subepsilon
+from cola_cubetas import ColaCubetas
+from a_estrella_bidireccional import buscar_a_estrella_bidireccional
+from jps import buscar_jps
+from busqueda_jerarquica import GrafoJerarquico
+from d_estrella_lite import PlanificadorDLite
+from generador_mapas import (generar_mapa_abierto, generar_laberinto, generar_habitaciones, generar_terreno_mixto,
+                             casilla_libre_cercana)
+from traza import TrazaBuffer, TRAZA_RESUMEN
+import levan
+
+HEURISTICAS = {
+    "manhattan": manhattan_heuristica,
+    "euclidea": euclidea_heuristica,
+    "chebyshev": chebyshev_heuristica,
+    "octil": octil_heuristica,
+    "trivial": trivial_heuristica,
+}
+
+GENERADORES = {
+    "abierto": lambda tam, semilla: generar_mapa_abierto(tam, tam, semilla=semilla),
+    "laberinto": lambda tam, semilla: generar_laberinto(tam | 1, tam | 1, semilla=semilla),
+    "habitaciones": lambda tam, semilla: generar_habitaciones(tam, tam, semilla=semilla),
+    "mixto": lambda tam, semilla: generar_terreno_mixto(tam, tam, semilla=semilla),
+}
+
+def _con_traza(buscar):
+    """Adapta una función buscar_* a la firma común y saca los expandidos de la traza de resumen."""
+    def ejecutar(mapi, inicio, meta, heuristica, epsilon):
+        traza = TrazaBuffer(1, TRAZA_RESUMEN)
+        coste = buscar(mapi, inicio, meta, heuristica, epsilon, traza)[0]
+        return coste, traza.eventos()[-1]["expandidos"]
+    return ejecutar
+
+def _ejecutar_levan(mapi, inicio, meta, heuristica, epsilon):
+    # levan.py no cuenta los expandidos: se cuentan las llamadas a obtener_vecinos
+    expandidos = 0
+
+    def obtener_vecinos(casilla):
+        nonlocal expandidos
+        expandidos += 1
+        return mapi.getVecinos(casilla)
+
+    camino = [['.'] * mapi.getAncho() for _ in range(mapi.getAlto())]
+    with contextlib.redirect_stdout(io.StringIO()):  # levan.py escribe cada paso del camino
+        coste = levan.a_estrella(camino, inicio, meta, obtener_vecinos, mapi.costo_movimiento, heuristica, mapi)[0]
+    return coste, expandidos
+
+# Motores medidos: nombre -> (función (mapi, inicio, meta, heurística, epsilon) -> (coste, expandidos),
+#                             usa heurística, usa epsilon)
+# jerarquico y d_estrella_lite incluyen en el tiempo la construcción de su grafo o estado.
+MOTORES = {
+    "a_estrella": (_con_traza(lambda mapi, i, m, h, e, traza: buscar_a_estrella(
+        i, m, mapi.getVecinos, mapi.costo_movimiento, h, mapi, traza)), True, False),
+    "a_estrella_cubetas": (_con_traza(lambda mapi, i, m, h, e, traza: buscar_a_estrella(
+        i, m, mapi.getVecinos, mapi.costo_movimiento, h, mapi, traza, cola=ColaCubetas)), True, False),
+    "subepsilon": (_con_traza(lambda mapi, i, m, h, e, traza: buscar_a_estrella_subepsilon(
+        i, m, mapi.getVecinos, mapi.costo_movimiento, h, e, mapi, traza)), True, True),
+    "bidireccional": (_con_traza(lambda mapi, i, m, h, e, traza: buscar_a_estrella_bidireccional(
+        i, m, mapi.getVecinos, mapi.costo_movimiento, h, mapi, traza)), True, False),
+    "jps": (_con_traza(lambda mapi, i, m, h, e, traza: buscar_jps(
+        i, m, mapi.getVecinos, mapi.costo_movimiento, h, mapi, traza)), True, False),
+    "jerarquico": (_con_traza(lambda mapi, i, m, h, e, traza: GrafoJerarquico(mapi).buscar(i, m, h, traza)),
+                   True, False),
+    "d_estrella_lite": (_con_traza(lambda mapi, i, m, h, e, traza: PlanificadorDLite(mapi, i, m).planificar(traza)),
+                        False, False),
+    "levan": (_ejecutar_levan, True, False),
+}
+
+def medir(ejecutar, args, con_memoria):
+    """
+    Mide una ejecución: primero el tiempo y, en una segunda ejecución con
+    tracemalloc (que la ralentiza), el pico de memoria.
+    :return: Tupla (coste, expandidos, segundos, pico de memoria en bytes o None).
+    """
+    t0 = time.perf_counter()
+    coste, expandidos = ejecutar(*args)
+    segundos = time.perf_counter() - t0
+    pico = None
+    if con_memoria:
+        tracemalloc.start()
+        ejecutar(*args)
+        pico = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return coste, expandidos, segundos, pico
+
+def ejecutar_suite(tamanos, tipos, motores, heuristicas, epsilons, semilla, con_memoria=True, max_levan=128):
+    """
+    Ejecuta todas las combinaciones de mapa, tamaño, motor, heurística y epsilon.
+    En cada mapa se busca entre las celdas libres más cercanas a dos esquinas opuestas.
+    :return: Lista de resultados (diccionarios).
+    """
+    resultados = []
+    for tipo in tipos:
+        for tam in tamanos:
+            mapi = GENERADORES[tipo](tam, semilla)
+            mapi.preparar_adyacencia()  # Fuera de la medición
+            inicio = Casilla(*casilla_libre_cercana(mapi, 1, 1))
+            meta = Casilla(*casilla_libre_cercana(mapi, mapi.getAlto() - 2, mapi.getAncho() - 2))
+            for motor in motores:
+                if motor == "levan" and tam > max_levan:
+                    continue  # Su frontera es una lista con búsqueda lineal: no escala
+                ejecutar, usa_heuristica, usa_epsilon = MOTORES[motor]
+                for nombre_h in (heuristicas if usa_heuristica else ["octil"]):
+                    for epsilon in (epsilons if usa_epsilon else [None]):
+                        args = (mapi, inicio, meta, HEURISTICAS[nombre_h], epsilon)
+                        coste, expandidos, segundos, pico = medir(ejecutar, args, con_memoria)
+                        resultado = {"mapa": tipo, "tamano": tam, "motor": motor, "heuristica": nombre_h,
+                                     "epsilon": epsilon, "coste": coste, "expandidos": expandidos,
+                                     "segundos": round(segundos, 6), "memoria_pico": pico}
+                        resultados.append(resultado)
+                        memoria = f"{pico / 1024:>10.0f}" if pico is not None else f"{'-':>10}"
+                        eps = "-" if epsilon is None else epsilon
+                        print(f"{tipo:>12} {tam:>6} {motor:>15} {nombre_h:>9} {eps:>5} {coste:>9} "
+                              f"{expandidos:>9} {segundos:>9.3f} {memoria}", flush=True)
+    return resultados
+
+def _clave(resultado):
+    return resultado["mapa"], resultado["tamano"], resultado["motor"], resultado["heuristica"], resultado["epsilon"]
+
+def comparar(anteriores, resultados):
+    """Muestra, para cada combinación presente en ambas ejecuciones, los cambios de coste, expandidos y tiempo."""
+    previos = {_clave(r): r for r in anteriores}
+    print(f"\n{'mapa':>12} {'tamaño':>6} {'motor':>15} {'heur.':>9} {'eps':>5} {'coste':>15} {'expandidos':>19} "
+          f"{'tiempo':>8}")
+    for r in resultados:
+        p = previos.get(_clave(r))
+        if p is None:
+            continue
+        eps = "-" if r["epsilon"] is None else r["epsilon"]
+        coste = f"{p['coste']}" if p["coste"] == r["coste"] else f"{p['coste']}->{r['coste']}"
+        expandidos = f"{p['expandidos']}" if p["expandidos"] == r["expandidos"] else \
+            f"{p['expandidos']}->{r['expandidos']}"
+        tiempo = r["segundos"] / p["segundos"] if p["segundos"] else 1
+        print(f"{r['mapa']:>12} {r['tamano']:>6} {r['motor']:>15} {r['heuristica']:>9} {eps:>5} {coste:>15} "
+              f"{expandidos:>19} {tiempo:>7.2f}x")
+
+def main():
+    parser = argparse.ArgumentParser(description="Suite de benchmarks de todos los motores de búsqueda")
+    parser.add_argument("--semilla", type=int, default=1)
+    parser.add_argument("--tamanos", type=int, nargs="+", default=[16, 64, 256],
+                        help="Lados de los mapas (hasta 2048)")
+    parser.add_argument("--tipos", nargs="+", choices=list(GENERADORES), default=list(GENERADORES))
+    parser.add_argument("--motores", nargs="+", choices=list(MOTORES), default=list(MOTORES))
+    parser.add_argument("--heuristicas", nargs="+", choices=list(HEURISTICAS), default=["octil", "manhattan"])
+    parser.add_argument("--epsilons", type=float, nargs="+", default=[0.0, 0.5, 2.0])
+    parser.add_argument("--max-levan", type=int, default=128, help="Tamaño máximo en el que se mide levan.py")
+    parser.add_argument("--sin-memoria", action="store_true", help="No medir el pico de memoria")
+    parser.add_argument("--salida", default="resultados_benchmark.json")
+    parser.add_argument("--comparar", help="Resultados JSON de otra ejecución con los que comparar")
+    args = parser.parse_args()
+
+    print(f"{'mapa':>12} {'tamaño':>6} {'motor':>15} {'heur.':>9} {'eps':>5} {'coste':>9} {'expandidos':>9} "
+          f"{'t (s)':>9} {'mem (KiB)':>10}")
+    resultados = ejecutar_suite(args.tamanos, args.tipos, args.motores, args.heuristicas, args.epsilons,
+                                args.semilla, not args.sin_memoria, args.max_levan)
+    with open(args.salida, "w", encoding="utf-8") as fich:
+        json.dump({"python": platform.python_version(), "semilla": args.semilla, "resultados": resultados},
+                  fich, indent=1)
+    print(f"Resultados guardados en {args.salida}")
+
+    if args.comparar:
+        with open(args.comparar, "r", encoding="utf-8") as fich:
+            comparar(json.load(fich)["resultados"], resultados)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+# terreno.py
+
+import json
+
+class TipoTerreno:
+    __slots__ = ("codigo", "simbolo", "nombre", "transitable", "coste", "calorias")
+
+    def __init__(self, codigo, simbolo, nombre, transitable=True, coste=1, calorias=0):
+        """
+        Descripción de un tipo de terreno.
+        :param codigo: Código de la celda en el mapa (0-255).
+        :param simbolo: Carácter que lo representa en los ficheros de mapa.
+        :param nombre: Nombre del terreno ("hierba", "agua", ...).
+        :param transitable: Si el conejo puede pisar la celda.
+        :param coste: Multiplicador del coste de los pasos que tocan la celda.
+        :param calorias: Calorías que cuesta pisar la celda.
+        """
+        self.codigo = codigo
+        self.simbolo = simbolo
+        self.nombre = nombre
+        self.transitable = transitable
+        self.coste = coste
+        self.calorias = calorias
+
+    def __str__(self):
+        return (f"{self.codigo} '{self.simbolo}' {self.nombre}: transitable={self.transitable} "
+                f"coste={self.coste} calorias={self.calorias}")
+
+class TablaTerrenos:
+    def __init__(self, tipos):
+        """
+        Tabla de terrenos indexada por código de celda.
+
+        El coste de un paso entre dos celdas es el del movimiento (1 recto,
+        1.5 diagonal) multiplicado por la media de los multiplicadores de ambas
+        celdas, de modo que sigue siendo simétrico. Las heurísticas de
+        a_estrella solo son admisibles si ningún multiplicador es menor que 1.
+        Los códigos que no están en la tabla se tratan como no transitables.
+
+        :param tipos: Iterable de TipoTerreno.
+        """
+        self.tipos = {tipo.codigo: tipo for tipo in tipos}
+        self.por_simbolo = {tipo.simbolo: tipo for tipo in self.tipos.values()}
+
+    def __getitem__(self, codigo):
+        return self.tipos[codigo]
+
+    def __iter__(self):
+        return iter(self.tipos.values())
+
+    def __str__(self):
+        return "\n".join(str(tipo) for tipo in self)
+
+    def transitable(self, codigo):
+        tipo = self.tipos.get(codigo)
+        return tipo is not None and tipo.transitable
+
+    def coste(self, codigo):
+        tipo = self.tipos.get(codigo)
+        return tipo.coste if tipo is not None else 1
+
+    def calorias(self, codigo):
+        tipo = self.tipos.get(codigo)
+        return tipo.calorias if tipo is not None and tipo.transitable else 0
+
+    def nombre(self, codigo):
+        """Nombre del terreno, o "no_transitable" si no se puede pisar."""
+        return self.tipos[codigo].nombre if self.transitable(codigo) else "no_transitable"
+
+    def coste_uniforme(self):
+        """Indica si todos los terrenos transitables tienen multiplicador 1."""
+        return all(tipo.coste == 1 for tipo in self if tipo.transitable)
+
+    def codigo_de_simbolo(self, simbolo):
+        """Código del terreno con ese símbolo, o None si no hay ninguno."""
+        tipo = self.por_simbolo.get(simbolo)
+        return tipo.codigo if tipo is not None else None
+
+    @classmethod
+    def desde_archivo(cls, ruta):
+        """
+        Carga una tabla desde un fichero JSON con una lista de objetos con los
+        campos de TipoTerreno, por ejemplo:
+        [{"codigo": 4, "simbolo": "~", "nombre": "agua", "transitable": true, "coste": 1, "calorias": 4}]
+        """
+        with open(ruta, "r", encoding="utf-8") as fich:
+            return cls(TipoTerreno(**campos) for campos in json.load(fich))
+
+    def guardar(self, ruta):
+        """Guarda la tabla en el formato de desde_archivo."""
+        with open(ruta, "w", encoding="utf-8") as fich:
+            json.dump([{campo: getattr(tipo, campo) for campo in TipoTerreno.__slots__} for tipo in self],
+                      fich, ensure_ascii=False, indent=1)
+
+# Tabla usada por defecto, la misma que terrenos.json
+TERRENOS_POR_DEFECTO = TablaTerrenos([
+    TipoTerreno(0, ".", "hierba", calorias=2),
+    TipoTerreno(1, "#", "muro", transitable=False),
+    TipoTerreno(4, "~", "agua", calorias=4),
+    TipoTerreno(5, "*", "roca", calorias=6),
+])
@@ -0,0 +1,154 @@
+# traza.py
+
+import json
+import sys
+from collections import deque
+
+# Niveles de traza
+TRAZA_NADA = 0        # No se emite nada
+TRAZA_RESUMEN = 1     # Solo el resultado de cada búsqueda
+TRAZA_ITERACION = 2   # Además, un evento por cada nodo expandido
+
+class Traza:
+    def __init__(self, nivel=TRAZA_RESUMEN, listas_completas=False):
+        """
+        Destino de trazas de los algoritmos de búsqueda. Esta clase base
+        descarta los eventos; las subclases deciden qué hacer con ellos.
+
+        Los eventos son diccionarios con una clave 'tipo':
+        - 'iteracion': iteracion, actual, vecinos, interior y frontera (tamaños)
+          y, si listas_completas, lista_interior y lista_frontera.
+        - 'mensaje': texto.
+        - 'resumen': algoritmo, coste, cal, expandidos y camino.
+        Las coordenadas van como listas [fila, col] para poder volcarlas a JSON.
+
+        :param nivel: TRAZA_NADA, TRAZA_RESUMEN o TRAZA_ITERACION.
+        :param listas_completas: Incluir en cada iteración las listas interior y
+                                 frontera enteras (coste lineal por iteración).
+        """
+        self.nivel = nivel
+        self.listas_completas = listas_completas
+
+    def activa(self, nivel):
+        """Indica si se deben generar los eventos del nivel indicado."""
+        return self.nivel >= nivel
+
+    def emitir(self, evento):
+        pass
+
+    def mensaje(self, texto):
+        if self.nivel >= TRAZA_RESUMEN:
+            self.emitir({"tipo": "mensaje", "texto": texto})
+
+    def emitir_resumen(self, algoritmo, coste, cal, expandidos, camino):
+        """Emite el resultado de una búsqueda; camino es una lista de casillas."""
+        if self.nivel >= TRAZA_RESUMEN:
+            self.emitir({"tipo": "resumen", "algoritmo": algoritmo, "coste": coste, "cal": cal,
+                         "expandidos": expandidos,
+                         "camino": [[casilla.getFila(), casilla.getCol()] for casilla in camino]})
+
+class TrazaConsola(Traza):
+    def __init__(self, nivel=TRAZA_RESUMEN, listas_completas=False, salida=None):
+        """
+        Escribe los eventos como texto legible.
+        :param salida: Flujo de salida; por defecto sys.stdout.
+        """
+        super().__init__(nivel, listas_completas)
+        self.salida = salida
+
+    def emitir(self, evento):
+        salida = self.salida if self.salida is not None else sys.stdout
+        tipo = evento["tipo"]
+        if tipo == "iteracion":
+            print(f"\nIteración : {evento['iteracion']}", file=salida)
+            print(f"Posición actual: {_coordenadas(evento['actual'])}", file=salida)
+            if "lista_interior" in evento:
+                print(f"Lista_interior: {', '.join(_coordenadas(c) for c in evento['lista_interior'])}", file=salida)
+                print(f"Lista_frontera: {' '.join(_coordenadas(c) for c in evento['lista_frontera'])}", file=salida)
+            else:
+                print(f"Lista_interior: {evento['interior']} casillas", file=salida)
+                print(f"Lista_frontera: {evento['frontera']} casillas", file=salida)
+            print(f"Nodos_vecinos: {' '.join(_coordenadas(c) for c in evento['vecinos'])}", file=salida)
+        elif tipo == "mensaje":
+            print(evento["texto"], file=salida)
+        elif tipo == "resumen":
+            print(f"{evento['algoritmo']}: coste={evento['coste']} cal={evento['cal']} "
+                  f"expandidos={evento['expandidos']}", file=salida)
+
+class TrazaBuffer(Traza):
+    def __init__(self, capacidad=1000, nivel=TRAZA_ITERACION, listas_completas=False):
+        """
+        Guarda en memoria solo los últimos 'capacidad' eventos.
+        :param capacidad: Número máximo de eventos conservados.
+        """
+        super().__init__(nivel, listas_completas)
+        self.buffer = deque(maxlen=capacidad)
+
+    def emitir(self, evento):
+        self.buffer.append(evento)
+
+    def eventos(self):
+        """Devuelve la lista de eventos guardados, del más antiguo al más reciente."""
+        return list(self.buffer)
+
+    def volcar_jsonl(self, ruta):
+        """Escribe los eventos guardados en un fichero JSON lines."""
+        with open(ruta, "w", encoding="utf-8") as fich:
+            for evento in self.buffer:
+                fich.write(json.dumps(evento, ensure_ascii=False) + "\n")
+
+class TrazaJsonl(Traza):
+    def __init__(self, ruta, nivel=TRAZA_ITERACION, listas_completas=False):
+        """
+        Escribe cada evento como una línea JSON en el fichero indicado.
+        :param ruta: Fichero de salida (se sobrescribe).
+        """
+        super().__init__(nivel, listas_completas)
+        self.fich = open(ruta, "w", encoding="utf-8")
+
+    def emitir(self, evento):
+        self.fich.write(json.dumps(evento, ensure_ascii=False) + "\n")
+
+    def cerrar(self):
+        self.fich.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.cerrar()
+
+# Traza que no emite nada, para búsquedas silenciosas
+SIN_TRAZA = Traza(TRAZA_NADA)
+
+def traza_por_defecto(traza):
+    """Devuelve la traza indicada o, si es None, una de resumen por consola."""
+    return traza if traza is not None else TrazaConsola(TRAZA_RESUMEN)
+
+def _coordenadas(c):
+    return f"({c[0]},{c[1]})"
+
+def evento_iteracion(traza, ancho, iteracion, actual, vecinos, lista_interior, frontera, num_frontera):
+    """
+    Construye y emite el evento de una iteración. Solo debe llamarse cuando
+    traza.activa(TRAZA_ITERACION), para que con la traza apagada no se cree nada.
+
+    :param ancho: Ancho del mapa, para pasar de ids a coordenadas.
+    :param actual: Id de la celda expandida.
+    :param vecinos: Ids de los vecinos añadidos o mejorados en la frontera.
+    :param lista_interior: Lista de ids expandidos, en orden.
+    :param frontera: Iterable con los ids de la frontera (solo se recorre si listas_completas).
+    :param num_frontera: Tamaño de la frontera.
+    """
+    evento = {
+        "tipo": "iteracion",
+        "iteracion": iteracion,
+        "actual": list(divmod(actual, ancho)),
+        "vecinos": [list(divmod(v, ancho)) for v in vecinos],
+        "interior": len(lista_interior),
+        "frontera": num_frontera,
+    }
+    if traza.listas_completas:
+        evento["lista_interior"] = [list(divmod(i, ancho)) for i in lista_interior]
+        evento["lista_frontera"] = [list(divmod(i, ancho)) for i in frontera]
+    traza.emitir(evento)